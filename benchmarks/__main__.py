@@ -0,0 +1,110 @@
+"""Все бенчмарки одной командой/Runs the whole benchmark suite and writes the results as JSON.
+
+Every rate in the results ends in ``_per_second`` or ``_fps``; ``--compare`` reports rates that dropped by more than
+``--tolerance`` against an earlier results file and exits with status 1 if there are any.
+Run from the repository root: ``python -m benchmarks [--quick] [--output FILE] [--compare OLD.json]``
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks import (bench_batch, bench_bitboard, bench_commands, bench_engine, bench_loop, bench_pathfinding,
+                        bench_render, bench_search, bench_startup)
+from game.config import GameConfig
+
+FULL = {"games": 300, "queries": 2000, "map_sizes": (30, 60, 120), "warehouses": ((60, 40), (200, 120)), "frames": 600,
+        "commands": 100000, "batch_games": 65536, "loop_turns": 40, "search_nodes": 100000,
+        "bitboard_lines": 2000, "startup_runs": 10}
+QUICK = {"games": 60, "queries": 400, "map_sizes": (30, 60), "warehouses": ((60, 40),), "frames": 120,
+         "commands": 10000, "batch_games": 4096, "loop_turns": 10, "search_nodes": 20000,
+         "bitboard_lines": 400, "startup_runs": 4}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(config, sizes, seed=0):
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    benchmarks = {
+        "engine": lambda: bench_engine.run(config, sizes["games"], seed=seed, warehouses=sizes["warehouses"]),
+        "pathfinding": lambda: bench_pathfinding.run(sizes["queries"], sizes["map_sizes"], seed),
+        "render": lambda: bench_render.run(config, sizes["frames"], seed),
+        "commands": lambda: bench_commands.run(config, sizes["commands"], seed),
+        "loop": lambda: bench_loop.run(config, sizes["loop_turns"], seed=seed),
+        "search": lambda: bench_search.run(config, sizes["search_nodes"], seed, warehouses=sizes["warehouses"]),
+        "bitboard": lambda: bench_bitboard.run(config, sizes["bitboard_lines"], seed),
+        "batch": lambda: bench_batch.run(config, sizes["batch_games"], seed=seed),
+        "startup": lambda: bench_startup.run(config, sizes["startup_runs"]),
+    }
+    for name, bench in benchmarks.items():
+        started = time.perf_counter()
+        results[name] = bench()
+        print(f"{name}: {time.perf_counter() - started:.1f} s", file=sys.stderr)
+    return results
+
+
+def rates(results, prefix=""):
+    """Все скорости из результатов/Flattens every ``*_per_second`` and ``*_fps`` value to ``{path: value}``"""
+    found = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            found.update(rates(value, path + "."))
+        elif isinstance(value, (int, float)) and (key.endswith("_per_second") or key.endswith("_fps")):
+            found[path] = value
+    return found
+
+
+def compare(old, new, tolerance=0.25):
+    """Просевшие скорости/Rates that dropped by more than ``tolerance``, as ``{path: (old, new)}``"""
+    old_rates, new_rates = rates(old), rates(new)
+    return {path: (old_rates[path], value) for path, value in new_rates.items()
+            if path in old_rates and value < old_rates[path] * (1 - tolerance)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--quick", action="store_true", help="smaller runs for a fast check")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="results file, benchmarks/results/<commit>.json by default")
+    parser.add_argument("--compare", metavar="OLD", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed drop, shared machines are noisy")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    results = run_suite(GameConfig(args.config), QUICK if args.quick else FULL, args.seed)
+
+    output = args.output or os.path.join("benchmarks", "results", f"{results['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), results, args.tolerance)
+        for path, (old, new) in sorted(regressions.items()):
+            print(f"REGRESSION {path}: {old:.1f} -> {new:.1f} ({new / old - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
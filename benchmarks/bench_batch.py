@@ -0,0 +1,81 @@
+"""Пачка партий на NumPy/BatchSimulator games per second against one-by-one GameState games.
+
+Also checks on sampled batch positions that BatchSimulator.legal allows exactly the moves Robot.move allows.
+Run from the repository root: ``python -m benchmarks.bench_batch``
+"""
+import argparse
+import json
+import logging
+import time
+
+from game.GameState import GameState
+from game.PathTables import DIRECTIONS
+from game.Scenarios import robot_move_allows
+from game.config import GameConfig
+
+
+def check_rules(config, simulator, samples=50):
+    """Сверка правил/Compares BatchSimulator.legal with Robot.move for every robot and direction of sampled games"""
+    import numpy as np
+
+    checked = 0
+    for game in range(min(samples, simulator.games)):
+        rows = np.array([game])
+        cells, carry = simulator.pos[game].reshape(-1).tolist(), simulator.carry[game].reshape(-1).tolist()
+        for player in range(simulator.num_players):
+            for robot in range(simulator.robots):
+                steps = simulator.neighbors[simulator.pos[rows, player, robot]]
+                legal = simulator.legal(rows, steps, simulator.carry[rows, player, robot])[0]
+                slot = player * simulator.robots + robot
+                for d, (direction, _, _) in enumerate(DIRECTIONS):
+                    allowed = robot_move_allows(config, config.colors_map, config.targets_map, cells, carry,
+                                                simulator.robots, slot, direction)
+                    if bool(legal[d]) != allowed:
+                        raise AssertionError(f"game {game}, player {player + 1}, robot {robot + 1}, {direction}: "
+                                             f"BatchSimulator.legal disagrees with Robot.move")
+                    checked += 1
+    return checked
+
+
+def run(config, games=16384, scalar_games=200, seed=0, max_turns=200):
+    try:
+        from game.BatchSimulator import BatchSimulator
+    except ImportError:
+        return {"skipped": "numpy is not installed"}
+
+    started = time.perf_counter()
+    for game_seed in range(seed, seed + scalar_games):
+        GameState(config, all_auto=True, seed=game_seed).run_headless(max_turns)
+    scalar_rate = scalar_games / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    simulator = BatchSimulator(config, games, seed=seed)
+    for _ in range(3):
+        simulator.play_turn()
+    checked = check_rules(config, simulator)
+    simulator.run(max_turns)
+    batch_rate = games / (time.perf_counter() - started)
+    summary = simulator.results()
+    return {
+        "games": games,
+        "unfinished": summary["unfinished"],
+        "mean_turns": summary["mean_turns"],
+        "batch_games_per_second": batch_rate,
+        "gamestate_games_per_second": scalar_rate,
+        "speedup": batch_rate / scalar_rate,
+        "rule_checks": checked,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--games", type=int, default=16384)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    print(json.dumps(run(GameConfig(args.config), args.games, seed=args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
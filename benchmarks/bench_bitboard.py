@@ -0,0 +1,66 @@
+"""Битовые доски против плоских массивов/BitSearchState legal moves per second against SearchState.
+
+map.csv runs with the robots of the config, the warehouses with 8 per player; the gain only shows with many robots,
+which is why SearchPlay picks BitSearchState from BITBOARD_ROBOTS robots per player. The rules of BitBoard are
+checked against Robot.move, AutoPlay and PathTables in tests/test_bitboard.py.
+Run from the repository root: ``python -m benchmarks.bench_bitboard``
+"""
+import argparse
+import json
+import logging
+import random
+import time
+
+from game.BitBoard import BitSearchState
+from game.GameState import GameState
+from game.Scenarios import scenario_maps
+from game.SearchState import SearchState
+from game.config import GameConfig
+
+
+def bench_moves(state, backend, lines=2000, depth=20, seed=0):
+    """Скорость генерации ходов/legal_moves + apply + undo per second over random lines of play"""
+    search = backend.from_game(state)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    nodes = 0
+    for _ in range(lines):
+        records = []
+        for _ in range(depth):
+            moves = search.legal_moves()
+            if not moves:
+                break
+            records.append(search.apply(moves[rng.randrange(len(moves))]))
+            nodes += 1
+        for record in reversed(records):
+            search.undo(record)
+    return nodes / (time.perf_counter() - started)
+
+
+def run(config, lines=2000, seed=0, warehouses=((30, 20), (60, 40))):
+    results = {}
+    with scenario_maps(config, warehouses) as maps:
+        for name, (map_config, colors_map, targets_map) in maps.items():
+            state = GameState(map_config, colors_map, targets_map, all_auto=True, seed=seed).run_headless(10)
+            plain = bench_moves(state, SearchState, lines, seed=seed)
+            bitwise = bench_moves(state, BitSearchState, lines, seed=seed)
+            results[name] = {
+                "searchstate_moves_per_second": plain,
+                "bitboard_moves_per_second": bitwise,
+                "speedup": bitwise / plain,
+            }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--lines", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    print(json.dumps(run(GameConfig(args.config), args.lines, seed=args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
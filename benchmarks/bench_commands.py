@@ -0,0 +1,99 @@
+"""Компиляция и прогон сценариев второго режима/Mode 2 script compile and replay benchmark.
+
+A long regression script is generated by random walks of every robot on map.csv, then compiled and replayed on
+the headless engine. The winning score is lifted so that the game lasts for the whole script, and the replay is
+checked against the state reached while generating it.
+Run from the repository root: ``python -m benchmarks.bench_commands --commands 100000``
+"""
+import argparse
+import copy
+import json
+import logging
+import random
+import time
+
+from game.Cell import column_name
+from game.CommandCompiler import CommandCompiler
+from game.GameState import GameState
+from game.PathTables import DIRECTIONS
+from game.config import GameConfig
+
+
+def snapshot(state):
+    return [(player.score, [robot.pos for robot in player.robots]) for player in state.players]
+
+
+def make_script(config, count, seed):
+    """Сценарий из случайных ходов/Random walk script, every line is executed while it is generated"""
+    rng = random.Random(seed)
+    state = GameState(config, seed=seed)
+    board = state.board
+    compiler = CommandCompiler(board, len(state.players))
+    program = compiler.compile([])
+    lines = []
+
+    def emit(line):
+        lines.append(line)
+        compiler.compile_line(program, line, len(lines))
+        program.run(state)
+
+    def name(pos):
+        return f"{column_name(pos[0]).lower()}{pos[1] + 1}"
+
+    white = [(cell.x, cell.y) for cell in board.get_cells_by_color('w')]
+    rng.shuffle(white)
+    for _ in range(config.robots_per_player):
+        for player in state.players:
+            emit(f"GAMER {player.idx + 1}")
+            while not state.put_robot(player.idx, board.cell_index(*white.pop())):
+                pass
+            lines.append(f"PUT BOT {name(player.robots[-1].pos)}")
+    while len(lines) < count and not state.game_over:
+        player = state.players[rng.randrange(len(state.players))]
+        emit(f"GAMER {player.idx + 1}")
+        robot = rng.choice(player.robots)
+        path = [robot.pos]
+        for _ in range(rng.randint(1, config.move_limit_per_turn)):
+            _, dx, dy = rng.choice(DIRECTIONS)
+            x, y = path[-1][0] + dx, path[-1][1] + dy
+            if 0 <= x < board.size and 0 <= y < board.height and board.colors[y * board.size + x] != 'r':
+                path.append((x, y))
+        if len(path) > 1:
+            emit("MOVE " + "-".join(name(pos) for pos in path))
+    emit("END")
+    return lines, snapshot(state)
+
+
+def run(config, count=100000, seed=0):
+    config = copy.copy(config)
+    config.win_score = float("inf")
+    lines, expected = make_script(config, count, seed)
+    state = GameState(config, seed=seed)
+    started = time.perf_counter()
+    program = CommandCompiler(state.board, len(state.players)).compile(lines)
+    compiled = time.perf_counter()
+    program.run(state)
+    finished = time.perf_counter()
+    assert not program.errors, program.errors[:5]
+    assert snapshot(state) == expected, "replay diverged from the generated game"
+    return {
+        "lines": len(lines),
+        "compile_ms": round((compiled - started) * 1000, 2),
+        "replay_ms": round((finished - compiled) * 1000, 2),
+        "lines_per_second": round(len(lines) / (finished - started)),
+        "opcodes": len(program.code),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--commands", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+    print(json.dumps(run(GameConfig(args.config), args.commands, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
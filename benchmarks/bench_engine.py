@@ -0,0 +1,83 @@
+"""Скорость партий без графики/Headless autoplay games per second on map.csv and larger generated maps.
+
+The station maps are ``generate_map(size, size)`` from game.MapGenerator, the layout of map.csv (which is
+``generate_map(9, 9)``) scaled up. The warehouse maps add racks of shelves, 16 target classes and 8 robots per
+player.
+Run from the repository root: ``python -m benchmarks.bench_engine``
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from game.Board import Board
+from game.GameState import GameState
+from game.MapGenerator import generate_map, write_map
+from game.Scenarios import crowded, write_warehouse
+from game.config import GameConfig
+
+
+def bench_games(config, games, colors_map, targets_map, seed=0, max_turns=1000, repeats=3):
+    """Лучший из repeats прогонов, чтобы не мерить шум/Best of ``repeats`` runs over the same seeds"""
+    best = None
+    for _ in range(repeats):
+        turns = moves = unfinished = 0
+        started = time.perf_counter()
+        for game_seed in range(seed, seed + games):
+            state = GameState(config, colors_map, targets_map, all_auto=True, seed=game_seed).run_headless(max_turns)
+            turns += state.turns_taken
+            moves += state.turn_counter
+            unfinished += not state.game_over
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "games": games,
+        "unfinished": unfinished,
+        "games_per_second": games / best,
+        "turns_per_second": turns / best,
+        "moves_per_second": moves / best,
+    }
+
+
+def board_bytes(colors_map, targets_map, boards=20):
+    """Память одной доски без общих таблиц путей/Bytes per Board, shared path tables excluded"""
+    Board(colors_map, targets_map)
+    tracemalloc.start()
+    kept = [Board(colors_map, targets_map) for _ in range(boards)]
+    size = tracemalloc.get_traced_memory()[0] // len(kept)
+    tracemalloc.stop()
+    return size
+
+
+def run(config, games=300, sizes=(18, 36), seed=0, max_turns=1000, warehouses=((60, 40),)):
+    results = {"map.csv": bench_games(config, games, "csv_files/map.csv", "csv_files/targets.csv", seed, max_turns)}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            paths = write_map(*generate_map(size, size), os.path.join(directory, f"station_{size}.csv"),
+                              os.path.join(directory, f"station_targets_{size}.csv"))
+            results[f"station_{size}x{size}"] = bench_games(
+                config, max(1, games // (size // 9) ** 2), *paths, seed, max_turns)
+            results[f"station_{size}x{size}"]["board_bytes"] = board_bytes(*paths)
+        for width, height in warehouses:
+            paths = write_warehouse(directory, width, height)
+            results[f"warehouse_{width}x{height}"] = bench_games(crowded(config), max(2, games // 60), *paths, seed,
+                                                                 max_turns)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--games", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    print(json.dumps(run(GameConfig(args.config), args.games, seed=args.seed, max_turns=args.max_turns), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Плавность цикла кадров при ходах автоматов/Frame gaps of a 60 FPS loop while autoplay turns are planned.
+
+The loop of main.GameManager without the window: every frame tries the state lock, as drawing does, and sleeps to
+the next frame; the gaps are measured between frames that got the lock, i.e. were drawn. "inline" plays each
+autoplay turn inside the frame as the old loop did, "worker" starts it on a TurnWorker. A warehouse map from
+game.MapGenerator with 8 robots per player has 16 robots on the board.
+Run from the repository root: ``python -m benchmarks.bench_loop``
+"""
+import argparse
+import json
+import logging
+import tempfile
+import time
+
+from game.GameState import GameState
+from game.Scenarios import crowded, write_warehouse
+from game.TurnWorker import TurnWorker
+from game.config import GameConfig
+
+FRAME_SECONDS = 1 / 60
+
+
+def frame_loop(state, turns, threaded):
+    """Кадры до turns ходов/Runs frames until ``turns`` autoplay turns are played, returns the number of loop
+    frames and the gaps between drawn frames in ms"""
+    while state.placing_phase:
+        state.play_auto_placement()
+    worker = TurnWorker()
+    frames, gaps = 0, []
+    last = next_frame = time.perf_counter()
+    while state.turns_taken < turns and not state.game_over:
+        if threaded:
+            if worker.poll():
+                worker.start(state)
+        else:
+            state.play_auto_turn()
+        if state.lock.acquire(blocking=False):
+            state.lock.release()
+            now = time.perf_counter()
+            gaps.append((now - last) * 1000)
+            last = now
+        frames += 1
+        next_frame += FRAME_SECONDS
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+        next_frame = max(next_frame, time.perf_counter() - FRAME_SECONDS)
+    worker.join()
+    worker.poll()
+    return frames, gaps
+
+
+def run(config, turns=40, size=(200, 120), seed=0):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_warehouse(directory, *size)
+        for name, threaded in (("inline", False), ("worker", True)):
+            state = GameState(crowded(config), *paths, all_auto=True, seed=seed)
+            started = time.perf_counter()
+            frames, gaps = frame_loop(state, turns, threaded)
+            elapsed = time.perf_counter() - started
+            gaps.sort()
+            results[name] = {
+                "turns": state.turns_taken,
+                "loop_fps": frames / elapsed,
+                "drawn_fps": len(gaps) / elapsed,
+                "p50_drawn_gap_ms": gaps[len(gaps) // 2],
+                "p99_drawn_gap_ms": gaps[min(len(gaps) - 1, len(gaps) * 99 // 100)],
+                "max_drawn_gap_ms": gaps[-1],
+            }
+    return {f"warehouse_{size[0]}x{size[1]}": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    print(json.dumps(run(GameConfig(args.config), args.turns, seed=args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
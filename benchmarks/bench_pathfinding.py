@@ -0,0 +1,107 @@
+"""Сравнение BFS из AutoPlay.find_path и A* из PathFinder/BFS vs A* pathfinding benchmark.
+
+Also times AutoPlay.find_nearest_free_cell from cells occupied by robots.
+Run from the repository root: ``python -m benchmarks.bench_pathfinding``
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+from game.AutoPlay import AutoPlay
+from game.Board import Board
+from game.MapGenerator import write_map
+from game.PathFinder import PathFinder
+from game.PathTables import PASSABLE_COLORS
+from game.Robot import Robot
+
+
+def write_random_map(directory, size, seed):
+    """Случайная квадратная карта/Random square map with red walls and numbered targets"""
+    rng = random.Random(seed)
+    colors = [[rng.choice('wwggya') if rng.random() > 0.18 else 'r' for _ in range(size)] for _ in range(size)]
+    targets = [[0] * size for _ in range(size)]
+    for digit in range(1, 10):
+        x, y = rng.randrange(size), rng.randrange(size)
+        colors[y][x] = 'g'
+        targets[y][x] = digit
+    return write_map(colors, targets, os.path.join(directory, f"map_{size}.csv"),
+                     os.path.join(directory, f"targets_{size}.csv"))
+
+
+def make_queries(board, count, seed, robot_share=0.1):
+    """Роботы на случайных клетках и пары старт-цель/Random robots and start/target pairs"""
+    rng = random.Random(seed)
+    free = [(cell.x, cell.y) for row in board.cells for cell in row
+            if cell.color in PASSABLE_COLORS and not cell.target]
+    rng.shuffle(free)
+    robots = free[:max(2, int(len(free) * robot_share))]
+    for pos in robots:
+        board.update_position(None, pos)
+    targets = free[len(robots):]
+    return [(rng.choice(robots), rng.choice(targets)) for _ in range(count)]
+
+
+def bench_board(board, queries):
+    autoplay = AutoPlay(None, board)
+    finder = PathFinder(board)
+    robot = Robot('blue', None, 1, None)
+
+    started = time.perf_counter()
+    bfs_lengths = []
+    for start, target in queries:
+        robot.pos = start
+        path = autoplay.find_path(robot, target)
+        bfs_lengths.append(len(path) if path else None)
+    bfs_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    astar_lengths = []
+    for start, target in queries:
+        finder.first_step(start, target)
+        astar_lengths.append(finder.last_distance)
+    astar_seconds = time.perf_counter() - started
+
+    # Старты заняты роботами, поиск свободной клетки всегда делает хотя бы один шаг/Starts are robot cells
+    started = time.perf_counter()
+    for start, _ in queries:
+        autoplay.find_nearest_free_cell(*start)
+    free_cell_seconds = time.perf_counter() - started
+
+    if bfs_lengths != astar_lengths:
+        raise AssertionError("A* and BFS disagree on path lengths")
+    return {
+        "cells": board.size * board.height,
+        "queries": len(queries),
+        "bfs_calls_per_second": len(queries) / bfs_seconds,
+        "astar_calls_per_second": len(queries) / astar_seconds,
+        "find_nearest_free_cell_calls_per_second": len(queries) / free_cell_seconds,
+        "speedup": bfs_seconds / astar_seconds,
+        "astar_nodes_expanded": finder.expanded,
+    }
+
+
+def run(queries=2000, sizes=(30, 60, 120), seed=0):
+    board = Board("csv_files/map.csv", "csv_files/targets.csv")
+    results = {"map.csv": bench_board(board, make_queries(board, queries, seed))}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            board = Board(*write_random_map(directory, size, seed))
+            results[f"random_{size}x{size}"] = bench_board(board, make_queries(board, queries // 4, seed))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    print(json.dumps(run(args.queries, seed=args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Скорость отрисовки/PlayerSimulator.screen_animator frames per second on the offscreen SDL dummy driver.
+
+Measures full redraws, idle frames and frames of an autoplay game with animations, and checks that the frame loop
+loads no images from disk once the first frame is drawn.
+Run from the repository root: ``python -m benchmarks.bench_render``
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+from game.GameState import GameState
+from game.config import GameConfig
+
+FRAME_MS = 1000 / 60
+
+
+def frames_per_second(draw, frames):
+    started = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return frames / (time.perf_counter() - started)
+
+
+def run(config, frames=600, seed=0):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    try:
+        import pygame
+    except ImportError:
+        return {"skipped": "pygame is not installed"}
+    from game.Assets import assets
+    from game.PlayerSimulator import PlayerSimulator, window_size
+
+    pygame.init()
+    state = GameState(config, all_auto=True, seed=seed)
+    screen = pygame.display.set_mode(window_size(state.board))
+    simulator = PlayerSimulator(state, screen, animation_speed=config.animation_speed or 1.0)
+    while state.placing_phase:
+        state.play_auto_placement()
+    simulator.animations.finish()
+    simulator.screen_animator()
+    warm = assets.stats()
+
+    def full_frame():
+        simulator.full_redraw = True
+        simulator.screen_animator()
+
+    def game_frame():
+        if simulator.animations.idle() and not state.game_over:
+            state.play_auto_turn()
+        simulator.update(FRAME_MS)
+        simulator.screen_animator()
+
+    results = {
+        "full_redraw_fps": frames_per_second(full_frame, frames),
+        "idle_fps": frames_per_second(simulator.screen_animator, frames),
+        "game_fps": frames_per_second(game_frame, frames),
+        "game_turns": state.turns_taken,
+    }
+    after = assets.stats()
+    results["asset_work_in_frames"] = {key: after[key] - warm[key] for key in after}
+    pygame.quit()
+    if results["asset_work_in_frames"]["loads"]:
+        raise AssertionError("screen_animator loaded images from disk during frames")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    print(json.dumps(run(GameConfig(args.config), args.frames, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Ходы с отменой для перебора/SearchState apply + undo per second against copying the position for every node.
+
+Also times SearchPlay (player type 3) turns against their ``search_budget_ms`` and counts MCTS iterations.
+
+SearchState is checked against GameState, its hash and its undo in tests/test_search_state.py.
+Run from the repository root: ``python -m benchmarks.bench_search``
+"""
+import argparse
+import json
+import logging
+import random
+import time
+
+from game.GameState import GameState
+from game.Scenarios import scenario_maps
+from game.SearchState import SearchState
+from game.Tournament import with_players
+from game.config import GameConfig
+
+
+def placed_game(config, colors_map, targets_map, seed):
+    state = GameState(config, colors_map, targets_map, all_auto=True, seed=seed)
+    while state.placing_phase:
+        state.play_auto_placement()
+    return state
+
+
+def bench_nodes(search, rng, nodes):
+    """Узлы apply/undo против копий/apply + undo and from_game copies per second over the same random lines"""
+    lines = []
+    while sum(map(len, lines)) < nodes:
+        line, records = [], []
+        while len(line) < 20 and search.legal_moves():
+            line.append(rng.choice(search.legal_moves()))
+            records.append(search.apply(line[-1]))
+        for record in reversed(records):
+            search.undo(record)
+        lines.append(line)
+    total = sum(map(len, lines))
+    started = time.perf_counter()
+    for line in lines:
+        records = [search.apply(move) for move in line]
+        for record in reversed(records):
+            search.undo(record)
+    elapsed = time.perf_counter() - started
+    return total / elapsed
+
+
+def bench_copies(state, copies):
+    started = time.perf_counter()
+    for _ in range(copies):
+        SearchState.from_game(state)
+    return copies / (time.perf_counter() - started)
+
+
+def bench_turns(config, colors_map, targets_map, seed, turns=10, budget_ms=50):
+    """Задержка хода SearchPlay/SearchPlay turn latency against its budget, the opponent is AutoPlay"""
+    timed = with_players(config, (3, 1))
+    timed.search_budget_ms, timed.search_workers, timed.profiling = budget_ms, 0, 1
+    state = placed_game(timed, colors_map, targets_map, seed)
+    times = []
+    while len(times) < turns and not state.game_over:
+        searching = state.current_player == 0
+        started = time.perf_counter()
+        state.play_auto_turn()
+        if searching:
+            times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    return {
+        "budget_ms": budget_ms,
+        "p50_turn_ms": times[len(times) // 2],
+        "max_turn_ms": times[-1],
+        "search_iterations_per_second": state.metrics.counters[("search_iterations", 0)] / sum(times) * 1000,
+    }
+
+
+def run(config, nodes=100000, seed=0, warehouses=((60, 40), (200, 120))):
+    rng = random.Random(seed)
+    results = {}
+    with scenario_maps(config, warehouses) as maps:
+        for name, (map_config, colors_map, targets_map) in maps.items():
+            state = placed_game(map_config, colors_map, targets_map, seed)
+            search = SearchState.from_game(state)
+            results[name] = {
+                "apply_undo_per_second": bench_nodes(search, rng, nodes),
+                "copies_per_second": bench_copies(state, max(10, nodes // 100)),
+            }
+            results[name]["speedup"] = results[name]["apply_undo_per_second"] / results[name]["copies_per_second"]
+            results[name]["search_play"] = bench_turns(map_config, colors_map, targets_map, seed)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    print(json.dumps(run(GameConfig(args.config), args.nodes, seed=args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
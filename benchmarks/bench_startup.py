@@ -0,0 +1,93 @@
+"""Запуск без графики/Startup time of the simulation-only paths: imports, ``python -m game simulate`` and pool workers.
+
+Every number is the median over fresh interpreters, with the bare interpreter start reported next to it. Before
+timing, the run checks that no headless module pulls in pygame.
+Run from the repository root: ``python -m benchmarks.bench_startup``
+"""
+import argparse
+import json
+import multiprocessing
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.Tournament import _init_worker, _play_games
+from game.config import GameConfig
+
+HEADLESS_MODULES = ("game.GameState", "game.Tournament", "game.Sweep", "game.BatchSimulator", "game.ReplayLog",
+                    "game.CommandCompiler", "game.SearchPlay", "game.__main__")
+
+
+def median_ms(command, runs):
+    """Медиана запуска команды/Median wall time of ``command`` in a fresh process, ms"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def check_no_pygame():
+    """Никакой модуль симуляции не тянет pygame/Headless modules must import without pygame"""
+    code = f"import sys\nfor name in {HEADLESS_MODULES!r}: __import__(name)\nprint('pygame' in sys.modules)"
+    loaded = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.strip()
+    assert loaded == "False", "a headless module imports pygame"
+    return len(HEADLESS_MODULES)
+
+
+def slowest_imports(module, top=5):
+    """Самые долгие импорты/Modules with the largest cumulative import time under ``module``, from -X importtime"""
+    report = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], check=True,
+                            capture_output=True, text=True).stderr
+    cumulative = {}
+    for line in report.splitlines()[1:]:  # "import time: self [us] | cumulative | imported package"
+        _, total, name = line.split("|")
+        cumulative[name.strip()] = int(total) / 1000
+    del cumulative[module]
+    return dict(sorted(cumulative.items(), key=lambda item: -item[1])[:top])
+
+
+def worker_start_ms(config, method, runs):
+    """От создания пула до первого ответа/Pool creation to the first result of a worker, ms, median of ``runs``"""
+    context = multiprocessing.get_context(method)
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_worker) as executor:
+            executor.submit(_play_games, (config, [], 0, None)).result()
+            times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def run(config, runs=10):
+    checked = check_no_pygame()
+    bare = median_ms([sys.executable, "-c", "pass"], runs)
+    imports = median_ms([sys.executable, "-c", "import game.GameState"], runs)
+    simulate = median_ms([sys.executable, "-m", "game", "simulate", "--max-turns", "0"], runs)
+    results = {
+        "headless_modules_checked": checked,
+        "interpreter_ms": bare,
+        "import_gamestate_ms": imports,
+        "simulate_start_ms": simulate,
+        "simulate_starts_per_second": 1000 / simulate,
+        "slowest_imports_ms": slowest_imports("game.GameState"),
+    }
+    for method in multiprocessing.get_all_start_methods():
+        results[f"worker_start_{method}_ms"] = worker_start_ms(config, method, max(1, runs // 2))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(GameConfig(args.config), args.runs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
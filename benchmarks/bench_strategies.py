@@ -0,0 +1,45 @@
+"""Матч стратегий AutoPlay/Head-to-head benchmark between AutoPlay strategies.
+
+Every seating of the two strategies plays the same seeds, so seat order does not bias the result.
+Run from the repository root: ``python -m benchmarks.bench_strategies --games 500``
+"""
+import argparse
+import itertools
+import json
+
+from game.Tournament import run_tournament, with_players
+from game.config import GameConfig
+
+
+def head_to_head(config, first, second, games, players=2, workers=None, seed=0):
+    results = {}
+    seatings = sorted(set(itertools.permutations([first] * (players // 2) + [second] * (players - players // 2))))
+    totals = {}
+    for seating in seatings:
+        summary, _ = run_tournament(with_players(config, seating), games, workers, seed)
+        results["-".join(map(str, seating))] = summary
+        for player_type, stats in summary["by_player_type"].items():
+            total = totals.setdefault(player_type, {"wins": 0, "delivered": 0, "deliveries_per_turn": 0.0})
+            total["wins"] += stats["wins"]
+            total["delivered"] += stats["delivered"]
+            total["deliveries_per_turn"] += stats["deliveries_per_turn"] / len(seatings)
+    return {"seatings": results, "total": totals}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--first", type=int, default=1, help="player type, 1 - greedy AutoPlay")
+    parser.add_argument("--second", type=int, default=2, help="player type, 2 - CooperativePlay")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    config = GameConfig(args.config)
+    print(json.dumps(head_to_head(config, args.first, args.second, args.games, args.players, args.workers,
+                                  args.seed)["total"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
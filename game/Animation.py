@@ -0,0 +1,73 @@
+from collections import deque
+
+STEP_MS = 12  # длительность одного шага анимации при скорости 1/one animation step at speed 1
+
+
+class Tween:
+    __slots__ = ('rect', 'target', 'duration', 'elapsed', 'start')
+
+    def __init__(self, rect, target, duration):
+        self.rect = rect
+        self.target = target
+        self.duration = duration
+        self.elapsed = 0.0
+        self.start = None
+
+
+class AnimationQueue:
+    """Очередь анимаций по времени кадра/Tween queue driven by frame delta time.
+
+    The game state changes instantly; the renderer only pushes tweens for sprite rects and advances them by the time
+    that passed since the last frame, so nothing blocks input or game logic. ``speed`` scales the playback, 0 skips
+    animation entirely.
+    """
+
+    def __init__(self, speed=1.0):
+        self.speed = speed
+        self.tweens = deque()
+
+    def push(self, rect, target, steps=10):
+        """Плавно сдвинуть rect в точку target/Slides ``rect`` to the ``target`` top-left corner"""
+        if self.speed <= 0:
+            rect.topleft = target
+            return
+        self.tweens.append(Tween(rect, target, steps * STEP_MS))
+
+    def pause(self, duration):
+        """Пауза между действиями, например при расстановке/Idle gap in the queue, e.g. between placements"""
+        if self.speed > 0:
+            self.tweens.append(Tween(None, None, duration))
+
+    def idle(self):
+        return not self.tweens
+
+    def finish(self):
+        """Мгновенно завершить все анимации/Jumps every queued tween to its end"""
+        for tween in self.tweens:
+            if tween.rect is not None:
+                tween.rect.topleft = tween.target
+        self.tweens.clear()
+
+    def update(self, dt):
+        """Продвинуть анимации на dt миллисекунд/Advances the queue by ``dt`` milliseconds of wall time"""
+        if self.speed <= 0:
+            self.finish()
+            return
+        dt *= self.speed
+        while dt > 0 and self.tweens:
+            tween = self.tweens[0]
+            if tween.rect is not None and tween.start is None:
+                tween.start = tween.rect.topleft
+            step = min(dt, tween.duration - tween.elapsed)
+            tween.elapsed += step
+            dt -= step
+            if tween.elapsed >= tween.duration:
+                if tween.rect is not None:
+                    tween.rect.topleft = tween.target
+                self.tweens.popleft()
+            elif tween.rect is not None:
+                progress = tween.elapsed / tween.duration
+                tween.rect.topleft = (
+                    round(tween.start[0] + (tween.target[0] - tween.start[0]) * progress),
+                    round(tween.start[1] + (tween.target[1] - tween.start[1]) * progress)
+                )
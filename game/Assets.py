@@ -0,0 +1,66 @@
+import pygame
+
+
+class AssetCache:
+    """Общий кэш картинок, шрифтов и надписей/Shared cache of images, scaled variants, fonts and rendered glyphs.
+
+    Every file is read from disk once, every size is scaled once and every text is rendered once, so the frame loop
+    does no disk I/O and no allocations for assets. ``loads``, ``scales`` and ``renders`` count the work actually done.
+    """
+
+    image_paths = {
+        'package': 'images/package.png',
+        'blue': 'images/blue_robot.png',
+        'red': 'images/red_robot.png',
+        'green': 'images/green_robot.png',
+        'orange': 'images/orange_robot.png'
+    }
+
+    def __init__(self):
+        self.images = {}
+        self.scaled = {}
+        self.fonts = {}
+        self.glyphs = {}
+        self.loads = 0
+        self.scales = 0
+        self.renders = 0
+
+    def image(self, name, size=None):
+        """Картинка по имени, при необходимости масштабированная/Image by name, scaled to ``size`` if given"""
+        if size is None:
+            image = self.images.get(name)
+            if image is None:
+                image = pygame.image.load(self.image_paths[name])
+                if pygame.display.get_surface():
+                    image = image.convert_alpha()
+                self.images[name] = image
+                self.loads += 1
+            return image
+        size = (int(size[0]), int(size[1]))
+        key = (name, size)
+        image = self.scaled.get(key)
+        if image is None:
+            image = self.scaled[key] = pygame.transform.scale(self.image(name), size)
+            self.scales += 1
+        return image
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.SysFont(None, size)
+        return font
+
+    def glyph(self, text, size, color=(0, 0, 0)):
+        """Отрисованная надпись/Rendered text surface, cached by text, font size and color"""
+        key = (text, size, color)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            glyph = self.glyphs[key] = self.font(size).render(text, True, color)
+            self.renders += 1
+        return glyph
+
+    def stats(self):
+        return {"loads": self.loads, "scales": self.scales, "renders": self.renders}
+
+
+assets = AssetCache()
@@ -0,0 +1,62 @@
+def hungarian(cost):
+    """Венгерский алгоритм/Optimal assignment for a rectangular cost matrix.
+
+    Returns for every row the column assigned to it, or -1 when there are more rows than columns. Runs in
+    O(n^2 * m) with row/column potentials.
+    """
+    rows = len(cost)
+    if not rows:
+        return []
+    cols = len(cost[0])
+    if rows > cols:
+        transposed = hungarian([[cost[i][j] for i in range(rows)] for j in range(cols)])
+        result = [-1] * rows
+        for j, i in enumerate(transposed):
+            if i >= 0:
+                result[i] = j
+        return result
+
+    inf = float('inf')
+    u = [0] * (rows + 1)
+    v = [0] * (cols + 1)
+    owner = [0] * (cols + 1)
+    way = [0] * (cols + 1)
+    for i in range(1, rows + 1):
+        owner[0] = i
+        j0 = 0
+        min_value = [inf] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            row = cost[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, cols + 1):
+                if not used[j]:
+                    current = row[j - 1] - u[i0] - v[j]
+                    if current < min_value[j]:
+                        min_value[j] = current
+                        way[j] = j0
+                    if min_value[j] < delta:
+                        delta = min_value[j]
+                        j1 = j
+            for j in range(cols + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_value[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    result = [-1] * rows
+    for j in range(1, cols + 1):
+        if owner[j]:
+            result[owner[j] - 1] = j - 1
+    return result
@@ -2,27 +2,41 @@ import logging
 import random
 import time
 from collections import deque
+from time import perf_counter_ns
 
+from game.Assignment import hungarian
+from game.Events import RELEASED
+from game.PathFinder import PathFinder
+from game.PathTables import DIRECTIONS, UNREACHABLE
 
-def allocate_packages(robots, packages):
-    """Распознание посылок/Packages recognition"""
-    assignments = {}
-    remaining_packages = packages[:]
-
-    for robot in robots:
-        closest_package = None
-        closest_distance = float('inf')
 
-        for package in remaining_packages:
-            distance = abs(robot.pos[0] - package.pos[0]) + abs(robot.pos[1] - package.pos[1])
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_package = package
+def allocate_packages(robots, packages, board):
+    """Распределение посылок венгерским алгоритмом/Optimal robot-to-package assignment.
 
-        if closest_package:
-            assignments[robot] = closest_package
-            remaining_packages.remove(closest_package)
+    A pair costs the true path length from the robot to the pickup cell above the package plus the delivery
+    distance from there to the nearest target with the package number. Unreachable pairs are never assigned.
+    """
+    tables = board.path_tables
+    unreachable = 2 * UNREACHABLE
+    pickups = [board.cell_index(package.pos[0], package.pos[1] - 1) for package in packages]
+    delivery = [tables.target_distances(package.number)[pickup] for package, pickup in zip(packages, pickups)]
+    cost = []
+    for robot in robots:
+        src = board.cell_index(*robot.pos)
+        number = robot.package.number if robot.package else 0
+        # Одна строка от робота вместо строки на каждую посылку/One row from the robot instead of one per pickup
+        from_robot = tables.distances_from(src, number)
+        row = []
+        for pickup, to_target in zip(pickups, delivery):
+            to_pickup = from_robot[pickup]
+            row.append(to_pickup + to_target if to_pickup < UNREACHABLE and to_target < UNREACHABLE
+                       else unreachable)
+        cost.append(row)
 
+    assignments = {}
+    for robot, row, column in zip(robots, cost, hungarian(cost)):
+        if column >= 0 and row[column] < unreachable:
+            assignments[robot] = packages[column]
     return assignments
 
 
@@ -31,6 +45,10 @@ class AutoPlay:
         self.player = player
         self.board = board
         self.active = True
+        self.path_finder = PathFinder(board)
+        self.assignments = {}
+        self.assignment_key = None
+        self.rng = player.game_state.rng if player else random.Random()
 
     def find_white_cells(self):
         """For random placement"""
@@ -38,23 +56,21 @@ class AutoPlay:
 
     def get_random_white_cell_position(self):
         """For placement"""
-        white_cells = self.find_white_cells()
+        white_cells = [cell for cell in self.find_white_cells() if not self.board.is_occupied(cell.x, cell.y)]
         if white_cells:
-            cell = random.choice(white_cells)
+            cell = self.rng.choice(white_cells)
             return cell.x, cell.y
         return None
 
     def find_target_cell(self, package):
         """Finds the cell to Start BFS algorithm"""
-        for row in self.board.cells:
-            for cell in row:
-                if cell.target == package.number:
-                    if not self.board.is_occupied(cell.x, cell.y):
-                        return cell
-                    else:
-                        logging.info(
-                            f"Target cell for package {package.number} is occupied. Searching for nearest free cell.")
-                        return self.find_nearest_free_cell(cell.x, cell.y)
+        for cell in self.board.target_cells.get(package.number, []):
+            if not self.board.is_occupied(cell.x, cell.y):
+                return cell
+            else:
+                logging.info("Target cell for package %s is occupied. Searching for nearest free cell.",
+                             package.number)
+                return self.find_nearest_free_cell(cell.x, cell.y)
 
     def find_nearest_free_cell(self, start_x, start_y):
         """Поиск ближайшей свободной клетки методом BFS./Finds nearest not occupied cell"""
@@ -70,45 +86,93 @@ class AutoPlay:
 
             for direction, (dx, dy) in directions:
                 new_x, new_y = x + dx, y + dy
-                if 0 <= new_x < self.board.size and 0 <= new_y < self.board.size and (new_x, new_y) not in visited:
+                if 0 <= new_x < self.board.size and 0 <= new_y < self.board.height and (new_x, new_y) not in visited:
                     visited.add((new_x, new_y))
                     queue.append((new_x, new_y))
 
-        logging.warning(f"No free cell found starting from ({start_x}, {start_y}).")
+        logging.warning("No free cell found starting from (%s, %s).", start_x, start_y)
         return None
 
     def is_valid_move(self, robot, new_pos):
         """Checks if the move is valid"""
         x, y = new_pos
-        if 0 <= x < self.board.size and 0 <= y < self.board.size:
-            target_cell = self.board.cells[y][x]
-            if self.board.is_occupied(x, y):
-                logging.debug(f"Cell at {new_pos} is occupied by another robot.")
+        board = self.board
+        if 0 <= x < board.size and 0 <= y < board.height:
+            index = y * board.size + x
+            if board.occupancy[index]:
+                logging.debug("Cell at %s is occupied by another robot.", new_pos)
                 return False
-            if target_cell.target:
-                if robot.package and target_cell.target == robot.package.number:
-                    logging.debug(f"Cell at {new_pos} is robot's own target cell.")
+            target = board.targets[index]
+            if target:
+                if robot.package and target == robot.package.number:
+                    logging.debug("Cell at %s is robot's own target cell.", new_pos)
                     pass
                 else:
-                    logging.debug(f"Cell at {new_pos} is a target cell for another package. Move not allowed.")
+                    logging.debug("Cell at %s is a target cell for another package. Move not allowed.", new_pos)
                     return False
-            if target_cell.color in ('w', 'a', 'g', 'y'):
-                logging.debug(f"Cell at {new_pos} is valid for movement.")
+            color = board.colors[index]
+            if color in ('w', 'a', 'g', 'y'):
+                logging.debug("Cell at %s is valid for movement.", new_pos)
                 return True
             else:
-                logging.debug(f"Cell at {new_pos} has invalid color '{target_cell.color}'.")
+                logging.debug("Cell at %s has invalid color '%s'.", new_pos, color)
                 return False
-        logging.debug(f"Cell at {new_pos} is out of bounds.")
+        logging.debug("Cell at %s is out of bounds.", new_pos)
         return False
 
+    def assign_packages(self):
+        """Назначения пересчитываются только при появлении или подъёме посылок/Reassigns only when packages
+        spawn, get picked up or a robot becomes free"""
+        free_robots = [robot for robot in self.player.robots if not robot.has_package]
+        key = (self.board.package_version, tuple(free_robots))
+        metrics = self.player.game_state.metrics
+        if key != self.assignment_key:
+            start = perf_counter_ns() if metrics else 0
+            packages = list(self.board.packages.values())
+            self.assignments = allocate_packages(free_robots, packages, self.board)
+            self.assignment_key = key
+            if metrics:
+                metrics.observe("assign", self.player.idx, start)
+                metrics.count("assignment_solves", self.player.idx)
+        elif metrics:
+            metrics.count("assignment_cache_hits", self.player.idx)
+        return self.assignments
+
+    def next_step(self, robot, target_pos):
+        """Следующий шаг по таблицам, поиск только если маршрут занят/Next step from the PathTables row of the
+        destination, built on first use; falls back to a search only when robots block the cached route"""
+        tables = self.board.path_tables
+        src = self.board.cell_index(*robot.pos)
+        dest = self.board.cell_index(*target_pos)
+        number = robot.package.number if robot.package else 0
+        route = tables.route(src, dest, number)
+        if not route:
+            return None
+        metrics = self.player.game_state.metrics if self.player else None
+        if not any(self.board.is_occupied(cell % self.board.size, cell // self.board.size) for cell in route):
+            if metrics:
+                metrics.count("path_table_hits", self.player.idx)
+            direction, dx, dy = DIRECTIONS[tables.next_hop(src, dest, number)]
+            return direction, (robot.pos[0] + dx, robot.pos[1] + dy)
+        if metrics:
+            start, expanded = perf_counter_ns(), self.path_finder.expanded
+        step = self.path_finder.first_step(robot.pos, target_pos, number)
+        if metrics:
+            metrics.observe("pathfind", self.player.idx, start)
+            metrics.count("astar_searches", self.player.idx)
+            metrics.count("astar_nodes_expanded", self.player.idx, self.path_finder.expanded - expanded)
+        if step is None:
+            logging.warning("No path found from %s to %s", robot.pos, target_pos)
+        return step
+
     def move_robot_towards(self, robot, target_pos):
         """Moves Robot towards"""
-        path = self.find_path(robot, target_pos)
-        if path:
-            direction, new_pos = path[0]
+        step = self.next_step(robot, target_pos)
+        if step:
+            direction, new_pos = step
             if robot.move(direction, self.board):
                 return new_pos
-        logging.warning(f"No path found for robot at {robot.pos} to target {target_pos}")
+        logging.warning("No path found for robot at %s to target %s", robot.pos, target_pos)
         return None
 
     def play(self):
@@ -126,31 +190,31 @@ class AutoPlay:
             remaining_moves = robot_move_limit
 
             while remaining_moves > 0:
+                if self.player.game_state.game_over:
+                    break
                 if robot.has_package:
                     target_cell = self.find_target_cell(robot.package)
                     if target_cell:
                         new_pos = self.move_robot_towards(robot, (target_cell.x, target_cell.y))
                         if new_pos is None:
-                            logging.info(f"Robot {robot.index} delivered the package and is removed from the turn.")
                             robot.has_package = False
+                            game_state = self.player.game_state
+                            game_state.events.emit(RELEASED, game_state.turn_counter, self.player.idx, robot.index)
                             break
                         remaining_moves -= 1
                         available_moves = True
                     else:
-                        logging.debug(f"No target cell found for package {robot.package.number}")
+                        logging.debug("No target cell found for package %s", robot.package.number)
                         break
                 else:
-                    packages = [cell.package for row in self.board.cells for cell in row if
-                                cell.package and not cell.package.picked_up]
-                    if not packages:
-                        logging.debug(f"No packages available for robot {robot.index}.")
+                    closest_package = self.assign_packages().get(robot)
+                    if not closest_package:
+                        logging.debug("No packages available for robot %s.", robot.index)
                         break
 
-                    closest_package = min(packages, key=lambda pkg: abs(robot.pos[0] - pkg.pos[0]) + abs(
-                        robot.pos[1] - pkg.pos[1]))
                     target_pos = (closest_package.pos[0], closest_package.pos[1] - 1)
                     if self.board.is_occupied(target_pos[0], target_pos[1]):
-                        logging.info(f"No path found for robot at {robot.pos} to green cell {target_pos}")
+                        logging.info("No path found for robot at %s to green cell %s", robot.pos, target_pos)
                         target_pos = self.find_nearest_free_cell(robot.pos[0], robot.pos[1])
                         target_pos = (target_pos.x, target_pos.y)
                     new_pos = self.move_robot_towards(robot, target_pos)
@@ -159,19 +223,16 @@ class AutoPlay:
                         remaining_moves -= 1
                         available_moves = True
                     else:
-                        logging.warning(f"Robot {robot.index} could not move towards package at {target_pos}")
+                        logging.warning("Robot %s could not move towards package at %s", robot.index, target_pos)
                         break
 
             if remaining_moves == 0:
-                logging.debug(f"Robot {robot.index} used all its moves for this turn.")
-
-        if not available_moves:
-            logging.info("No available moves, skipping turn.")
+                logging.debug("Robot %s used all its moves for this turn.", robot.index)
 
         return available_moves
 
     def find_path(self, robot, target_pos):
-        """Finds optimal path"""
+        """Finds optimal path, plain BFS kept as the reference for PathFinder"""
         queue = deque()
         visited = set()
         parent = {}
@@ -179,11 +240,9 @@ class AutoPlay:
         start_pos = robot.pos
         queue.append(start_pos)
         visited.add(start_pos)
-        logging.debug(f"Starting BFS from {start_pos} to {target_pos}")
 
         while queue:
             current_pos = queue.popleft()
-            logging.debug(f"Visiting {current_pos}")
 
             if current_pos == target_pos:
                 path = []
@@ -192,7 +251,6 @@ class AutoPlay:
                     path.append((direction, current_pos))
                     current_pos = prev_pos
                 path.reverse()
-                logging.debug(f"Path found: {path}")
                 return path
             else:
                 directions = [
@@ -203,15 +261,11 @@ class AutoPlay:
                 ]
                 for direction, new_pos in directions:
                     if (0 <= new_pos[0] < self.board.size and
-                            0 <= new_pos[1] < self.board.size and
+                            0 <= new_pos[1] < self.board.height and
                             new_pos not in visited):
                         if self.is_valid_move(robot, new_pos):
                             visited.add(new_pos)
                             parent[new_pos] = (current_pos, direction)
                             queue.append(new_pos)
-                        else:
-                            logging.debug(f"Move to {new_pos} is invalid.")
-                    else:
-                        logging.debug(f"Position {new_pos} is out of bounds or already visited.")
-        logging.warning(f"No path found from {start_pos} to {target_pos}")
+        logging.warning("No path found from %s to %s", start_pos, target_pos)
         return None
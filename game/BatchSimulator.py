@@ -0,0 +1,190 @@
+import argparse
+import json
+import time
+
+try:
+    import numpy as np
+except ImportError as error:  # необязательная зависимость/optional dependency, the rest of the game runs without it
+    raise ImportError("game.BatchSimulator needs numpy: pip install numpy") from error
+
+from game.Board import Board
+from game.PathTables import PASSABLE_COLORS, UNREACHABLE
+from game.config import GameConfig
+
+
+class BatchSimulator:
+    """Пачка партий на массивах NumPy/``games`` games on one map advanced together as stacked NumPy arrays.
+
+    Per game: ``occupancy`` (player + 1 per cell), robot cells ``pos`` and carried package numbers ``carry`` shaped
+    (games, players, robots), ``package_numbers`` of the red cells and ``scores``. Cell ``num_cells`` is a red wall
+    standing for everything off the board, so neighbour lookups need no bounds checks.
+
+    Legality mirrors Robot.move: a step never leaves the board, never enters an occupied or a red cell and enters a
+    target cell only with the matching package; the package is delivered there, and a robot without a package that
+    stops on a green cell picks up the package of the red cell below, which respawns with a new number.
+    Moves are greedy: a robot steps to the free neighbour closest to the nearest pickup cell or, carrying a package,
+    to the nearest target with its number (precomputed multi-source BFS fields), the first of up, down, left, right
+    on ties; a robot with no closer free neighbour sidesteps to a random free one, which breaks head-on deadlocks.
+    Move budgets are split over robots as in AutoPlay.play. The policy is simpler than AutoPlay, so batch results
+    compare with batch results, not with GameState games.
+    """
+
+    def __init__(self, config, games=1024, colors_map=None, targets_map=None, seed=0, explore=0.05):
+        board = Board(colors_map or config.colors_map, targets_map or config.targets_map)
+        tables = board.path_tables
+        n = board.size * board.height
+        self.games = games
+        self.num_cells = n
+        self.num_players = config.get_num_players()
+        self.robots = config.robots_per_player
+        self.move_limit = config.move_limit_per_turn
+        self.win_score = config.win_score
+        self.max_target = board.max_target
+        self.rng = np.random.default_rng(seed)
+        self.explore = explore
+
+        colors = np.frombuffer((board.colors + 'r').encode(), dtype=np.uint8)
+        self.red = colors == ord('r')
+        self.walkable = np.isin(colors, [ord(color) for color in PASSABLE_COLORS])
+        self.white = np.flatnonzero(colors == ord('w'))
+        self.targets = np.append(np.frombuffer(board.targets, dtype=np.uint8), 0).astype(np.intp)
+        self.neighbors = np.full((n + 1, 4), n, dtype=np.intp)
+        for cell in range(n):
+            for direction, neighbor in tables.neighbors[cell]:
+                self.neighbors[cell, direction] = neighbor
+        # Красная клетка под зелёной, иначе стена/Red cell below a green one, the wall otherwise
+        self.pickup_source = np.full(n + 1, n, dtype=np.intp)
+        green_over_red = np.flatnonzero((colors[:n - board.size] == ord('a')) & (colors[board.size:n] == ord('r')))
+        self.pickup_source[green_over_red] = green_over_red + board.size
+
+        # Поле 0 - к ближайшей зелёной клетке, поле k - к ближайшему пункту приёма k/Field 0 leads to the nearest
+        # pickup, field k to the nearest target with digit k
+        fields = [tables.nearest(green_over_red.tolist())]
+        fields += [tables.target_distances(number) for number in range(1, self.max_target + 1)]
+        self.fields = np.full((len(fields), n + 1), UNREACHABLE, dtype=np.int32)
+        for number, field in enumerate(fields):
+            self.fields[number, :n] = np.frombuffer(field, dtype=np.uint16)
+        self.reset()
+
+    def reset(self):
+        """Новые партии: случайная расстановка на белых клетках/New games with robots on random white cells"""
+        games, players, robots, n = self.games, self.num_players, self.robots, self.num_cells
+        if len(self.white) < players * robots:
+            raise ValueError(f"{players * robots} robots do not fit on {len(self.white)} white cells")
+        picks = self.rng.random((games, len(self.white))).argsort(axis=1)[:, :players * robots]
+        # Игроки ставят роботов по очереди, как в GameState/Players place robots in turns as in GameState
+        self.pos = self.white[picks].reshape(games, robots, players).transpose(0, 2, 1).copy()
+        self.occupancy = np.zeros((games, n + 1), dtype=np.uint8)
+        self.occupancy[:, n] = 255
+        rows = np.arange(games)[:, None]
+        for player in range(players):
+            self.occupancy[rows, self.pos[:, player]] = player + 1
+        self.carry = np.zeros((games, players, robots), dtype=np.intp)
+        self.package_numbers = self.rng.integers(1, self.max_target + 1, (games, n + 1), dtype=np.uint8)
+        self.scores = np.zeros((games, players), dtype=np.int64)
+        self.delivered = np.zeros((games, players), dtype=np.int64)
+        self.winner = np.full(games, -1, dtype=np.int64)
+        self.turns = np.zeros(games, dtype=np.int64)
+        self.moves = np.zeros(games, dtype=np.int64)
+        self.current_player = 0
+
+    def legal(self, rows, steps, carry):
+        """Правила Robot.move/Robot.move legality of ``steps`` (k, 4) for robots carrying ``carry`` in ``rows``"""
+        target = self.targets[steps]
+        return (~self.red[steps] & (self.occupancy[rows[:, None], steps] == 0)
+                & ((target == 0) | (target == carry[:, None])))
+
+    def step(self, player, robot):
+        """Один шаг робота во всех идущих партиях/One move of ``robot`` of ``player`` in every unfinished game"""
+        rows = np.flatnonzero(self.winner < 0)
+        if not rows.size:
+            return
+        pos = self.pos[rows, player, robot]
+        carry = self.carry[rows, player, robot]
+        steps = self.neighbors[pos]
+        allowed = self.legal(rows, steps, carry) & self.walkable[steps]
+        value = np.where(allowed, self.fields[carry[:, None], steps], UNREACHABLE)
+        best = value.argmin(axis=1)
+        index = np.arange(rows.size)
+        moving = value[index, best] < self.fields[carry, pos]
+        # Заблокированный робот отступает на случайную клетку, иногда и незаблокированный/A blocked robot sidesteps to
+        # a random free cell, and so does any robot with probability ``explore``, so blocked pairs do not cycle
+        stuck = (~moving | (self.rng.random(rows.size) < self.explore)) & allowed.any(axis=1)
+        if stuck.any():
+            noise = np.where(allowed[stuck], self.rng.random((int(stuck.sum()), 4)), 2.0)
+            best[stuck] = noise.argmin(axis=1)
+            moving |= stuck
+        rows, pos, carry = rows[moving], pos[moving], carry[moving]
+        new = steps[index[moving], best[moving]]
+        self.occupancy[rows, pos] = 0
+        self.occupancy[rows, new] = player + 1
+        self.pos[rows, player, robot] = new
+        self.moves[rows] += 1
+
+        target = self.targets[new]
+        drop = (target != 0) & (target == carry)
+        if drop.any():
+            delivered = rows[drop]
+            self.scores[delivered, player] += carry[drop]
+            self.delivered[delivered, player] += 1
+            self.carry[delivered, player, robot] = 0
+            carry[drop] = 0
+            self.winner[delivered[self.scores[delivered, player] >= self.win_score]] = player
+
+        source = self.pickup_source[new]
+        pick = (carry == 0) & (source < self.num_cells)
+        if pick.any():
+            rows, source = rows[pick], source[pick]
+            self.carry[rows, player, robot] = self.package_numbers[rows, source]
+            self.package_numbers[rows, source] = self.rng.integers(1, self.max_target + 1, rows.size)
+
+    def play_turn(self):
+        """Ход текущего игрока во всех партиях/One turn of the current player in every unfinished game"""
+        player = self.current_player
+        base, extra = divmod(self.move_limit, self.robots)
+        for robot in range(self.robots):
+            for _ in range(base + (extra if robot == 0 else 0)):
+                self.step(player, robot)
+        self.turns[self.winner < 0] += 1
+        self.current_player = (player + 1) % self.num_players
+
+    def run(self, max_turns=1000):
+        while (self.winner < 0).any() and self.turns.max() < max_turns:
+            self.play_turn()
+        return self
+
+    def results(self):
+        """Сводка как у Tournament.merge_results/Summary in the shape of Tournament.merge_results"""
+        finished = self.winner >= 0
+        wins = np.bincount(self.winner[finished], minlength=self.num_players)
+        return {
+            "games": self.games,
+            "unfinished": int((~finished).sum()),
+            "wins": wins.tolist(),
+            "win_rate": (wins / self.games).tolist(),
+            "mean_turns": float(self.turns.mean()),
+            "mean_scores": self.scores.mean(axis=0).tolist(),
+            "packages_delivered": self.delivered.sum(axis=0).tolist(),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batched greedy games on NumPy arrays")
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--games", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--map", nargs=2, metavar=("COLORS", "TARGETS"), help="map files instead of game.config")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    simulator = BatchSimulator(GameConfig(args.config), args.games, *(args.map or ()), seed=args.seed)
+    summary = simulator.run(args.max_turns).results()
+    summary["seconds"] = time.perf_counter() - started
+    summary["games_per_second"] = args.games / summary["seconds"]
+    print(json.dumps(summary, indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from game.SearchState import PASS, SearchState
+
+
+class BitBoard:
+    """Доска в битах/Board cell sets as Python ints, bit ``y * size + x`` is the cell (x, y).
+
+    Static sets: ``red`` and ``targets[k]`` per target digit; from them ``enterable[k]`` holds the cells Robot.move
+    lets a robot carrying ``k`` (0 - nothing) enter on an empty board and ``approach[k]`` the cells next to a target
+    ``k``. The set ``occupied`` starts from the board and is kept up to date by its owner. A step is a shift of the
+    whole set masked so rows do not wrap, so the legal steps of many robots take a few int operations.
+    """
+
+    def __init__(self, board):
+        self.size = board.size
+        self.num_cells = board.size * board.height
+        self.full = (1 << self.num_cells) - 1
+        left_column = sum(1 << (y * self.size) for y in range(board.height))
+        self.not_left = self.full & ~left_column
+        self.not_right = self.full & ~(left_column << (self.size - 1))
+        self.red = self.cells(color == 'r' for color in board.colors)
+        self.targets = [0] * (board.max_target + 1)
+        for cell, target in enumerate(board.targets):
+            if target:
+                self.targets[target] |= 1 << cell
+        all_targets = self.cells(board.targets)
+        self.enterable = [self.full & ~self.red & ~(all_targets & ~mask) for mask in self.targets]
+        self.approach = [self.expand(mask, self.full) & ~mask for mask in self.targets]
+        self.occupied = self.cells(board.occupancy)
+
+    @staticmethod
+    def cells(flags):
+        """Множество клеток с истинным флагом/Set of the cells whose flag is true"""
+        return int("".join("1" if flag else "0" for flag in flags)[::-1] or "0", 2)
+
+    def steps(self, cells, number=0):
+        """Клетки, откуда есть ход/Per direction the cells of ``cells`` whose robot, carrying ``number``, may step
+        that way: the open cells shifted back one step, masked with ``cells``"""
+        open_cells = self.enterable[number] & ~self.occupied
+        return [cells & ((open_cells << self.size) & self.full), cells & (open_cells >> self.size),
+                cells & ((open_cells & self.not_right) << 1), cells & ((open_cells & self.not_left) >> 1)]
+
+    def expand(self, cells, mask):
+        """Клетки и их соседи/``cells`` grown by one step in every direction, inside ``mask``"""
+        return (cells | (cells >> self.size) | ((cells << self.size) & self.full)
+                | ((cells & self.not_left) >> 1) | ((cells & self.not_right) << 1)) & mask
+
+
+class BitSearchState(SearchState):
+    """SearchState с битовой генерацией ходов/SearchState whose legal moves come from BitBoard sets.
+
+    ``bits.occupied`` follows every apply and undo. ``legal_moves`` takes the steps of all robots of the player to
+    move from one ``BitBoard.steps`` call on an empty-handed robot's rules; only a robot next to the target of its
+    package needs a call of its own. The moves come out in the same order as from SearchState, so a search gives the
+    same result with either backend. One call for all robots pays off only with many robots per player, so
+    SearchPlay uses it from BITBOARD_ROBOTS robots on boards up to BITBOARD_CELLS cells.
+    """
+
+    def __init__(self, board, num_players, robots, move_limit, win_score, seed=0):
+        super().__init__(board, num_players, robots, move_limit, win_score, seed)
+        self.bits = BitBoard(board)
+
+    def legal_moves(self):
+        if self.winner is not None:
+            return []
+        bits = self.bits
+        base = self.current_player * self.robots
+        pos = self.pos[base:base + self.robots]
+        mine = 0
+        for cell in pos:
+            mine |= 1 << cell
+        steps = bits.steps(mine)
+        moves = []
+        for robot, cell in enumerate(pos):
+            number = self.carry[base + robot]
+            up, down, left, right = steps
+            if number and (bits.approach[number] >> cell) & 1:
+                up, down, left, right = bits.steps(1 << cell, number)
+            if (up >> cell) & 1:
+                moves.append((robot, 0))
+            if (down >> cell) & 1:
+                moves.append((robot, 1))
+            if (left >> cell) & 1:
+                moves.append((robot, 2))
+            if (right >> cell) & 1:
+                moves.append((robot, 3))
+        return moves or [PASS]
+
+    def apply(self, move):
+        record = super().apply(move)
+        if record is not None and record[0] >= 0:
+            self.bits.occupied ^= 1 << record[1] | 1 << record[2]
+        return record
+
+    def undo(self, record):
+        if record[0] >= 0:
+            self.bits.occupied ^= 1 << record[1] | 1 << record[2]
+        super().undo(record)
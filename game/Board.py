@@ -1,57 +1,145 @@
 import csv
+import random
+from array import array
+
 from game.Cell import Cell
 from game.Package import Package
-from game.consts import DEFAULT_IMAGE_SIZE
+from game.PathTables import PathTables
+
+
+class Row:
+    """Строка доски/Row view so that ``board[y][x]`` keeps returning a Cell"""
+    __slots__ = ('board', 'y')
+
+    def __init__(self, board, y):
+        self.board = board
+        self.y = y
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.board.size:
+            raise IndexError(x)
+        return Cell(self.board, self.y * self.board.size + x)
+
+    def __len__(self):
+        return self.board.size
+
+    def __iter__(self):
+        start = self.y * self.board.size
+        return (Cell(self.board, index) for index in range(start, start + self.board.size))
 
 
 class Board:
-    def __init__(self, colors, targets) -> None:
-        self.cells: list[list[Cell]] = None
+    """Доска на плоских массивах/Board state kept in flat arrays indexed by ``y * size + x``.
+
+    ``colors`` is a str with one color letter per cell, ``targets`` the target digit (0 - none), ``occupancy`` the
+    1-based player of the robot on the cell (0 - free) and ``package_numbers`` the number of the package lying on
+    the cell (0 - none). Package objects stay in ``packages`` because robots carry them. Cell and Row objects are
+    views created on demand. Boards may be rectangular: ``size`` is the row length, ``height`` the number of rows.
+    """
+
+    def __init__(self, colors, targets, rng=None) -> None:
+        self.rng = rng or random.Random()  # номера новых посылок/numbers of spawned packages
+        self.colors: str = ""
+        self.targets = array('B')  # до 255 классов пунктов приёма/up to 255 target classes
+        self.size = 0
+        self.height = 0
         self.load_from_file(colors, targets)
-        self.size = len(self.cells[0])
-        # self.current_player_index = 0
 
-        self.yellow_cells = self.get_cells_by_color('y')
-        self.red_cells = self.get_cells_by_color('r')
-        self.green_cells = self.get_cells_by_color('a')
-        self.blue_cells = self.get_cells_by_color('b')
-        self.white_cells = self.get_cells_by_color('w')
-        self.occupied_cells = {}
+        self.cells_by_color: dict[str, array] = {}
+        self.target_cells: dict[int, list[Cell]] = {}
+        for index, color in enumerate(self.colors):
+            self.cells_by_color.setdefault(color, array('I')).append(index)
+            if self.targets[index]:
+                self.target_cells.setdefault(self.targets[index], []).append(Cell(self, index))
+        self.packages: dict[tuple, Package] = {}  # активные посылки по позиции/active packages by position
+        self.max_target = max(self.targets, default=0) or 9  # номера посылок 1..max_target/package numbers
+
+        self.occupancy = bytearray(len(self.colors))
+        self.package_numbers = bytearray(len(self.colors))
+        self.package_version = 0  # растёт при появлении посылки/bumped whenever a package spawns
+        self.path_tables: PathTables = PathTables.for_board(self)
 
     def get_cells_by_color(self, color):
-        return [cell for row_cell in self.cells for cell in row_cell if cell.color == color]
+        return [Cell(self, index) for index in self.cells_by_color.get(color, ())]
 
-    def load_from_file(self, colors_map, targets_map):
-        self.cells: list[list[Cell]] = []
+    @property
+    def yellow_cells(self):
+        return self.get_cells_by_color('y')
 
+    @property
+    def red_cells(self):
+        return self.get_cells_by_color('r')
+
+    @property
+    def green_cells(self):
+        return self.get_cells_by_color('a')
+
+    @property
+    def blue_cells(self):
+        return self.get_cells_by_color('b')
+
+    @property
+    def white_cells(self):
+        return self.get_cells_by_color('w')
+
+    @property
+    def cells(self):
+        return [Row(self, y) for y in range(self.height)]
+
+    @property
+    def occupied_cells(self):
+        return {(index % self.size, index // self.size) for index, owner in enumerate(self.occupancy) if owner}
+
+    def load_from_file(self, colors_map, targets_map):
+        colors = []
         with (open(colors_map, mode='r') as colors_map_file,
               open(targets_map, mode='r') as targets_map_file):
             color_matrix = csv.reader(colors_map_file)
             target_matrix = csv.reader(targets_map_file)
 
-            for i, (color_row, target_row) in enumerate(zip(color_matrix, target_matrix)):
-                row = list()
-                for j, (color, target) in enumerate(zip(color_row, target_row)):
-                    row.append(Cell(i, j, color=color, target=int(target)))
-                self.cells.append(row)
+            for color_row, target_row in zip(color_matrix, target_matrix):
+                if not self.size:
+                    self.size = len(color_row)
+                if len(color_row) != self.size or len(target_row) != self.size:
+                    raise ValueError(f"{colors_map}: row {self.height + 1} is not {self.size} cells long")
+                colors.extend(color_row)
+                self.targets.extend(int(target) for target in target_row)
+                self.height += 1
+        self.colors = "".join(colors)
+
+    def cell_index(self, x, y):
+        return y * self.size + x
 
     def __getitem__(self, index):
-        return self.cells[index]
+        if not 0 <= index < self.height:
+            raise IndexError(index)
+        return Row(self, index)
 
     def is_occupied(self, x, y):
-        return (x, y) in self.occupied_cells
+        return self.occupancy[y * self.size + x] != 0
 
-    def update_position(self, old_pos, new_pos):
-        if old_pos in self.occupied_cells:
-            del self.occupied_cells[old_pos]
-        self.occupied_cells[new_pos] = True
+    def update_position(self, old_pos, new_pos, owner=1):
+        """Робот игрока owner (с 1) переехал/The robot of 1-based player ``owner`` left old_pos for new_pos"""
+        if old_pos is not None:
+            self.occupancy[self.cell_index(*old_pos)] = 0
+        self.occupancy[self.cell_index(*new_pos)] = owner
 
     def place_package(self, pos):
-        package = Package(pos)
-        self.cells[pos[1]][pos[0]].package = package
+        package = Package(pos, self.rng, self.max_target)
+        self.package_numbers[self.cell_index(*pos)] = package.number
+        self.packages[pos] = package
+        self.package_version += 1
+        return package
+
+    def pick_package(self, pos):
+        """Посылку подняли, на её месте появляется новая/Package is picked up and a new one spawns in its place"""
+        package = self.packages.pop(pos)
+        package.pick_up()
+        self.place_package(pos)
         return package
 
-    def display_cells(self, screen):
-        for i in range(self.size):
-            for j in range(self.size):
-                self.cells[i][j].draw(screen)
+    def drop_package(self, cell):
+        """Посылку сдали в пункт приёма/Package was delivered to a target cell"""
+        if cell.package:
+            self.packages.pop((cell.x, cell.y), None)
+            self.package_numbers[cell.index] = 0
@@ -1,11 +1,27 @@
-import pygame
-from game.consts import DEFAULT_IMAGE_SIZE
+def column_name(x):
+    """Буквы столбца как в таблицах/Spreadsheet column letters: 0 -> 'A', 25 -> 'Z', 26 -> 'AA'"""
+    name = ""
+    x += 1
+    while x:
+        x, rest = divmod(x - 1, 26)
+        name = chr(ord('A') + rest) + name
+    return name
 
 
-pygame.init()
+def column_index(letters):
+    """'AA' -> 26, регистр не важен/Inverse of ``column_name``, case-insensitive"""
+    x = 0
+    for letter in letters.upper():
+        x = x * 26 + ord(letter) - ord('A') + 1
+    return x - 1
 
 
 class Cell:
+    """Клетка - вид на массивы доски/Cell view over the flat board arrays.
+
+    Views are created on demand and hold only the board and the flat index ``y * size + x``; two views of the same
+    cell compare equal.
+    """
     colors = {
         'w': (255, 255, 255),  # White
         'b': (199, 210, 225),  # Blue
@@ -14,53 +30,44 @@ class Cell:
         'a': (187, 219, 181),  # Green
         'g': (200, 200, 194)  # Gray
     }
+    __slots__ = ('board', 'index')
+
+    def __init__(self, board, index):
+        self.board = board
+        self.index = index
+
+    @property
+    def x(self):
+        return self.index % self.board.size
+
+    @property
+    def y(self):
+        return self.index // self.board.size
 
-    def __init__(self, y, x, color: str = 'w', target=0, robot=None):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.target = target
-        self.robot = robot
-        self.package = None
+    @property
+    def color(self):
+        return self.board.colors[self.index]
 
-    def draw(self, screen):
-        pygame.draw.rect(
-            screen,
-            Cell.colors[self.color],
-            (
-                (self.x + 1) * DEFAULT_IMAGE_SIZE[0],
-                (self.y + 1) * DEFAULT_IMAGE_SIZE[1],
-                DEFAULT_IMAGE_SIZE[0],
-                DEFAULT_IMAGE_SIZE[1]
-            )
-        )
+    @property
+    def target(self):
+        return self.board.targets[self.index]
 
-        pygame.draw.rect(
-            screen,
-            (0, 0, 0),
-            (
-                (self.x + 1) * DEFAULT_IMAGE_SIZE[0],
-                (self.y + 1) * DEFAULT_IMAGE_SIZE[1],
-                DEFAULT_IMAGE_SIZE[0],
-                DEFAULT_IMAGE_SIZE[1]
-            ),
-            1
-        )
+    @property
+    def owner(self):
+        """Номер игрока робота на клетке, 0 - свободна/1-based player of the robot on the cell, 0 if free"""
+        return self.board.occupancy[self.index]
 
-        if self.target:
-            target_font = pygame.font.SysFont(None, 64)
-            img = target_font.render(str(self.target), True, (0, 0, 0))
-            screen.blit(
-                img,
-                (
-                    (self.x + 1) * DEFAULT_IMAGE_SIZE[0] + (DEFAULT_IMAGE_SIZE[0] - img.get_width()) / 2,
-                    (self.y + 1) * DEFAULT_IMAGE_SIZE[1] + (DEFAULT_IMAGE_SIZE[1] - img.get_height()) / 2
-                )
-            )
+    @property
+    def package(self):
+        if not self.board.package_numbers[self.index]:
+            return None
+        return self.board.packages.get((self.x, self.y))
 
-        if self.robot:
-            self.robot.robot_animator(screen)
+    def __eq__(self, other):
+        return isinstance(other, Cell) and self.board is other.board and self.index == other.index
 
-        if self.package and self.package.visible:
-            self.package.draw(screen, self.x, self.y)
+    def __hash__(self):
+        return self.index
 
+    def __repr__(self):
+        return f"Cell({self.x}, {self.y}, {self.color!r}, {self.target})"
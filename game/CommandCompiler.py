@@ -0,0 +1,194 @@
+import logging
+import re
+import time
+from array import array
+
+from game.Cell import column_index
+
+# Грамматика команд второго режима/Grammar of mode 2 commands: столбец - буквы, строка - число/column letters, row
+# number, as in spreadsheets: a1, z12, aa105
+COMMAND_RE = re.compile(
+    r"^(?:GAMER (\d+)|PUT BOT ([a-zA-Z]+\d+)|MOVE ((?:[a-zA-Z]+\d+-)+[a-zA-Z]+\d+)|END)$"
+)
+CELL_RE = re.compile(r"([a-zA-Z]+)(\d+)")
+
+# Коды операций/Opcodes, layout in CommandProgram.code:
+#   GAMER player | PUT cell | MOVE count cell_0 ... cell_count-1 | END
+GAMER, PUT, MOVE, END = range(4)
+
+
+def parse_cell(position, size, height=None):
+    """'c3' -> индекс клетки или None вне доски/Flat cell index ``y * size + x`` or None off the board"""
+    letters, row = CELL_RE.fullmatch(position).groups()
+    x = column_index(letters)
+    y = int(row) - 1
+    if 0 <= x < size and 0 <= y < (size if height is None else height):
+        return y * size + x
+    return None
+
+
+def step_direction(robot_pos, target_pos):
+    """Направление шага к клетке, как в ручном вводе/Direction of one step towards ``target_pos``"""
+    if robot_pos[0] < target_pos[0]:
+        return "right"
+    if robot_pos[0] > target_pos[0]:
+        return "left"
+    if robot_pos[1] < target_pos[1]:
+        return "down"
+    if robot_pos[1] > target_pos[1]:
+        return "up"
+    return None
+
+
+class CommandProgram:
+    """Скомпилированный сценарий второго режима/Mode 2 script compiled to a flat opcode array.
+
+    Commands are appended by CommandCompiler and executed by ``run``, which resumes from where the previous call
+    stopped, so a streamed script can be compiled and run in pieces. ``errors`` holds ``(line, message)`` for every
+    rejected line.
+    """
+
+    def __init__(self):
+        self.code = array('i')
+        self.errors: list[tuple[int, str]] = []
+        self.pc = 0
+        self.commands = 0
+
+    def __len__(self):
+        return self.commands
+
+    def run(self, state):
+        """Выполнить новые команды на GameState/Executes the commands added since the last call, True on END"""
+        code = self.code
+        end = len(code)
+        pc = self.pc
+        while pc < end and not state.game_over:
+            op = code[pc]
+            if state.placing_phase and op != PUT and op != GAMER:
+                state.end_placing_phase()
+            if op == GAMER:
+                state.current_player = code[pc + 1]
+                logging.info("Switched to Player %d.", state.current_player + 1)
+                pc += 2
+            elif op == PUT:
+                state.put_robot(state.current_player, code[pc + 1])
+                pc += 2
+            elif op == MOVE:
+                count = code[pc + 1]
+                state.move_robot_along(state.current_player, code[pc + 2:pc + 2 + count])
+                pc += 2 + count
+            else:
+                self.pc = pc + 1
+                return True
+        self.pc = pc
+        return False
+
+
+class CommandCompiler:
+    """Компилятор команд второго режима/Parses and validates mode 2 commands once against the board.
+
+    Checks the grammar, the player number, that every cell lies on the board, that a path only makes single
+    orthogonal steps and never enters a red cell. Occupancy and target cells depend on the game and are still
+    checked by Robot.move when the program runs.
+    """
+
+    def __init__(self, board, num_players):
+        self.board = board
+        self.num_players = num_players
+
+    def error(self, program, line_number, command, message):
+        program.errors.append((line_number, message))
+        logging.warning("Invalid command at line %d: %s (%s)", line_number, command, message)
+        return False
+
+    def compile_line(self, program, command, line_number):
+        """Добавить одну команду в программу/Appends one command to ``program``, False if it was rejected"""
+        command = command.strip()
+        if not command:
+            return True
+        match = COMMAND_RE.match(command)
+        if match is None:
+            return self.error(program, line_number, command, "syntax error")
+        gamer, put, move = match.groups()
+        size = self.board.size
+        code = program.code
+        if gamer is not None:
+            player = int(gamer)
+            if not 1 <= player <= self.num_players:
+                return self.error(program, line_number, command, f"no player {player}")
+            code.extend((GAMER, player - 1))
+        elif put is not None:
+            cell = parse_cell(put, size, self.board.height)
+            if cell is None:
+                return self.error(program, line_number, command, f"{put} is off the board")
+            code.extend((PUT, cell))
+        elif move is not None:
+            cells = []
+            for position in move.split('-'):
+                cell = parse_cell(position, size, self.board.height)
+                if cell is None:
+                    return self.error(program, line_number, command, f"{position} is off the board")
+                if cells:
+                    dx, dy = abs(cell % size - cells[-1] % size), abs(cell // size - cells[-1] // size)
+                    if dx + dy != 1:
+                        return self.error(program, line_number, command, f"{position} is not next to the previous cell")
+                    if self.board.colors[cell] == 'r':
+                        return self.error(program, line_number, command, f"{position} is a red cell")
+                cells.append(cell)
+            code.extend((MOVE, len(cells)))
+            code.extend(cells)
+        else:
+            code.append(END)
+        program.commands += 1
+        return True
+
+    def compile(self, lines, program=None):
+        """Компиляция сценария/Compiles an iterable of lines or ``(line_number, line)`` pairs"""
+        program = program if program is not None else CommandProgram()
+        for line_number, line in enumerate(lines, 1):
+            if isinstance(line, tuple):
+                line_number, line = line
+            self.compile_line(program, line, line_number)
+        return program
+
+
+def compile_file(path, board, num_players):
+    with open(path, 'r') as file:
+        return CommandCompiler(board, num_players).compile(file)
+
+
+def main(argv=None):
+    """Проверка и прогон сценария без графики/Validates a commands file and replays it headless"""
+    import argparse
+    from game.config import GameConfig
+    from game.GameState import GameState
+
+    parser = argparse.ArgumentParser(description="Compile and replay a mode 2 commands file")
+    parser.add_argument("commands", nargs="?", default="commands.txt")
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--check", action="store_true", help="only validate, do not run")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    config = GameConfig(args.config)
+    state = GameState(config)
+    started = time.perf_counter()
+    program = compile_file(args.commands, state.board, len(state.players))
+    compiled = time.perf_counter()
+    logging.disable(logging.NOTSET)
+    for line_number, message in program.errors:
+        print(f"{args.commands}:{line_number}: {message}")
+    print(f"{len(program)} commands compiled in {(compiled - started) * 1000:.2f} ms, {len(program.errors)} errors")
+    if args.check:
+        return
+    logging.disable(logging.WARNING)
+    program.run(state)
+    finished = time.perf_counter()
+    logging.disable(logging.NOTSET)
+    print(f"replayed in {(finished - compiled) * 1000:.2f} ms")
+    for player in state.players:
+        print(f"Player {player.idx + 1} ({player.color}): {player.score} points")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import stat
+import struct
+import sys
+import time
+from collections import deque
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """Слежение за файлом через inotify (Linux)/Watches one file through inotify, Linux only.
+
+    The parent directory is watched so that editors replacing the file by rename are noticed too.
+    """
+
+    def __init__(self, fd, name):
+        self.fd = fd
+        self.name = name
+
+    @classmethod
+    def create(cls, path):
+        """Вернёт None, если inotify недоступен/Returns None where inotify is not available"""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        directory = os.path.dirname(os.path.abspath(path))
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, directory.encode(), mask) < 0:
+            os.close(fd)
+            return None
+        return cls(fd, os.path.basename(path).encode())
+
+    def changed(self):
+        """Были ли события для нашего файла/Drains pending events, True if any of them concern the file"""
+        changed = False
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                if data[offset:offset + length].rstrip(b"\0") == self.name:
+                    changed = True
+                offset += length
+
+    def close(self):
+        os.close(self.fd)
+
+
+class CommandStream:
+    """Потоковое чтение команд второго режима/Tail-follow reader for mode 2 commands.
+
+    ``source`` is a file path, a FIFO path or ``-`` for stdin. For regular files the reader keeps a byte offset and
+    only reads what was appended, waking up on inotify events where available and on a ``poll_interval`` timer
+    elsewhere. Every line is returned once together with its line number, ready for CommandCompiler. A tailed file
+    may be mid-write, so its last line is only returned once it ends with a newline; a line without one is returned
+    at the end of stdin, when a FIFO writer closes or on ``close``.
+    """
+
+    def __init__(self, source="commands.txt", poll_interval=1.0, chunk_size=1 << 16):
+        self.source = source
+        self.poll_interval = poll_interval
+        self.chunk_size = chunk_size
+        self.offset = 0
+        self.line_number = 0
+        self.buffer = b""
+        self.pending = deque()
+        self.closed = False
+        self.fd = None
+        self.watcher = None
+        self.next_check = 0.0
+        if source == "-":
+            self.fd = sys.stdin.fileno()
+            self.is_fifo = False
+        else:
+            self.is_fifo = os.path.exists(source) and stat.S_ISFIFO(os.stat(source).st_mode)
+            if self.is_fifo:
+                self.fd = os.open(source, os.O_RDONLY | os.O_NONBLOCK)
+            else:
+                self.watcher = Inotify.create(source)
+        self.changed = True
+
+    def _feed(self, data):
+        self.offset += len(data)
+        lines = (self.buffer + data).split(b"\n")
+        self.buffer = lines.pop()
+        self.pending.extend(lines)
+
+    def _read_file(self):
+        try:
+            size = os.stat(self.source).st_size
+        except FileNotFoundError:
+            return
+        if size < self.offset:
+            logging.warning("%s was truncated, reading it from the start.", self.source)
+            self.offset = 0
+            self.line_number = 0
+            self.buffer = b""
+        if size == self.offset:
+            return
+        with open(self.source, "rb") as file:
+            file.seek(self.offset)
+            self._feed(file.read(size - self.offset))
+
+    def _read_stream(self, limit):
+        while len(self.pending) < limit and select.select([self.fd], [], [], 0)[0]:
+            data = os.read(self.fd, self.chunk_size)
+            if data:
+                self._feed(data)
+            elif self.is_fifo:
+                # Писатель закрыл FIFO, ждём следующего/Writer closed the FIFO, wait for the next one
+                self._flush()
+                os.close(self.fd)
+                self.fd = os.open(self.source, os.O_RDONLY | os.O_NONBLOCK)
+                break
+            else:
+                self._flush()
+                self.closed = True
+                break
+
+    def _flush(self):
+        """Строка без перевода строки считается законченной/The unterminated last line counts as complete"""
+        if self.buffer:
+            self.pending.append(self.buffer)
+            self.buffer = b""
+
+    def _refill(self, limit):
+        if self.closed:
+            return
+        if self.fd is not None:
+            self._read_stream(limit)
+            return
+        if self.watcher is not None:
+            self.changed = self.watcher.changed() or self.changed
+        else:
+            now = time.monotonic()
+            if now >= self.next_check:
+                self.next_check = now + self.poll_interval
+                self.changed = True
+        if self.changed:
+            self.changed = False
+            self._read_file()
+
+    def poll(self, max_commands=1000):
+        """Новые непустые строки, не больше max_commands/Up to ``max_commands`` new ``(line_number, command)``
+        pairs, never blocks"""
+        if len(self.pending) < max_commands:
+            self._refill(max_commands)
+        commands = []
+        while self.pending and len(commands) < max_commands:
+            line = self.pending.popleft()
+            self.line_number += 1
+            command = line.decode(errors="replace").strip()
+            if command:
+                commands.append((self.line_number, command))
+        return commands
+
+    def close(self):
+        """Больше не читать; недописанная строка ещё отдастся poll/Stops reading, a last unterminated line is still
+        returned by the next ``poll``"""
+        if self.closed and self.fd is None and self.watcher is None:
+            return
+        self._flush()
+        self.closed = True
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+        if self.fd is not None and self.is_fifo:
+            os.close(self.fd)
+        self.fd = None
@@ -0,0 +1,158 @@
+from time import perf_counter_ns
+
+from game.AutoPlay import AutoPlay
+from game.PathTables import DIRECTIONS, UNREACHABLE
+
+
+class CooperativePlay(AutoPlay):
+    """Кооперативный автомат/Windowed cooperative planner for all robots of one player.
+
+    Robots are planned one after another in space-time: a move happens in one of the turn's move slots and every
+    planned robot reserves ``(cell, slot)`` pairs in a shared reservation table, so later robots route around earlier
+    ones instead of bumping into them. The static distance tables serve as the exact heuristic (the hierarchical part
+    of HCA*). The move budget is split evenly between robots that can make progress, and unused slots are re-planned
+    from the new positions until the turn's budget is spent.
+    """
+
+    def play(self):
+        """Main game function for cooperative autoplay"""
+        remaining = self.player.move_limit_per_turn
+        available_moves = False
+        metrics = self.player.game_state.metrics
+        while remaining > 0 and not self.player.game_state.game_over:
+            start = perf_counter_ns() if metrics else 0
+            schedule = self.plan_turn(remaining)
+            if metrics:
+                metrics.observe("cooperative_window", self.player.idx, start)
+            if not schedule:
+                break
+            for robot, direction in schedule:
+                if self.player.game_state.game_over or not robot.move(direction, self.board):
+                    break
+                remaining -= 1
+                available_moves = True
+            else:
+                continue
+            break
+        return available_moves
+
+    def choose_goal(self, robot):
+        """Цель робота: пункт приёма или зелёная клетка над назначенной посылкой/Target cell or pickup cell
+        above the package assigned to the robot"""
+        tables = self.board.path_tables
+        src = self.board.cell_index(*robot.pos)
+        number = robot.package.number if robot.package else 0
+        if robot.has_package:
+            candidates = [(cell.x, cell.y) for cell in self.board.target_cells.get(robot.package.number, [])]
+        else:
+            package = self.assign_packages().get(robot)
+            candidates = [(package.pos[0], package.pos[1] - 1)] if package else []
+        best, best_distance = None, UNREACHABLE
+        for pos in candidates:
+            distance = tables.distance(src, self.board.cell_index(*pos), number)
+            if 0 < distance < best_distance:
+                best, best_distance = pos, distance
+        return best
+
+    def plan_turn(self, move_limit):
+        """План хода всех роботов игрока/Plans up to ``move_limit`` moves, returns ``[(robot, direction), ...]``"""
+        board = self.board
+        robots = self.player.robots
+        own = {board.cell_index(*robot.pos) for robot in robots}
+        blocked = {index for index, owner in enumerate(board.occupancy) if owner} - own
+
+        goals = {}
+        for robot in robots:
+            goal = self.choose_goal(robot)
+            if goal:
+                goals[robot] = board.cell_index(*goal)
+        if not goals:
+            return []
+
+        tables = board.path_tables
+
+        def heuristic(robot, cell):
+            return tables.distance(cell, goals[robot], robot.package.number if robot.package else 0)
+
+        order = sorted(goals, key=lambda r: (not r.has_package, heuristic(r, board.cell_index(*r.pos))))
+        cap = -(-move_limit // len(order))
+        reservations = {}
+        for robot in robots:
+            start = board.cell_index(*robot.pos)
+            for t in range(move_limit + 1):
+                reservations[(start, t)] = robot
+        slots = [None] * move_limit
+        paths = {}
+        for robot in order:
+            path = self.plan_robot(robot, goals[robot], move_limit, cap, blocked, reservations, slots, heuristic)
+            if path:
+                paths[robot] = path
+
+        schedule = []
+        for t, robot in enumerate(slots):
+            if robot is not None:
+                src, dest = paths[robot][t], paths[robot][t + 1]
+                for direction, cell in tables.neighbors[src]:
+                    if cell == dest:
+                        schedule.append((robot, DIRECTIONS[direction][0]))
+        return schedule
+
+    def plan_robot(self, robot, goal, window, cap, blocked, reservations, slots, heuristic):
+        """Пространственно-временной поиск для одного робота/Space-time search for one robot.
+
+        Layer ``t`` holds the states ``(cell, moves_used)`` reachable after slot ``t``. A robot may only move in a
+        free slot and never into a cell reserved by another robot at that time. Returns the cell for every time step
+        and reserves it, or None when the robot cannot get closer to its goal.
+        """
+        tables = self.board.path_tables
+        passable = tables.passable[tables.variant(robot.package.number if robot.package else 0)]
+        start = self.board.cell_index(*robot.pos)
+
+        def free(cell, t):
+            owner = reservations.get((cell, t))
+            return owner is None or owner is robot
+
+        def rests(cell, t):
+            return all(free(cell, later) for later in range(t, window + 1))
+
+        best_key, best_state = (heuristic(robot, start), 0), None
+        layer = {(start, 0): None}
+        parents = [layer]
+        for t in range(window):
+            next_layer = {}
+            for state in layer:
+                cell, moves = state
+                if cell == goal:
+                    continue
+                if free(cell, t + 1) and (cell, moves) not in next_layer:
+                    next_layer[(cell, moves)] = state
+                if slots[t] is None and moves < cap:
+                    for _, neighbor in tables.neighbors[cell]:
+                        if (passable[neighbor] and neighbor not in blocked and free(neighbor, t)
+                                and free(neighbor, t + 1) and (neighbor, moves + 1) not in next_layer):
+                            next_layer[(neighbor, moves + 1)] = state
+            parents.append(next_layer)
+            for cell, moves in next_layer:
+                key = (heuristic(robot, cell), moves)
+                if key < best_key and rests(cell, t + 1):
+                    best_key, best_state = key, (t + 1, (cell, moves))
+            layer = next_layer
+
+        if best_state is None:
+            return None
+        end_time, state = best_state
+        path = [state[0]]
+        for t in range(end_time, 0, -1):
+            state = parents[t][state]
+            path.append(state[0])
+        path.reverse()
+        path.extend([path[-1]] * (window - end_time))
+
+        for t in range(window + 1):
+            if reservations.get((start, t)) is robot:
+                del reservations[(start, t)]
+            reservations[(path[t], t)] = robot
+        for t in range(window):
+            if path[t] != path[t + 1]:
+                slots[t] = robot
+        return path
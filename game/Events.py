@@ -0,0 +1,176 @@
+import json
+import logging
+import queue
+from collections import deque
+
+from game.Cell import column_name
+
+# Виды событий и их поля/Event kinds and their fields; player is 0-based, x and y are board coordinates
+PLACED = "placed"                # player, robot, x, y
+PLACING_ENDED = "placing_ended"  #
+MOVED = "moved"                  # player, robot, direction, x, y
+MOVE_BLOCKED = "move_blocked"    # player, robot, x, y, reason
+PICKED = "picked"                # player, robot, number, x, y
+DROPPED = "dropped"              # player, robot, number, x, y
+RELEASED = "released"            # player, robot
+SCORED = "scored"                # player, score
+WON = "won"                      # player
+TURN_SWITCHED = "turn_switched"  # player
+NO_MOVES = "no_moves"            # player
+GAME_ENDED = "game_ended"        #
+
+FIELDS = {
+    PLACED: ("player", "robot", "x", "y"),
+    PLACING_ENDED: (),
+    MOVED: ("player", "robot", "direction", "x", "y"),
+    MOVE_BLOCKED: ("player", "robot", "x", "y", "reason"),
+    PICKED: ("player", "robot", "number", "x", "y"),
+    DROPPED: ("player", "robot", "number", "x", "y"),
+    RELEASED: ("player", "robot"),
+    SCORED: ("player", "score"),
+    WON: ("player",),
+    TURN_SWITCHED: ("player",),
+    NO_MOVES: ("player",),
+    GAME_ENDED: (),
+}
+
+BLOCK_REASONS = {
+    "red": "tried to move to a red cell",
+    "target": "tried to move to a target cell with incompatible package",
+}
+
+
+def cell_name(x, y):
+    return f"({column_name(x)}, {y + 1})"
+
+
+MESSAGES = {
+    PLACED: lambda turn, player, robot, x, y: f"Player {player + 1} placed robot {robot} at {cell_name(x, y)}.",
+    PLACING_ENDED: lambda turn: "Placing phase ended.",
+    MOVED: lambda turn, player, robot, direction, x, y:
+        f"[Turn {turn}] Player {player + 1} moved robot {robot} {direction} to {cell_name(x, y)}.",
+    MOVE_BLOCKED: lambda turn, player, robot, x, y, reason:
+        f"Robot {robot} of Player {player + 1} {BLOCK_REASONS[reason]} at {cell_name(x, y)}. Move cancelled.",
+    PICKED: lambda turn, player, robot, number, x, y:
+        f"[Turn {turn}] Robot {robot} of Player {player + 1} picked up package with number {number} at position "
+        f"{cell_name(x, y)}.",
+    DROPPED: lambda turn, player, robot, number, x, y:
+        f"Robot {robot} of Player {player + 1} dropped package with number {number} at position {cell_name(x, y)}.",
+    RELEASED: lambda turn, player, robot:
+        f"Robot {robot} of Player {player + 1} delivered the package and is removed from the turn.",
+    SCORED: lambda turn, player, score: f"[Turn {turn}] Player {player + 1}'s score is now {score}.",
+    WON: lambda turn, player: f"[Turn {turn}] Player {player + 1} reached the winning score. Resetting the game.",
+    TURN_SWITCHED: lambda turn, player: f"Switched to player {player + 1}.",
+    NO_MOVES: lambda turn, player: f"Player {player + 1} has no available moves, skipping turn.",
+    GAME_ENDED: lambda turn: "Player has ended the game",
+}
+
+
+class Event:
+    """Событие игры/Typed game event; the text is only formatted when a sink asks for it"""
+    __slots__ = ('kind', 'turn', 'fields')
+
+    def __init__(self, kind, turn, fields):
+        self.kind = kind
+        self.turn = turn
+        self.fields = fields
+
+    def __str__(self):
+        return MESSAGES[self.kind](self.turn, *self.fields)
+
+    def to_dict(self):
+        record = {"kind": self.kind, "turn": self.turn}
+        record.update(zip(FIELDS[self.kind], self.fields))
+        return record
+
+
+class EventBus:
+    """Шина событий партии/Per-game event bus.
+
+    Sinks are callables taking an Event. Without sinks ``emit`` returns before creating anything, so headless batch
+    games pay one method call per event.
+    """
+
+    def __init__(self):
+        self.sinks = []
+
+    def subscribe(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def unsubscribe(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def emit(self, kind, turn, *fields):
+        if not self.sinks:
+            return
+        event = Event(kind, turn, fields)
+        for sink in self.sinks:
+            sink(event)
+
+
+class RingBuffer:
+    """Последние события в памяти/Keeps the last ``capacity`` events in memory"""
+
+    def __init__(self, capacity=10000):
+        self.events = deque(maxlen=capacity)
+
+    def __call__(self, event):
+        self.events.append(event)
+
+
+class ConsoleSink:
+    """События в logging/Forwards events to a logger, formatting them only if a handler emits them"""
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger()
+        self.level = level
+
+    def __call__(self, event):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s", event)
+
+
+class JsonlHandler(logging.Handler):
+    """Пишет события пачками в JSONL/Writes events as JSON lines, ``batch_size`` lines per write"""
+
+    def __init__(self, path, batch_size=256):
+        super().__init__()
+        self.file = open(path, 'a')
+        self.batch_size = batch_size
+        self.batch = []
+
+    def emit(self, event):
+        self.batch.append(json.dumps(event.to_dict()))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self.file.write("\n".join(self.batch) + "\n")
+            self.batch = []
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+        super().close()
+
+
+class JsonlSink:
+    """JSONL в фоновом потоке/JSONL file sink; the game thread only enqueues, a QueueListener thread writes"""
+
+    def __init__(self, path, batch_size=256):
+        from logging.handlers import QueueListener
+        self.queue = queue.SimpleQueue()
+        self.handler = JsonlHandler(path, batch_size)
+        self.listener = QueueListener(self.queue, self.handler)
+        self.listener.start()
+
+    def __call__(self, event):
+        self.queue.put_nowait(event)
+
+    def close(self):
+        self.listener.stop()
+        self.handler.close()
@@ -0,0 +1,173 @@
+import logging
+import random
+import threading
+from time import perf_counter_ns
+
+from game.AutoPlay import AutoPlay
+from game.Board import Board
+from game.CommandCompiler import step_direction
+from game.CooperativePlay import CooperativePlay
+from game.Events import EventBus, NO_MOVES, PLACING_ENDED, TURN_SWITCHED
+from game.Metrics import Metrics
+from game.Player import Player
+from game.SearchPlay import SearchPlay
+
+PLAYER_COLORS = [('blue', 0), ('red', 1), ('green', 2), ('orange', 3)]
+# Вид игрока из game.config: 0 - человек, остальные - автоматы/Player types from game.config, 0 is a human
+STRATEGIES = {1: AutoPlay, 2: CooperativePlay, 3: SearchPlay}
+
+
+class GameState:
+    """Состояние игры без графики: доска, игроки, очередь ходов/Pure-logic game state, runs without pygame.
+
+    A renderer (PlayerSimulator) can be attached through ``renderer``; without it every move resolves instantly.
+    All randomness comes from generators seeded by ``seed`` (argument, game.config or a fresh one), so a game is
+    reproduced by its seed and its decisions. Everything that happens is published on ``events``; logging, replay
+    logs and statistics subscribe to it.
+    """
+
+    def __init__(self, config, colors_map=None, targets_map=None, all_auto=False, seed=None):
+        self.config = config
+        self.events = EventBus()
+        self.metrics: Metrics = Metrics() if config.profiling else None
+        self.seed: int = seed if seed is not None else config.seed
+        if self.seed is None:
+            self.seed = random.randrange(1 << 32)
+        self.rng = random.Random(self.seed)  # расстановка автоматов/autoplay placement
+        self.colors_map = colors_map or config.colors_map
+        self.targets_map = targets_map or config.targets_map
+        self.board: Board = Board(self.colors_map, self.targets_map, random.Random(self.rng.getrandbits(64)))
+        self.players: list[Player] = [
+            Player(color=color, num_robots=config.robots_per_player, idx=idx,
+                   move_limit_per_turn=config.move_limit_per_turn, game_state=self)
+            for color, idx in PLAYER_COLORS[:config.get_num_players()]
+        ]
+        self.auto_play: dict[int, AutoPlay] = {
+            player.idx: STRATEGIES.get(player_type, AutoPlay)(player, self.board)
+            for player_type, player in zip(config.players_info[1:], self.players)
+            if all_auto or player_type in STRATEGIES
+        }
+        self.renderer = None
+        self.lock = threading.Lock()  # держат ходы роботов и смена игрока/held by every robot move and player switch
+        self.current_player: int = 0
+        self.placing_phase: bool = True
+        self.robots_placed: int = 0
+        self.total_robots_to_place: int = len(self.players) * config.robots_per_player
+        self.turn_counter: int = 0  # Отслеживает текущий ход игры
+        self.turns_taken: int = 0  # Число завершённых ходов игроков
+        self.winner_index: int = None  # Индекс победителя
+        self.game_over: bool = False
+        self.place_initial_packages()
+
+    def place_initial_packages(self):
+        """Начальный этап: Размещение начальных посылок на доске"""
+        for cell in self.board.get_cells_by_color('r'):
+            package = self.board.place_package((cell.x, cell.y))
+            package.visible = False
+
+    def update_package_visibility(self, placing_phase):
+        """Обновление видимости: посылки скрыты во время расстановки/Packages are hidden while placing"""
+        self.placing_phase = placing_phase
+        for package in self.board.packages.values():
+            package.visible = not placing_phase
+
+    def is_auto(self, player_index):
+        return player_index in self.auto_play
+
+    def current_auto_play(self):
+        return self.auto_play.get(self.current_player)
+
+    def place_robot(self, cell_x, cell_y):
+        """Размещение робота текущего игрока/Places a robot of the current player, True when placing is over"""
+        if not (0 <= cell_x < self.board.size and 0 <= cell_y < self.board.height):
+            return False
+        player = self.players[self.current_player]
+        if not player.place_robot((cell_x, cell_y), self.board, len(player.robots)):
+            return False
+        self.robots_placed += 1
+        if self.robots_placed >= self.total_robots_to_place:
+            self.events.emit(PLACING_ENDED, self.turn_counter)
+            self.current_player = 0
+            self.update_package_visibility(False)
+            return True
+        self.current_player = (self.current_player + 1) % len(self.players)
+        return False
+
+    def put_robot(self, player_index, cell):
+        """Установка бота для второго режима/PUT BOT of mode 2, ``cell`` is a flat index"""
+        size = self.board.size
+        pos = (cell % size, cell // size)
+        player = self.players[player_index]
+        return player.place_robot(pos, self.board, len(player.robots))
+
+    def move_robot_along(self, player_index, cells):
+        """Ход по пути для второго режима/MOVE of mode 2: the robot on ``cells[0]`` walks along the flat indices"""
+        size = self.board.size
+        player = self.players[player_index]
+        start_pos = (cells[0] % size, cells[0] // size)
+        robot = None
+        for r in player.robots:
+            if r.pos == start_pos:
+                robot = r
+                break
+        if not robot:
+            logging.warning("No robot found at start position: %s", start_pos)
+            return False
+
+        for cell in cells[1:]:
+            direction = step_direction(robot.pos, (cell % size, cell // size))
+            if direction:
+                robot.move(direction, self.board)
+            if player.remaining_moves <= 0:
+                self.switch_to_next_player()
+                break
+        return True
+
+    def end_placing_phase(self):
+        if self.placing_phase:
+            self.events.emit(PLACING_ENDED, self.turn_counter)
+            self.update_package_visibility(False)
+
+    def switch_to_next_player(self):
+        """Смена игрока: Переход хода к следующему игроку"""
+        self.players[self.current_player].reset_moves()
+        self.current_player = (self.current_player + 1) % len(self.players)
+        self.turns_taken += 1
+        self.events.emit(TURN_SWITCHED, self.turn_counter, self.current_player)
+
+    def finish(self, winner_index):
+        """Конец игры: игрок набрал нужное число очков/A player reached the winning score"""
+        self.winner_index = winner_index
+        self.game_over = True
+
+    def play_auto_placement(self):
+        """Расстановка роботов автоматами/Places robots for the current autoplay player"""
+        autoplay = self.current_auto_play()
+        pos = autoplay.get_random_white_cell_position()
+        if pos is None:
+            logging.error("No white cells available to place robot.")
+            return False
+        self.place_robot(pos[0], pos[1])
+        return True
+
+    def play_auto_turn(self):
+        """Один ход автомата и передача хода/One autoplay turn followed by switching player"""
+        start = perf_counter_ns() if self.metrics else 0
+        if not self.current_auto_play().play():
+            self.events.emit(NO_MOVES, self.turn_counter, self.current_player)
+        if self.metrics:
+            self.metrics.observe("plan", self.current_player, start)
+        if not self.game_over:
+            with self.lock:
+                self.switch_to_next_player()
+
+    def run_headless(self, max_turns=1000):
+        """Полная игра без графики/Plays a whole game with autoplay only, no display and no delays"""
+        if len(self.auto_play) != len(self.players):
+            raise ValueError("Headless games need an AutoPlay for every player")
+        while self.placing_phase:
+            if not self.play_auto_placement():
+                return self
+        while not self.game_over and self.turns_taken < max_turns:
+            self.play_auto_turn()
+        return self
@@ -0,0 +1,89 @@
+import argparse
+import os
+import random
+
+MIN_WIDTH, MIN_HEIGHT = 5, 7
+MAX_SIZE = 200
+
+
+def dock_cells(width, height):
+    """Пункты приёма по краям/Target docks on the left, top and right edges in numbering order.
+
+    Left edge bottom-up, top edge left to right, right edge top-down, every second cell - the order of map.csv.
+    """
+    return ([(0, y) for y in range(height - 3, 1, -1) if y % 2 == 0]
+            + [(x, 0) for x in range(2, width - 2, 2)]
+            + [(width - 1, y) for y in range(2, height - 2, 2)])
+
+
+def generate_map(width, height, targets=9, shelf=1, seed=None):
+    """Склад width x height/Warehouse layout as ``(colors, targets)`` row lists.
+
+    Gray lanes run along the edges with numbered yellow docks on the left, top and right. A white hall for placing
+    robots sits under the top lane, racks fill the rest from the bottom: a row of green pickup cells above a row of
+    red package sources, racks separated by gray lanes. ``shelf`` red sources in a row form one shelf with blue
+    uprights between them and a gray aisle after it. ``targets`` classes are spread over the docks, shuffled when a
+    ``seed`` is given. ``generate_map(9, 9)`` is csv_files/map.csv.
+    """
+    if not (MIN_WIDTH <= width <= MAX_SIZE and MIN_HEIGHT <= height <= MAX_SIZE):
+        raise ValueError(f"map size must be from {MIN_WIDTH}x{MIN_HEIGHT} to {MAX_SIZE}x{MAX_SIZE}")
+    docks = dock_cells(width, height)
+    if not 1 <= targets <= min(len(docks), 255):
+        raise ValueError(f"a {width}x{height} map has room for 1 to {min(len(docks), 255)} target classes")
+
+    colors = [['g'] * width for _ in range(height)]
+    numbers = [[0] * width for _ in range(height)]
+    colors[0][0] = colors[0][width - 1] = 'b'
+
+    hall_min = max(3, height // 5)
+    racks = max(1, (height - 1 - hall_min) // 3)
+    top = height - 3 * racks + 1  # строка зелёных клеток верхнего стеллажа/pickup row of the topmost rack
+    for y in range(2, top):
+        for x in range(2, width - 2):
+            colors[y][x] = 'w'
+    sources = range(2, width - 2, 2)
+    for rack in range(racks):
+        red_y = height - 1 - 3 * rack
+        for i, x in enumerate(sources):
+            colors[red_y - 1][x] = 'a'
+            colors[red_y][x] = 'r'
+            if (i + 1) % shelf and x + 2 < width - 2:
+                colors[red_y][x + 1] = 'b'
+
+    classes = [i % targets + 1 for i in range(len(docks))]
+    if seed is not None:
+        random.Random(seed).shuffle(classes)
+    for (x, y), number in zip(docks, classes):
+        colors[y][x] = 'y'
+        numbers[y][x] = number
+    return colors, numbers
+
+
+def write_map(colors, targets, colors_path, targets_path):
+    with open(colors_path, "w") as file:
+        file.write("\n".join(",".join(row) for row in colors))
+    with open(targets_path, "w") as file:
+        file.write("\n".join(",".join(map(str, row)) for row in targets))
+    return colors_path, targets_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warehouse map generator")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("--targets", type=int, default=9, help="number of target classes")
+    parser.add_argument("--shelf", type=int, default=1, help="package sources per shelf")
+    parser.add_argument("--seed", type=int, help="shuffle target classes over the docks")
+    parser.add_argument("--output", default="csv_files", help="directory for the map files")
+    args = parser.parse_args(argv)
+
+    name = f"warehouse_{args.width}x{args.height}"
+    colors, targets = generate_map(args.width, args.height, args.targets, args.shelf, args.seed)
+    os.makedirs(args.output, exist_ok=True)
+    paths = write_map(colors, targets, os.path.join(args.output, f"{name}.csv"),
+                      os.path.join(args.output, f"{name}_targets.csv"))
+    print(*paths)
+
+
+if __name__ == "__main__":
+    main()
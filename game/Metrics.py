@@ -0,0 +1,164 @@
+import io
+import json
+from time import perf_counter_ns
+
+BUCKETS = 48  # 2**47 нс - почти 40 часов/2**47 ns is almost 40 hours
+
+
+def by_name_and_player(item):
+    (name, player), _ = item
+    return name, -1 if player is None else player
+
+
+class Histogram:
+    """Гистограмма длительностей/Histogram of nanosecond durations with power of two buckets"""
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.buckets = [0] * BUCKETS
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.buckets[min(value.bit_length(), BUCKETS - 1)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        for i, value in enumerate(other.buckets):
+            self.buckets[i] += value
+
+    def quantile(self, q):
+        """Верхняя граница корзины с квантилем q/Upper bound of the bucket holding quantile ``q``"""
+        rank = q * self.count
+        seen = 0
+        for i, value in enumerate(self.buckets):
+            seen += value
+            if value and seen >= rank:
+                return min(1 << i, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ns": self.total,
+            "mean_ns": self.total / self.count if self.count else 0,
+            "min_ns": self.min or 0,
+            "max_ns": self.max,
+            "p50_ns": self.quantile(0.5),
+            "p90_ns": self.quantile(0.9),
+            "p99_ns": self.quantile(0.99),
+            "buckets": {str(1 << i): value for i, value in enumerate(self.buckets) if value},
+        }
+
+
+class Metrics:
+    """Замеры фаз партии/Opt-in per-game instrumentation.
+
+    Spans time phases with ``perf_counter_ns``: call sites take ``start = perf_counter_ns()`` and pass it to
+    ``observe``. Spans nest, so "plan" includes the "move" and "pathfind" spans of the same turn. Durations go into
+    histograms per phase and player; counters count work such as A* nodes or cache hits. ``player`` is the 0-based
+    player index or None for phases that belong to no player. Games are combined with ``merge``.
+    """
+
+    def __init__(self):
+        self.spans: dict[tuple, Histogram] = {}
+        self.counters: dict[tuple, int] = {}
+        self.games = 1
+
+    def observe(self, phase, player, start):
+        key = (phase, player)
+        histogram = self.spans.get(key)
+        if histogram is None:
+            histogram = self.spans[key] = Histogram()
+        histogram.observe(perf_counter_ns() - start)
+
+    def count(self, name, player=None, value=1):
+        key = (name, player)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def merge(self, other):
+        for key, histogram in other.spans.items():
+            if key not in self.spans:
+                self.spans[key] = Histogram()
+            self.spans[key].merge(histogram)
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.games += other.games
+        return self
+
+    @staticmethod
+    def label(player):
+        return "all" if player is None else str(player + 1)
+
+    def to_dict(self):
+        spans, counters = {}, {}
+        for (phase, player), histogram in sorted(self.spans.items(), key=by_name_and_player):
+            spans.setdefault(phase, {})[self.label(player)] = histogram.to_dict()
+        for (name, player), value in sorted(self.counters.items(), key=by_name_and_player):
+            counters.setdefault(name, {})[self.label(player)] = value
+        return {"games": self.games, "spans": spans, "counters": counters}
+
+    def to_prometheus(self, prefix="antbot"):
+        """Текст для Prometheus/Prometheus text exposition format"""
+        lines = [f"# TYPE {prefix}_phase_seconds histogram"]
+        for (phase, player), histogram in sorted(self.spans.items(), key=by_name_and_player):
+            labels = f'phase="{phase}",player="{self.label(player)}"'
+            cumulative = 0
+            for i, value in enumerate(histogram.buckets):
+                cumulative += value
+                if value:
+                    lines.append(f'{prefix}_phase_seconds_bucket{{{labels},le="{(1 << i) / 1e9:.9g}"}} {cumulative}')
+            lines.append(f'{prefix}_phase_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'{prefix}_phase_seconds_sum{{{labels}}} {histogram.total / 1e9:.9g}')
+            lines.append(f'{prefix}_phase_seconds_count{{{labels}}} {histogram.count}')
+        last = None
+        for (name, player), value in sorted(self.counters.items(), key=by_name_and_player):
+            if name != last:
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                last = name
+            lines.append(f'{prefix}_{name}_total{{player="{self.label(player)}"}} {value}')
+        lines.append(f"# TYPE {prefix}_games_total counter")
+        lines.append(f"{prefix}_games_total {self.games}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """JSON или Prometheus по расширению/Writes Prometheus text for ``.prom`` files, JSON otherwise"""
+        with open(path, "w") as file:
+            if path.endswith(".prom"):
+                file.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), file, indent=2)
+
+
+class ProfileCapture:
+    """cProfile на всё время игры/cProfile capture switched on from game.config; cProfile and pstats are imported
+    here, only when profiling is on"""
+
+    def __init__(self, path="profile.pstats"):
+        import cProfile
+        self.path = path
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self, top=25):
+        """Сохранить профиль и вернуть самые дорогие функции/Dumps the profile, returns the top functions as text"""
+        self.profile.disable()
+        self.profile.dump_stats(self.path)
+        import pstats
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats("cumulative").print_stats(top)
+        return stream.getvalue()
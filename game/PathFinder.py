@@ -0,0 +1,104 @@
+import heapq
+from array import array
+
+from game.PathTables import DIRECTIONS
+
+
+class PathFinder:
+    """A* по плоским индексам клеток с переиспользуемыми буферами/A* over flat cell indices with reusable buffers.
+
+    Legality matches ``AutoPlay.is_valid_move``: occupied cells, red/blue cells and target cells for other package
+    numbers are impassable. Instead of rebuilding the path, every node carries the direction of the first step that
+    reached it, so the answer is known as soon as the target is popped.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.tables = board.path_tables
+        self.width = self.tables.width
+        num_cells = self.tables.num_cells
+        self.visited = array('I', [0]) * num_cells
+        self.cost = array('I', [0]) * num_cells
+        self.parent = array('i', [-1]) * num_cells
+        self.first = bytearray(num_cells)
+        self.heap = []
+        self.generation = 0
+        self.expanded = 0
+        self.last_distance = None
+
+    def _next_generation(self):
+        self.generation += 1
+        if self.generation == 0xFFFFFFFF:
+            self.visited = array('I', [0]) * len(self.visited)
+            self.generation = 1
+        return self.generation
+
+    def first_step(self, start_pos, target_pos, number=0):
+        """Первый шаг кратчайшего пути/First step ``(direction, new_pos)`` of a shortest path or None"""
+        width = self.width
+        start = start_pos[1] * width + start_pos[0]
+        target = target_pos[1] * width + target_pos[0]
+        self.last_distance = None
+        if start == target:
+            return None
+        passable = self.tables.passable[self.tables.variant(number)]
+        if not passable[target] or self.board.occupancy[target]:
+            return None
+
+        occupancy = self.board.occupancy
+        neighbors = self.tables.neighbors
+        visited, cost, parent, first = self.visited, self.cost, self.parent, self.first
+        heap = self.heap
+        heap.clear()
+        generation = self._next_generation()
+        target_x, target_y = target_pos
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        visited[start] = generation
+        cost[start] = 0
+        parent[start] = -1
+        for direction, cell in neighbors[start]:
+            if passable[cell] and not occupancy[cell]:
+                visited[cell] = generation
+                cost[cell] = 1
+                parent[cell] = start
+                first[cell] = direction
+                h = abs(cell % width - target_x) + abs(cell // width - target_y)
+                heappush(heap, (1 + h, h, cell))
+
+        expanded = 0
+        while heap:
+            f, h, current = heappop(heap)
+            if f - h != cost[current]:
+                continue
+            expanded += 1
+            if current == target:
+                self.expanded += expanded
+                self.last_distance = cost[current]
+                direction, dx, dy = DIRECTIONS[first[current]]
+                return direction, (start_pos[0] + dx, start_pos[1] + dy)
+            next_cost = cost[current] + 1
+            current_first = first[current]
+            for _, cell in neighbors[current]:
+                if passable[cell] and not occupancy[cell] and (
+                        visited[cell] != generation or next_cost < cost[cell]):
+                    visited[cell] = generation
+                    cost[cell] = next_cost
+                    parent[cell] = current
+                    first[cell] = current_first
+                    h = abs(cell % width - target_x) + abs(cell // width - target_y)
+                    heappush(heap, (next_cost + h, h, cell))
+        self.expanded += expanded
+        return None
+
+    def path(self, target_pos):
+        """Полный путь последнего поиска/Cells of the last found path, for debugging and drawing"""
+        cell = target_pos[1] * self.width + target_pos[0]
+        if self.last_distance is None:
+            return None
+        cells = []
+        while self.parent[cell] != -1:
+            cells.append(cell)
+            cell = self.parent[cell]
+        cells.reverse()
+        return [(cell % self.width, cell // self.width) for cell in cells]
@@ -0,0 +1,165 @@
+from array import array
+from collections import OrderedDict, deque
+
+UNREACHABLE = 0xFFFF
+NO_STEP = 0xFF
+DIRECTIONS = (("up", 0, -1), ("down", 0, 1), ("left", -1, 0), ("right", 1, 0))
+PASSABLE_COLORS = ('w', 'a', 'g', 'y')
+ROW_CACHE_BYTES = 32 << 20  # память под строки одной карты/memory for the cached rows of one map
+MIN_CACHED_ROWS = 64
+CACHED_MAPS = 4  # сколько карт держать в процессе/maps kept per process
+
+
+class PathTables:
+    """Таблицы расстояний и следующего шага по статичной карте/Distance and next-hop tables over the static board.
+
+    Cells are flat indices ``y * width + x``. There is one variant per package number: variant 0 is a robot without
+    a package, variant ``n`` may also enter target cells with digit ``n`` (same rules as ``AutoPlay.is_valid_move``
+    without occupancy). For every destination a row holds the distance from each cell and the direction index of
+    the first step, so a planner answers "which step next" with two array lookups. Rows are built on first use
+    and kept in an LRU of about ROW_CACHE_BYTES: a game touches only a few of them, and the cache is shared by every
+    game in the process, so it must not grow with the number of cells robots have stood on.
+    """
+
+    _cache = {}
+
+    def __init__(self, board):
+        self.width = board.size
+        self.height = board.height
+        self.num_cells = self.width * self.height
+        self.neighbors = []
+        for y in range(self.height):
+            for x in range(self.width):
+                self.neighbors.append(tuple(
+                    (d, (y + dy) * self.width + x + dx)
+                    for d, (_, dx, dy) in enumerate(DIRECTIONS)
+                    if 0 <= x + dx < self.width and 0 <= y + dy < self.height
+                ))
+
+        digits = sorted(set(board.targets) - {0})
+        self.variants = [0] + digits
+        self.passable = {}
+        for variant in self.variants:
+            self.passable[variant] = bytes(
+                color in PASSABLE_COLORS and (not target or target == variant)
+                for color, target in zip(board.colors, board.targets)
+            )
+        self.target_cells = {}
+        for cell, target in enumerate(board.targets):
+            if target:
+                self.target_cells.setdefault(target, []).append(cell)
+        self.nearest_targets = {}
+        self.rows = OrderedDict()  # (variant, dest) -> (distances, next hops), oldest first
+        self.max_rows = max(MIN_CACHED_ROWS, ROW_CACHE_BYTES // (3 * self.num_cells))
+
+    @classmethod
+    def for_board(cls, board):
+        """Таблицы общие для всех досок с одной картой/Tables are shared by boards loaded from the same map, the
+        CACHED_MAPS most recently used maps are kept"""
+        key = board.colors, board.targets.tobytes(), board.size
+        tables = cls._cache.get(key)
+        if tables is None:
+            tables = cls._cache[key] = cls(board)
+            if len(cls._cache) > CACHED_MAPS:
+                del cls._cache[next(iter(cls._cache))]
+        else:
+            cls._cache[key] = cls._cache.pop(key)
+        return tables
+
+    def variant(self, number):
+        return number if number in self.passable else 0
+
+    def _bfs(self, variant, sources, start=0):
+        """Обратный BFS от целей/Reverse BFS from ``sources`` over cells passable for ``variant``, sources get
+        distance ``start``"""
+        passable = self.passable[variant]
+        neighbors = self.neighbors
+        dist = array('H', [UNREACHABLE]) * self.num_cells
+        queue = deque(source for source in sources if passable[source])
+        for source in queue:
+            dist[source] = start
+        while queue:
+            current = queue.popleft()
+            next_dist = dist[current] + 1
+            for _, cell in neighbors[current]:
+                if dist[cell] == UNREACHABLE:
+                    dist[cell] = next_dist
+                    if passable[cell]:
+                        queue.append(cell)
+        return dist
+
+    def _build_row(self, variant, dest):
+        """Обратный BFS от цели/Reverse BFS from ``dest`` over cells passable for ``variant``"""
+        passable = self.passable[variant]
+        neighbors = self.neighbors
+        dist = self._bfs(variant, (dest,))
+        hop = bytearray([NO_STEP]) * self.num_cells
+        if passable[dest]:
+            for cell in range(self.num_cells):
+                cell_dist = dist[cell]
+                if cell_dist == UNREACHABLE or cell_dist == 0:
+                    continue
+                for direction, neighbor in neighbors[cell]:
+                    if passable[neighbor] and dist[neighbor] == cell_dist - 1:
+                        hop[cell] = direction
+                        break
+        self.rows[variant, dest] = dist, hop
+        if len(self.rows) > self.max_rows:
+            self.rows.popitem(last=False)
+        return dist, hop
+
+    def _row(self, variant, dest):
+        row = self.rows.get((variant, dest))
+        if row is None:
+            return self._build_row(variant, dest)
+        self.rows.move_to_end((variant, dest))
+        return row
+
+    def distance(self, src, dest, number=0):
+        """Длина кратчайшего пути без учёта роботов/Shortest path length ignoring robots, UNREACHABLE if none"""
+        return self._row(self.variant(number), dest)[0][src]
+
+    def distances_from(self, src, number=0):
+        """Расстояния от src до всех проходимых клеток/Distances from ``src`` to every passable cell.
+
+        Moves are symmetric, so the reverse BFS from ``src`` gives them. Not cached: robots stand on ever new cells,
+        and one BFS without next hops is cheaper than building a row. A robot may stand on a cell it cannot enter
+        (a target cell after delivering), then its first step goes to a passable neighbour: a BFS from the neighbours
+        starting at 1.
+        """
+        variant = self.variant(number)
+        if self.passable[variant][src]:
+            return self._bfs(variant, (src,))
+        return self._bfs(variant, [cell for _, cell in self.neighbors[src]], 1)
+
+    def nearest(self, cells, number=0):
+        """Расстояние от каждой клетки до ближайшей из cells/Distance from every cell to the nearest of ``cells``
+        for a robot carrying ``number``, one multi-source BFS"""
+        return self._bfs(self.variant(number), cells)
+
+    def target_distances(self, number):
+        """Расстояние от каждой клетки до ближайшего пункта приёма number/Distance from every cell to the nearest
+        target cell with digit ``number``, cached per digit of the map"""
+        dist = self.nearest_targets.get(number)
+        if dist is None:
+            dist = self.nearest(self.target_cells.get(number, ()), number)
+            if number in self.target_cells:
+                self.nearest_targets[number] = dist
+        return dist
+
+    def next_hop(self, src, dest, number=0):
+        """Индекс направления первого шага/Direction index of the first step or NO_STEP"""
+        return self._row(self.variant(number), dest)[1][src]
+
+    def route(self, src, dest, number=0):
+        """Клетки закэшированного маршрута без стартовой/Cells of the cached route, start excluded"""
+        hops = self._row(self.variant(number), dest)[1]
+        cells = []
+        while src != dest:
+            direction = hops[src]
+            if direction == NO_STEP:
+                return None
+            _, dx, dy = DIRECTIONS[direction]
+            src += dy * self.width + dx
+            cells.append(src)
+        return cells
@@ -1,18 +1,21 @@
-import pygame
-import logging
+from game.Events import PLACED, SCORED, WON
 from game.Robot import Robot
 
 
 class Player:
-    def __init__(self, color, num_robots, idx, move_limit_per_turn, game_manager):
+    __slots__ = ('color', 'idx', 'num_robots', 'robots', 'score', 'delivered_packages', 'move_limit_per_turn',
+                 'remaining_moves', 'game_state')
+
+    def __init__(self, color, num_robots, idx, move_limit_per_turn, game_state):
         self.color = color
         self.idx = idx
         self.num_robots = num_robots
         self.robots = []
         self.score = 0
+        self.delivered_packages = 0
         self.move_limit_per_turn = move_limit_per_turn
         self.remaining_moves = move_limit_per_turn
-        self.game_manager = game_manager
+        self.game_state = game_state
 
     def reset_moves(self):
         """Сброс ходов: Сбрасывает количество оставшихся ходов до начального значения"""
@@ -20,10 +23,12 @@ class Player:
 
     def place_robot(self, pos, board, robot_index):
         """Размещение робота: Устанавливает робота на доске"""
-        if not board.is_occupied(pos[0], pos[1]) and board[pos[0]][pos[1]].color == 'w':
-            board.update_position(None, pos)
+        index = board.cell_index(pos[0], pos[1])
+        if not board.occupancy[index] and board.colors[index] == 'w':
+            board.update_position(None, pos, self.idx + 1)
             robot = Robot(self.color, pos, robot_index + 1, self)
             self.robots.append(robot)
+            self.game_state.events.emit(PLACED, self.game_state.turn_counter, self.idx, robot.index, pos[0], pos[1])
             return True
         return False
 
@@ -35,22 +40,11 @@ class Player:
                 return True
         return False
 
-    def draw_robots(self, screen):
-        """Отображение роботов: Рисует роботов на экране"""
-        for robot in self.robots:
-            robot.robot_animator(screen)
-
-    def increase_score(self, points, game_manager):
-        """Отображение роботов: Рисует роботов на экране"""
+    def increase_score(self, points, game_state):
+        """Начисление очков: при достижении нужного счёта игра заканчивается/Adds points, finishes the game on win"""
         self.score += points
-        logging.info(f"[Turn {game_manager.turn_counter}] Player {self.idx + 1}'s score is now {self.score}.")
-        if self.score >= game_manager.config.win_score:
-            logging.info(f"[Turn {game_manager.turn_counter}] Player {self.idx + 1} reached the winning score. Resetting the game.")
-            game_manager.reset_game()
-
-    def draw_score(self, screen, position):
-        """Отображение счета: Рисует счет игрока на экране"""
-        font = pygame.font.SysFont(None, 36)
-        score_text = f"{self.color.capitalize()} ({self.idx + 1}) Player: {self.score} points"
-        img = font.render(score_text, True, (0, 0, 0))
-        screen.blit(img, position)
+        self.delivered_packages += 1
+        game_state.events.emit(SCORED, game_state.turn_counter, self.idx, self.score)
+        if self.score >= game_state.config.win_score:
+            game_state.events.emit(WON, game_state.turn_counter, self.idx)
+            game_state.finish(self.idx)
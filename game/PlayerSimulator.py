@@ -1,173 +1,339 @@
 import pygame
-import logging
-from game.Board import Board
-from game.consts import DEFAULT_IMAGE_SIZE
-import time
+from time import perf_counter_ns
+from game.Animation import AnimationQueue
+from game.Assets import AssetCache, assets as shared_assets
+from game.Cell import column_name
+from game.Events import GAME_ENDED
+from game.GameState import GameState
+from game.consts import DEFAULT_IMAGE_SIZE, MAX_WINDOW_SIZE, MIN_LABEL_TILE_SIZE, MIN_TILE_SIZE, SCORE_PANEL_WIDTH
+
+PLACEMENT_PAUSE_MS = 200  # пауза после расстановки робота/pause after a robot is placed
 
 
 def index_to_letter(index):
-    return chr(ord('A') + index)
+    return column_name(index)
+
+
+def tile_size(board, max_window=MAX_WINDOW_SIZE):
+    """Сторона клетки, чтобы доска с подписями и счётом влезла в окно/Tile side fitting the board, its labels and
+    the score panel into ``max_window``, never above DEFAULT_IMAGE_SIZE"""
+    return max(MIN_TILE_SIZE, min(DEFAULT_IMAGE_SIZE[0], (max_window[0] - SCORE_PANEL_WIDTH) // (board.size + 2),
+                                  max_window[1] // (board.height + 2)))
 
 
-def parse_position(pos_str):
-    column = ord(pos_str[0].lower()) - ord('a')
-    row = int(pos_str[1]) - 1
-    return column, row
+def window_size(board, tile=None):
+    """Размер окна для доски/Window size in pixels: board with a label border plus the score panel"""
+    tile = tile or tile_size(board)
+    return (board.size + 2) * tile + SCORE_PANEL_WIDTH, (board.height + 2) * tile
 
 
 class PlayerSimulator:
-    def __init__(self, players, board, game_manager):
-        self.players = players
-        self.board = board
-        self.game_manager = game_manager
+    """Отрисовка и ввод поверх GameState/Optional renderer and input handler on top of a GameState"""
+
+    def __init__(self, game_state: GameState, screen, assets: AssetCache = shared_assets, animation_speed=1.0):
+        self.game_state = game_state
+        self.players = game_state.players
+        self.board = game_state.board
+        self.screen = screen
+        side = tile_size(self.board)
+        self.tile = (side, side)
+        self.scale = side / DEFAULT_IMAGE_SIZE[0]  # шрифты и смещения масштабируются вместе с клетками/fonts too
         self.current_robot_index = 0
-        self.current_robot_counts = [0] * len(players)
-        self.total_robots_to_place = len(players) * players[0].num_robots
-        self.robots_placed = 0
-        self.placing_phase = True
-        self.place_initial_packages()
-
-    def place_initial_packages(self):
-        """Начальный этап: Размещение начальных посылок на доске"""
-        red_cells = self.board.get_cells_by_color('r')
-        for i, cell in enumerate(red_cells):
-            package = self.board.place_package((cell.x, cell.y))
-            package.visible = False
+        self.robot_rects = {}
+        self.assets = assets
+        self.animations = AnimationQueue(animation_speed)
+        self.static_layer = None
+        self.drawn_sprites = {}
+        self.full_redraw = True
+        game_state.renderer = self
+
+    @property
+    def placing_phase(self):
+        return self.game_state.placing_phase
 
     def update_package_visibility(self, placing_phase):
         """Обновление видимости: Обновление видимости посылок в зависимости от фазы размещения"""
-        self.placing_phase = placing_phase
-        for row in self.board.cells:
-            for cell in row:
-                if cell.package:
-                    cell.package.visible = not placing_phase
+        self.game_state.update_package_visibility(placing_phase)
+
+    def text_size(self, size):
+        return max(8, round(size * self.scale))
+
+    def cell_at(self, pixel):
+        """Клетка под курсором/Board cell under a window pixel"""
+        return pixel[0] // self.tile[0] - 1, pixel[1] // self.tile[1] - 1
 
     def place_robot_at_position(self, cell_x, cell_y):
         """Размещение робота: Размещение робота на доске"""
-        if 0 <= cell_x < self.board.size and 0 <= cell_y < self.board.size:
-            current_player = self.players[self.game_manager.current_player]  # Используем current_player из GameManager
-            if current_player.place_robot((cell_x, cell_y), self.board,
-                                          self.current_robot_counts[self.game_manager.current_player]):
-                logging.info(
-                    f"Player {self.game_manager.current_player + 1} placed robot at ({index_to_letter(cell_x)}, {cell_y + 1}).")
-                self.current_robot_counts[self.game_manager.current_player] += 1
-                self.robots_placed += 1
-                if self.robots_placed >= self.total_robots_to_place:
-                    logging.info("Placing phase ended. All players have placed their robots.")
-                    self.game_manager.current_player = 0
-                    self.current_robot_index = 0
-                    self.game_manager.placing_phase = False
-                    self.update_package_visibility(self.game_manager.placing_phase)
-                    return True
-                self.game_manager.current_player = (self.game_manager.current_player + 1) % len(self.players)
-                self.current_robot_index = 0
-                time.sleep(0.2)  # Задержка в одну секунду
+        placed = self.game_state.robots_placed
+        done = self.game_state.place_robot(cell_x, cell_y)
+        if done:
+            self.current_robot_index = 0
+            return True
+        if self.game_state.robots_placed > placed:
+            self.current_robot_index = 0
+            self.animations.pause(PLACEMENT_PAUSE_MS)
         return False
 
-    def execute_put_bot(self, player_index, pos):
-        """Установка бота для второго режима"""
-        row = int(pos[1]) - 1
-        col = ord(pos[0].lower()) - ord('a')
-        if self.players[player_index].place_robot((col, row), self.board, len(self.players[player_index].robots)):
-            logging.info(f"Player {player_index + 1} placed robot at ({pos}).")
-            self.screen_animator()
-            pygame.time.delay(50)
-
-    def start_turn(self, player_index, move_steps):
-        """Начало хода для второго игрока"""
-        move_steps = move_steps.split('-')
-        start_pos = parse_position(move_steps[0])
-
-        robot = None
-        for r in self.players[player_index].robots:
-            if r.pos == start_pos:
-                robot = r
-                break
-
-        if not robot:
-            logging.warning(f"No robot found at start position: {start_pos}")
-            return
-
-        for step in range(1, len(move_steps)):
-            step_pos = parse_position(move_steps[step])
-            direction = None
-            if robot.pos[0] < step_pos[0]:
-                direction = "right"
-            elif robot.pos[0] > step_pos[0]:
-                direction = "left"
-            elif robot.pos[1] < step_pos[1]:
-                direction = "down"
-            elif robot.pos[1] > step_pos[1]:
-                direction = "up"
-
-            if direction and robot.move(direction, self.board):
-                self.screen_animator()
-                pygame.display.flip()
-                pygame.time.delay(30)
-
-            if self.players[player_index].remaining_moves <= 0:
-                self.switch_to_next_player()
-                break
-
     def pressed_key(self, event):
         """Нажатие клавиши, обработка чисто нажатий клавиш"""
+        current_player = self.players[self.game_state.current_player]
         if event.key == pygame.K_TAB:
             self.switch_to_next_player()
         elif event.key in [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4]:
             robot_num = event.key - pygame.K_1
-            if robot_num < len(self.players[self.game_manager.current_player].robots):
+            if robot_num < len(current_player.robots):
                 self.current_robot_index = robot_num
         elif event.key == pygame.K_UP:
-            self.players[self.game_manager.current_player].move_robot(self.current_robot_index, 'up', self.board)
+            current_player.move_robot(self.current_robot_index, 'up', self.board)
         elif event.key == pygame.K_DOWN:
-            self.players[self.game_manager.current_player].move_robot(self.current_robot_index, 'down', self.board)
+            current_player.move_robot(self.current_robot_index, 'down', self.board)
         elif event.key == pygame.K_LEFT:
-            self.players[self.game_manager.current_player].move_robot(self.current_robot_index, 'left', self.board)
+            current_player.move_robot(self.current_robot_index, 'left', self.board)
         elif event.key == pygame.K_RIGHT:
-            self.players[self.game_manager.current_player].move_robot(self.current_robot_index, 'right', self.board)
-        if self.players[self.game_manager.current_player].remaining_moves <= 0:
+            current_player.move_robot(self.current_robot_index, 'right', self.board)
+        if self.players[self.game_state.current_player].remaining_moves <= 0:
             self.switch_to_next_player()
 
     def switch_to_next_player(self):
         """Смена игрока: Переход хода к следующему игроку"""
-        self.players[self.game_manager.current_player].reset_moves()
-        self.game_manager.current_player = (self.game_manager.current_player + 1) % len(self.players)
-        logging.info(f"Switched to player {self.game_manager.current_player + 1}.")
+        self.game_state.switch_to_next_player()
 
-    def screen_animator(self):
-        """Анимация экрана"""
-        self.game_manager.screen.fill((255, 255, 255))
-        self.board.display_cells(self.game_manager.screen)
+    def robot_rect(self, robot):
+        if robot not in self.robot_rects:
+            self.robot_rects[robot] = pygame.Rect(
+                (robot.pos[0] + 1) * self.tile[0], (robot.pos[1] + 1) * self.tile[1],
+                self.tile[0], self.tile[1]
+            )
+        return self.robot_rects[robot]
+
+    def animate_move(self, robot, new_pos, steps):
+        """Анимация движения: ход уже сделан, робот плавно догоняет его на экране/The move is already resolved,
+        the sprite catches up asynchronously"""
+        self.animations.push(
+            self.robot_rect(robot),
+            ((new_pos[0] + 1) * self.tile[0], (new_pos[1] + 1) * self.tile[1]),
+            steps
+        )
+
+    def update(self, dt):
+        """Продвинуть анимации на dt миллисекунд/Advances animations by ``dt`` milliseconds"""
+        self.animations.update(dt)
+
+    def build_static_layer(self):
+        """Статичный слой: клетки, сетка, цифры пунктов приёма и подписи координат рисуются один раз/Static board
+        layer, pre-rendered once"""
+        layer = pygame.Surface(self.screen.get_size())
+        layer.fill((255, 255, 255))
+        for row in self.board.cells:
+            for cell in row:
+                self.draw_cell(layer, cell)
+
+        if self.tile[0] >= MIN_LABEL_TILE_SIZE:
+            self.draw_labels(layer)
+        self.static_layer = layer.convert() if pygame.display.get_surface() else layer
 
-        font = pygame.font.SysFont(None, 24)
+    def draw_labels(self, layer):
+        """Подписи столбцов и строк вокруг доски/Column letters and row numbers around the board"""
         for col in range(self.board.size):
             letter = index_to_letter(col)
-            letter_img = font.render(letter, True, (0, 0, 0))
-            top_pos = ((col + 1) * DEFAULT_IMAGE_SIZE[0] + (DEFAULT_IMAGE_SIZE[0] - letter_img.get_width()) / 2, 0)
-            bottom_pos = ((col + 1) * DEFAULT_IMAGE_SIZE[0] + (DEFAULT_IMAGE_SIZE[0] - letter_img.get_width()) / 2,
-                          (self.board.size + 1) * DEFAULT_IMAGE_SIZE[1])
-            self.game_manager.screen.blit(letter_img, top_pos)
-            self.game_manager.screen.blit(letter_img, bottom_pos)
-
-        for row in range(self.board.size):
+            letter_img = self.assets.glyph(letter, self.text_size(24))
+            top_pos = ((col + 1) * self.tile[0] + (self.tile[0] - letter_img.get_width()) / 2, 0)
+            bottom_pos = ((col + 1) * self.tile[0] + (self.tile[0] - letter_img.get_width()) / 2,
+                          (self.board.height + 1) * self.tile[1])
+            layer.blit(letter_img, top_pos)
+            layer.blit(letter_img, bottom_pos)
+
+        for row in range(self.board.height):
             number = str(row + 1)
-            number_img = font.render(number, True, (0, 0, 0))
+            number_img = self.assets.glyph(number, self.text_size(24))
             left_pos = (
-                0, ((row + 1) * DEFAULT_IMAGE_SIZE[1] + (DEFAULT_IMAGE_SIZE[1] - number_img.get_height()) / 2))
-            right_pos = ((self.board.size + 1) * DEFAULT_IMAGE_SIZE[0], (
-                    (row + 1) * DEFAULT_IMAGE_SIZE[1] + (DEFAULT_IMAGE_SIZE[1] - number_img.get_height()) / 2))
-            self.game_manager.screen.blit(number_img, left_pos)
-            self.game_manager.screen.blit(number_img, right_pos)
+                0, ((row + 1) * self.tile[1] + (self.tile[1] - number_img.get_height()) / 2))
+            right_pos = ((self.board.size + 1) * self.tile[0], (
+                    (row + 1) * self.tile[1] + (self.tile[1] - number_img.get_height()) / 2))
+            layer.blit(number_img, left_pos)
+            layer.blit(number_img, right_pos)
+
+    def draw_cell(self, surface, cell):
+        pygame.draw.rect(
+            surface,
+            cell.colors[cell.color],
+            (
+                (cell.x + 1) * self.tile[0],
+                (cell.y + 1) * self.tile[1],
+                self.tile[0],
+                self.tile[1]
+            )
+        )
+
+        pygame.draw.rect(
+            surface,
+            (0, 0, 0),
+            (
+                (cell.x + 1) * self.tile[0],
+                (cell.y + 1) * self.tile[1],
+                self.tile[0],
+                self.tile[1]
+            ),
+            1
+        )
+
+        if cell.target and self.tile[0] >= MIN_LABEL_TILE_SIZE:
+            img = self.assets.glyph(str(cell.target), self.text_size(64))
+            surface.blit(
+                img,
+                (
+                    (cell.x + 1) * self.tile[0] + (self.tile[0] - img.get_width()) / 2,
+                    (cell.y + 1) * self.tile[1] + (self.tile[1] - img.get_height()) / 2
+                )
+            )
+
+    def package_rect(self, pos):
+        width, height = self.tile[0] * 2, self.tile[1] * 2
+        return pygame.Rect(
+            (pos[0] + 1) * self.tile[0] + (self.tile[0] - width) // 2,
+            (pos[1] + 2) * self.tile[1] - height // 2,
+            width, height
+        )
+
+    def carried_package_rect(self, rect):
+        size = int(self.tile[0] * 1.27), int(self.tile[1] * 1.27)
+        return pygame.Rect(
+            rect.x + rect.width // 2 - size[0] // 2,
+            rect.y - rect.height // 2 + int(self.tile[0] * 0.4),
+            size[0], size[1]
+        )
+
+    def draw_package(self, package, x: int, y: int):
+        image = self.assets.image('package', (self.tile[0] * 2, self.tile[1] * 2))
+        pos = self.package_rect((x, y)).topleft
+        self.screen.blit(image, pos)
+
+        number_img = self.assets.glyph(str(package.number), self.text_size(48))
+        number_pos = (
+            pos[0] + image.get_width() / 2 - number_img.get_width() / 2,
+            pos[1] + image.get_height() / 2 - number_img.get_height() / 2 - 40 * self.scale
+        )
+        self.screen.blit(number_img, number_pos)
+
+    def draw_robot(self, robot):
+        """Анимирует робота"""
+        rect = self.robot_rect(robot)
+        self.screen.blit(self.assets.image(robot.color, self.tile), rect)
+        number_img = self.assets.glyph(str(robot.index), self.text_size(32))
+        number_pos = (
+            rect.x + rect.width // 2 - number_img.get_width() // 2,
+            rect.y + rect.height // 2 - number_img.get_height() // 2
+        )
+        self.screen.blit(number_img, number_pos)
+        if robot.package:
+            package_rect = self.carried_package_rect(rect)
+            package_image = self.assets.image('package', package_rect.size)
+            self.screen.blit(package_image, package_rect)
+            number_img = self.assets.glyph(str(robot.package.number), self.text_size(48))
+            number_pos = (
+                package_rect.x + package_image.get_width() // 2 - number_img.get_width() // 2,
+                package_rect.y + package_image.get_height() // 2 - number_img.get_height() * 1.4
+            )
+            self.screen.blit(number_img, number_pos)
+
+    def score_position(self, player):
+        return (self.board.size + 2) * self.tile[0] + SCORE_PANEL_WIDTH // 16, 10 + player.idx * 40
+
+    def draw_score(self, player, position):
+        """Отображение счета: Рисует счет игрока на экране"""
+        score_text = f"{player.color.capitalize()} ({player.idx + 1}) Player: {player.score} points"
+        img = self.assets.glyph(score_text, 36)
+        self.screen.blit(img, position)
+
+    def collect_sprites(self):
+        """Подвижные объекты кадра в порядке отрисовки/Dynamic sprites of the frame in drawing order.
+
+        Every sprite is ``(key, signature, rect, draw)``; a sprite is redrawn only when its signature changes.
+        """
+        sprites = []
+        for pos, package in self.board.packages.items():
+            if package.visible:
+                sprites.append((('package', pos), package.number, self.package_rect(pos),
+                                lambda package=package, pos=pos: self.draw_package(package, pos[0], pos[1])))
         for player in self.players:
-            player.draw_robots(self.game_manager.screen)
-        score_y_offset = DEFAULT_IMAGE_SIZE[0] // 8
-        for i, player in enumerate(self.players):
-            position = (self.board.size * DEFAULT_IMAGE_SIZE[0] * 1.25, score_y_offset + i * 40)
-            player.draw_score(self.game_manager.screen, position)
-        pygame.display.update()
+            for robot in player.robots:
+                rect = self.robot_rect(robot)
+                number = robot.package.number if robot.package else None
+                area = rect.union(self.carried_package_rect(rect)) if robot.package else rect.copy()
+                sprites.append((robot, (rect.topleft, number), area, lambda robot=robot: self.draw_robot(robot)))
+        screen_width = self.screen.get_width()
+        for player in self.players:
+            position = self.score_position(player)
+            area = pygame.Rect(int(position[0]), int(position[1]), screen_width - int(position[0]), 36)
+            sprites.append((('score', player.idx), player.score, area,
+                            lambda player=player, position=position: self.draw_score(player, position)))
+        return sprites
 
-    def ENDGAME(self):
-        logging.info("Player has ended the game")
+    def screen_animator(self):
+        """Анимация экрана: статичный слой кэширован, перерисовываются только изменившиеся области/Only dirty
+        rectangles over the cached static layer are redrawn and pushed to the display"""
+        metrics = self.game_state.metrics
+        if not metrics:
+            self.draw_frame()
+            return
+        start = perf_counter_ns()
+        full_redraw = self.full_redraw or self.static_layer is None
+        dirty = self.draw_frame()
+        metrics.observe("render", None, start)
+        metrics.count("frames_drawn")
+        metrics.count("full_redraws", value=full_redraw)
+        metrics.count("dirty_rects", value=dirty)
+
+    def draw_frame(self):
+        """Один кадр, возвращает число грязных областей/Draws one frame, returns the number of dirty rectangles"""
+        if self.static_layer is None:
+            self.build_static_layer()
+        sprites = self.collect_sprites()
+        previous = self.drawn_sprites
 
-    def index_to_letter(index):
-        return chr(ord('A') + index)
+        if self.full_redraw:
+            self.screen.blit(self.static_layer, (0, 0))
+            for _, _, _, draw in sprites:
+                draw()
+            self.drawn_sprites = {key: (signature, rect) for key, signature, rect, _ in sprites}
+            self.full_redraw = False
+            pygame.display.update()
+            return 0
+
+        dirty = []
+        marked = set()
+        current_keys = set()
+        for key, signature, rect, _ in sprites:
+            current_keys.add(key)
+            old = previous.get(key)
+            if old is None or old[0] != signature or old[1] != rect:
+                marked.add(key)
+                dirty.append(rect)
+                if old is not None:
+                    dirty.append(old[1])
+        for key, (_, rect) in previous.items():
+            if key not in current_keys:
+                dirty.append(rect)
+        if not dirty:
+            return 0
+
+        changed = True
+        while changed:
+            changed = False
+            for key, _, rect, _ in sprites:
+                if key not in marked and rect.collidelist(dirty) != -1:
+                    marked.add(key)
+                    dirty.append(rect)
+                    changed = True
+
+        for rect in dirty:
+            self.screen.blit(self.static_layer, rect, rect)
+        for key, _, _, draw in sprites:
+            if key in marked:
+                draw()
+        self.drawn_sprites = {key: (signature, rect) for key, signature, rect, _ in sprites}
+        pygame.display.update(dirty)
+        return len(dirty)
+
+    def ENDGAME(self):
+        self.game_state.events.emit(GAME_ENDED, self.game_state.turn_counter)
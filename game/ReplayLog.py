@@ -0,0 +1,264 @@
+import argparse
+import logging
+import time
+
+from game.Events import DROPPED, MOVED, PICKED, PLACED, RELEASED, TURN_SWITCHED, WON
+from game.config import GameConfig
+
+MAGIC = b"ABR\x01"
+DIRECTIONS = ("up", "down", "left", "right")
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# Виды событий, младшие 3 бита первого varint/Event kinds, the low 3 bits of the first varint of an event
+PLACE, MOVE, PICK, DROP, TURN, FINISH, RELEASE = range(7)
+
+
+def write_varint(buffer, value):
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class ReplayWriter:
+    """Двоичный журнал партии/Compact binary log of one game.
+
+    The header holds the seed, the rules and the map files; with them the board and every package number can be
+    rebuilt, so the log only stores decisions and their results. Every event is one varint with the kind in the low
+    3 bits, a move usually fits into a single byte. Events collect in a bytearray and go to a buffered file.
+    The writer subscribes itself to the game's event bus.
+    """
+
+    def __init__(self, path, state, buffer_size=1 << 16):
+        self.file = open(path, 'wb', buffering=buffer_size)
+        self.buffer_size = buffer_size
+        self.num_players = len(state.players)
+        config = state.config
+        buffer = bytearray(MAGIC)
+        for value in (zigzag(state.seed), self.num_players, config.robots_per_player, config.move_limit_per_turn,
+                      config.win_score):
+            write_varint(buffer, value)
+        for name in (state.colors_map, state.targets_map):
+            encoded = name.encode()
+            write_varint(buffer, len(encoded))
+            buffer += encoded
+        self.buffer = buffer
+        self.board_size = state.board.size
+        self.events = state.events
+        self.encoders = {
+            PLACED: lambda player, robot, x, y: self.event(player << 3 | PLACE, y * self.board_size + x),
+            MOVED: lambda player, robot, direction, x, y: self.event(
+                (self.robot_key(player, robot) << 2 | DIRECTION_CODES[direction]) << 3 | MOVE),
+            PICKED: lambda player, robot, number, x, y: self.event(self.robot_key(player, robot) << 3 | PICK, number),
+            DROPPED: lambda player, robot, number, x, y: self.event(self.robot_key(player, robot) << 3 | DROP, number),
+            RELEASED: lambda player, robot: self.event(self.robot_key(player, robot) << 3 | RELEASE),
+            TURN_SWITCHED: lambda player: self.event(TURN),
+            WON: lambda player: self.event(player << 3 | FINISH),
+        }
+        self.events.subscribe(self)
+
+    def __call__(self, event):
+        encoder = self.encoders.get(event.kind)
+        if encoder:
+            encoder(*event.fields)
+
+    def robot_key(self, player, robot):
+        return (robot - 1) * self.num_players + player
+
+    def event(self, head, value=None):
+        buffer = self.buffer
+        write_varint(buffer, head)
+        if value is not None:
+            write_varint(buffer, value)
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer = bytearray()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.events.unsubscribe(self)
+        self.flush()
+        self.file.close()
+
+
+def read_replay(path):
+    """Заголовок и события журнала/Returns the header dict and the list of decoded events"""
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a replay log")
+    offset = len(MAGIC)
+    values = []
+    for _ in range(5):
+        value, offset = read_varint(data, offset)
+        values.append(value)
+    names = []
+    for _ in range(2):
+        length, offset = read_varint(data, offset)
+        names.append(data[offset:offset + length].decode())
+        offset += length
+    header = {
+        "seed": unzigzag(values[0]), "num_players": values[1], "robots_per_player": values[2],
+        "move_limit_per_turn": values[3], "win_score": values[4], "colors_map": names[0], "targets_map": names[1],
+    }
+
+    num_players = header["num_players"]
+    events = []
+    end = len(data)
+    while offset < end:
+        head, offset = read_varint(data, offset)
+        kind, arg = head & 7, head >> 3
+        if kind == PLACE:
+            cell, offset = read_varint(data, offset)
+            events.append((PLACE, arg, cell))
+        elif kind == MOVE:
+            key = arg >> 2
+            events.append((MOVE, key % num_players, key // num_players + 1, DIRECTIONS[arg & 3]))
+        elif kind == PICK or kind == DROP:
+            number, offset = read_varint(data, offset)
+            events.append((kind, arg % num_players, arg // num_players + 1, number))
+        elif kind == TURN:
+            events.append((TURN,))
+        elif kind == FINISH:
+            events.append((FINISH, arg))
+        elif kind == RELEASE:
+            events.append((RELEASE, arg % num_players, arg // num_players + 1))
+        else:
+            raise ValueError(f"Unknown replay event {kind} at byte {offset}")
+    return header, events
+
+
+def replay_state(header):
+    """Пустая партия по заголовку журнала/Fresh game with the seed, rules and map of the log, no autoplay"""
+    from game.GameState import GameState
+
+    config = GameConfig()
+    config.game_mode = 1
+    config.run_count = 1
+    config.players_info = [header["num_players"]] + [0] * header["num_players"]
+    config.win_score = header["win_score"]
+    config.robots_per_player = header["robots_per_player"]
+    config.move_limit_per_turn = header["move_limit_per_turn"]
+    config.charging_accounting = 0
+    config.seed = header["seed"]
+    return GameState(config, header["colors_map"], header["targets_map"], seed=header["seed"])
+
+
+class ReplayMismatch(ValueError):
+    pass
+
+
+def apply_event(state, event):
+    """Повторить одно событие/Re-applies one logged event, raises ReplayMismatch if the game diverges"""
+    kind = event[0]
+    if kind == PLACE:
+        player = state.players[event[1]]
+        pos = (event[2] % state.board.size, event[2] // state.board.size)
+        if not player.place_robot(pos, state.board, len(player.robots)):
+            raise ReplayMismatch(f"Player {event[1] + 1} could not place a robot at {pos}")
+        state.robots_placed += 1
+    elif kind == MOVE:
+        state.end_placing_phase()
+        robot = state.players[event[1]].robots[event[2] - 1]
+        if not robot.move(event[3], state.board):
+            raise ReplayMismatch(f"Robot {event[2]} of player {event[1] + 1} could not move {event[3]}")
+    elif kind == PICK:
+        robot = state.players[event[1]].robots[event[2] - 1]
+        if not robot.package or robot.package.number != event[3]:
+            raise ReplayMismatch(f"Robot {event[2]} of player {event[1] + 1} did not pick package {event[3]}")
+    elif kind == DROP:
+        player = state.players[event[1]]
+        if player.robots[event[2] - 1].package is not None:
+            raise ReplayMismatch(f"Robot {event[2]} of player {event[1] + 1} did not drop package {event[3]}")
+    elif kind == RELEASE:
+        state.players[event[1]].robots[event[2] - 1].has_package = False
+    elif kind == TURN:
+        state.switch_to_next_player()
+    elif kind == FINISH:
+        if state.winner_index != event[1]:
+            raise ReplayMismatch(f"Player {event[1] + 1} should have won")
+
+
+def replay(path):
+    """Повтор журнала без графики на полной скорости/Replays a log headless at full speed"""
+    header, events = read_replay(path)
+    state = replay_state(header)
+    for event in events:
+        apply_event(state, event)
+    return state
+
+
+def render_replay(path, speed=1.0):
+    """Повтор журнала с отрисовкой/Replays a log in a window, one event after the previous animation"""
+    import pygame
+    from game.PlayerSimulator import PlayerSimulator, PLACEMENT_PAUSE_MS, window_size
+
+    header, events = read_replay(path)
+    state = replay_state(header)
+    pygame.init()
+    screen = pygame.display.set_mode(window_size(state.board))
+    pygame.display.set_caption(f'Replay {path}')
+    simulator = PlayerSimulator(state, screen, animation_speed=speed)
+    clock = pygame.time.Clock()
+    position = 0
+    running = True
+    while running:
+        dt = clock.tick(60)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        if simulator.animations.idle() and position < len(events):
+            apply_event(state, events[position])
+            if events[position][0] == PLACE:
+                simulator.animations.pause(PLACEMENT_PAUSE_MS)
+            position += 1
+        simulator.update(dt)
+        simulator.screen_animator()
+    pygame.quit()
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a binary game log")
+    parser.add_argument("log")
+    parser.add_argument("--render", action="store_true", help="show the game in a window")
+    parser.add_argument("--speed", type=float, default=1.0, help="animation speed when rendering")
+    args = parser.parse_args(argv)
+    if args.render:
+        state = render_replay(args.log, args.speed)
+    else:
+        logging.disable(logging.WARNING)
+        started = time.perf_counter()
+        state = replay(args.log)
+        elapsed = time.perf_counter() - started
+        logging.disable(logging.NOTSET)
+        print(f"replayed {state.turn_counter} actions in {elapsed * 1000:.2f} ms")
+    for player in state.players:
+        print(f"Player {player.idx + 1} ({player.color}): {player.score} points")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,41 @@
-import logging
-import random
-import pygame
-from game.Package import Package
-from game.consts import DEFAULT_IMAGE_SIZE
+from time import perf_counter_ns
+
+from game.Cell import Cell
+from game.Events import DROPPED, MOVE_BLOCKED, MOVED, PICKED
 
 
 class Robot:
-    image_paths = {
-        'blue': 'images/blue_robot.png',
-        'red': 'images/red_robot.png',
-        'green': 'images/green_robot.png',
-        'orange': 'images/orange_robot.png'
-    }
+    __slots__ = ('color', 'pos', 'has_package', 'package', 'index', 'player')
 
-    def __init__(self, color, pos, index, player, width=DEFAULT_IMAGE_SIZE[0], height=DEFAULT_IMAGE_SIZE[1]):
-        self.number_img = None
+    def __init__(self, color, pos, index, player):
         self.color = color
         self.pos = pos
         self.has_package = False
         self.package = None
         self.index = index
-        self.set_number_image()
-        image = pygame.image.load(Robot.image_paths[color])
-        self.image = pygame.transform.scale(image, (width, height))
-        self.rect = self.image.get_rect(topleft=((pos[0] + 1) * width, (pos[1] + 1) * height))
         self.player = player
 
     def move(self, direction, board, animation_steps=10):
-        """Движение роботов/ Move robot"""
+        """Движение роботов/ Move robot. Runs under ``state.lock``, so a frame is never drawn halfway through a move
+        of a turn played on a TurnWorker"""
+        game_state = self.player.game_state
+        metrics = game_state.metrics
+        with game_state.lock:
+            if metrics:
+                start = perf_counter_ns()
+                moved = self._move(direction, board, animation_steps)
+                metrics.observe("move", self.player.idx, start)
+                metrics.count("moves" if moved else "blocked_moves", self.player.idx)
+                return moved
+            return self._move(direction, board, animation_steps)
+
+    def _move(self, direction, board, animation_steps):
+        """Проверка правил и сам ход/Rule checks and the move itself"""
         x, y = self.pos
         new_x, new_y = x, y
         if direction == "up" and y > 0:
             new_y = y - 1
-        elif direction == "down" and y < board.size - 1:
+        elif direction == "down" and y < board.height - 1:
             new_y = y + 1
         elif direction == "left" and x > 0:
             new_x = x - 1
@@ -40,104 +43,61 @@ class Robot:
             new_x = x + 1
         else:
             return False
-        if 0 <= new_x < board.size and 0 <= new_y < board.size:
-            if not board.is_occupied(new_x, new_y):
-                target_cell = board[new_y][new_x]
-                if target_cell.color == 'r':
-                    logging.info(
-                        f"Robot {self.index} of Player {self.player.idx + 1} tried to move to a red cell at ({chr(ord('A') + new_x)}, {new_y + 1}). Move cancelled.")
+        if 0 <= new_x < board.size and 0 <= new_y < board.height:
+            index = new_y * board.size + new_x
+            if not board.occupancy[index]:
+                color, target = board.colors[index], board.targets[index]
+                game_state = self.player.game_state
+                if color == 'r':
+                    game_state.events.emit(MOVE_BLOCKED, game_state.turn_counter, self.player.idx, self.index,
+                                           new_x, new_y, "red")
                     return False
-                if target_cell.target > 0 and (not self.package or self.package.number != target_cell.target):
-                    logging.info(
-                        f"Robot {self.index} of Player {self.player.idx + 1} tried to move to a target cell with "
-                        f"incompatible package at ({chr(ord('A') + new_x)}, {new_y + 1}). Move cancelled.")
+                if target > 0 and (not self.package or self.package.number != target):
+                    game_state.events.emit(MOVE_BLOCKED, game_state.turn_counter, self.player.idx, self.index,
+                                           new_x, new_y, "target")
                     return False
-                self.player.game_manager.turn_counter += 1
-                logging.info(
-                    f"[Turn {self.player.game_manager.turn_counter}] Player {self.player.idx + 1} moved robot {self.index} {direction} to ({chr(ord('A') + new_x)}, {new_y + 1}).")
-                old_rect = self.rect.copy()
-                self.animate_move(old_rect, new_x, new_y, animation_steps, board)
-                board.update_position(self.pos, (new_x, new_y))
+                game_state.turn_counter += 1
+                if game_state.renderer:
+                    game_state.renderer.animate_move(self, (new_x, new_y), animation_steps)
+                board.update_position(self.pos, (new_x, new_y), self.player.idx + 1)
                 self.pos = (new_x, new_y)
-                self.rect.topleft = ((new_x + 1) * DEFAULT_IMAGE_SIZE[0], (new_y + 1) * DEFAULT_IMAGE_SIZE[1])
+                game_state.events.emit(MOVED, game_state.turn_counter, self.player.idx, self.index, direction,
+                                       new_x, new_y)
 
                 # Execute additional actions after movement
-                if target_cell.target and self.package and target_cell.target == self.package.number:
-                    self.drop_package(target_cell)
+                if target and self.package and target == self.package.number:
+                    self.drop_package(Cell(board, index), board)
                 if not self.has_package:
-                    if target_cell.color == 'a':
-                        below_cell = board[new_y + 1][new_x]
-                        if below_cell.color == 'r' and below_cell.package and not below_cell.package.picked_up:
-                            self.pick_package(below_cell.package, board)
+                    if color == 'a':
+                        below = index + board.size
+                        if board.colors[below] == 'r' and board.package_numbers[below]:
+                            package = board.packages[(new_x, new_y + 1)]
+                            if not package.picked_up:
+                                self.pick_package(package, board)
                 if self.package:
                     self.package.set_position(self.pos)
                 return True
         return False
 
-    def animate_move(self, old_rect, new_x, new_y, steps, board):
-        """Анимация движения: Анимация движения робота, чтобы робот двигался плавно/ Function so that the robot moves
-        smoothly"""
-        step_x = ((new_x + 1) * DEFAULT_IMAGE_SIZE[0] - old_rect.x) / steps
-        step_y = ((new_y + 1) * DEFAULT_IMAGE_SIZE[1] - old_rect.y) / steps
-        for i in range(steps):
-            self.rect.x = old_rect.x + step_x * (i + 1)
-            self.rect.y = old_rect.y + step_y * (i + 1)
-            self.player.game_manager.simulator.screen_animator()
-            pygame.display.flip()
-            pygame.time.delay(5)
-
     def pick_package(self, package, board):
         """Робот поднял посылку с зеленой клетки/ Robot picks the package up"""
         self.has_package = True
-        self.package = package
-        package.pick_up()
-        self.player.game_manager.turn_counter += 1
-        logging.info(
-            f"[Turn {self.player.game_manager.turn_counter}] Robot {self.index} of Player {self.player.idx + 1}"
-            f" picked up package with number {package.number} at position ({chr(ord('A') + (self.pos[0]))}, {self.pos[1] + 1}).")
-        new_package = Package(package.pos)
-        new_package.number = random.randint(1, 9)
-        board[package.pos[1]][package.pos[0]].package = new_package
+        self.package = board.pick_package(package.pos)
+        game_state = self.player.game_state
+        game_state.turn_counter += 1
+        game_state.events.emit(PICKED, game_state.turn_counter, self.player.idx, self.index, self.package.number,
+                               self.pos[0], self.pos[1])
 
-    def drop_package(self, cell):
+    def drop_package(self, cell, board):
         """Робот сдал посылку с соответствующим номером в пункт приема отмеченной цифрой/ Drops package"""
         if not self.has_package:
             return False
-        logging.info(
-            f"Robot {self.index} of Player {self.player.idx + 1} dropped package with number {self.package.number} at position ({chr(ord('A') + (self.pos[0]))}, {self.pos[1] + 1}).")
-        self.player.increase_score(self.package.number, self.player.game_manager)
+        game_state = self.player.game_state
+        game_state.events.emit(DROPPED, game_state.turn_counter, self.player.idx, self.index, self.package.number,
+                               self.pos[0], self.pos[1])
+        self.player.increase_score(self.package.number, self.player.game_state)
         self.package.drop_off()
         self.package = None
         self.has_package = False
-        cell.package = None
+        board.drop_package(cell)
         return True
-
-    def robot_animator(self, screen):
-        """Анимирует робота"""
-        screen.blit(self.image, self.rect)
-        if self.number_img:
-            number_pos = (
-                self.rect.x + self.rect.width // 2 - self.number_img.get_width() // 2,
-                self.rect.y + self.rect.height // 2 - self.number_img.get_height() // 2
-            )
-            screen.blit(self.number_img, number_pos)
-        if self.package:
-            package_image = pygame.image.load('images/package.png')
-            package_image = pygame.transform.scale(package_image,
-                                                   (DEFAULT_IMAGE_SIZE[0] * 1.27, DEFAULT_IMAGE_SIZE[1] * 1.27))
-            package_pos = (
-                self.rect.x + self.rect.width // 2 - package_image.get_width() // 2,
-                self.rect.y - self.rect.height // 2 + DEFAULT_IMAGE_SIZE[0] * 0.4
-            )
-            screen.blit(package_image, package_pos)
-            package_number_font = pygame.font.SysFont(None, 48)
-            number_img = package_number_font.render(str(self.package.number), True, (0, 0, 0))
-            number_pos = (
-                package_pos[0] + package_image.get_width() // 2 - number_img.get_width() // 2,
-                package_pos[1] + package_image.get_height() // 2 - number_img.get_height() * 1.4
-            )
-            screen.blit(number_img, number_pos)
-
-    def set_number_image(self):
-        robot_number_font = pygame.font.SysFont(None, 32)
-        self.number_img = robot_number_font.render(str(self.index), True, (0, 0, 0))
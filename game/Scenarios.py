@@ -0,0 +1,60 @@
+"""Заготовки тестов и бенчмарков/Scenarios shared by tests and benchmarks: generated warehouse maps and Robot.move
+on a given position"""
+import contextlib
+import copy
+import os
+import tempfile
+
+from game.GameState import GameState
+from game.MapGenerator import generate_map, write_map
+from game.Package import Package
+from game.Robot import Robot
+
+WAREHOUSE_ROBOTS = 8  # роботов на игрока на складах/robots per player on warehouse maps
+
+
+def write_warehouse(directory, width, height):
+    """Склад со стеллажами и 16 классами/Warehouse map with racks of 4-slot shelves and 16 target classes"""
+    return write_map(*generate_map(width, height, targets=16, shelf=4),
+                     os.path.join(directory, f"warehouse_{width}x{height}.csv"),
+                     os.path.join(directory, f"warehouse_targets_{width}x{height}.csv"))
+
+
+def crowded(config, robots=WAREHOUSE_ROBOTS):
+    config = copy.copy(config)
+    config.robots_per_player = robots
+    return config
+
+
+@contextlib.contextmanager
+def scenario_maps(config, warehouses, with_map_csv=True):
+    """Карты для проверок/``{name: (config, colors_map, targets_map)}``: map.csv with ``config`` and a temporary
+    warehouse per ``(width, height)`` with WAREHOUSE_ROBOTS robots per player, removed on exit"""
+    maps = {"map.csv": (config, "csv_files/map.csv", "csv_files/targets.csv")} if with_map_csv else {}
+    with tempfile.TemporaryDirectory() as directory:
+        for width, height in warehouses:
+            maps[f"warehouse_{width}x{height}"] = (crowded(config), *write_warehouse(directory, width, height))
+        yield maps
+
+
+def robot_move_allows(config, colors_map, targets_map, cells, carry, robots, slot, direction):
+    """Ход через настоящий Robot.move/Runs Robot.move on a fresh GameState with the given position.
+
+    ``cells`` and ``carry`` hold the cell index and carried package number of every robot by slot
+    ``player * robots + robot``; ``direction`` is a name from PathTables.DIRECTIONS.
+    """
+    state = GameState(config, colors_map, targets_map, seed=0)
+    board = state.board
+    for player in state.players:
+        for r in range(robots):
+            slot_of_robot = player.idx * robots + r
+            pos = (cells[slot_of_robot] % board.size, cells[slot_of_robot] // board.size)
+            board.update_position(None, pos, player.idx + 1)
+            robot = Robot(player.color, pos, r + 1, player)
+            if carry[slot_of_robot]:
+                robot.package = Package(pos)
+                robot.package.number = carry[slot_of_robot]
+                robot.has_package = True
+            player.robots.append(robot)
+    owner, r = divmod(slot, robots)
+    return state.players[owner].robots[r].move(direction, board)
@@ -0,0 +1,237 @@
+import math
+import random
+import weakref
+from time import perf_counter
+
+from game.AutoPlay import AutoPlay
+from game.BitBoard import BitSearchState
+from game.PathTables import DIRECTIONS, PathTables, UNREACHABLE
+from game.SearchState import PASS, SearchState
+
+SEARCH_ITERATIONS = 200  # итераций за ход без бюджета времени/iterations per turn when the budget is 0
+MIN_ITERATIONS = 16  # даже если бюджет кончился/even when the budget has run out
+EXPLORATION = 0.7  # константа UCT/UCT exploration constant
+EXPLORE_ROLLOUT = 0.1  # доля случайных ходов в rollout/share of random moves in rollouts
+# Битовые ходы только там, где они стабильно быстрее/Bitboard moves only where bench_bitboard finds them consistently
+# faster: 1.1-1.7x from 6 robots per player on boards up to 64x64, but 0.6-1.0x with 1-2 robots
+BITBOARD_CELLS = 4096
+BITBOARD_ROBOTS = 6
+
+_fields = weakref.WeakKeyDictionary()  # уходят вместе с таблицами карты/dropped with the map's tables
+_pools = {}
+
+
+def rollout_fields(tables, board):
+    """Поля расстояний для rollout/Distance fields: 0 - to the nearest pickup cell, k - to the nearest target k"""
+    fields = _fields.get(tables)
+    if fields is None:
+        size, colors = board.size, board.colors
+        pickups = [cell for cell in range(len(colors) - size) if colors[cell] == 'a' and colors[cell + size] == 'r']
+        fields = [tables.nearest(pickups)]
+        fields += [tables.target_distances(number) for number in range(1, board.max_target + 1)]
+        fields = _fields[tables] = fields
+    return fields
+
+
+def rollout_move(search, fields, rng):
+    """Жадный ход rollout/Greedy rollout move: the step that brings a robot closest to its goal, sometimes random"""
+    moves = search.legal_moves()
+    if len(moves) == 1 or rng.random() < EXPLORE_ROLLOUT:
+        return rng.choice(moves)
+    base = search.current_player * search.robots
+    best, best_gain = None, None
+    for move in moves:
+        slot = base + move[0]
+        cell = search.pos[slot]
+        field = fields[search.carry[slot]]
+        gain = field[cell] - field[search.step(cell, move[1])] + rng.random()
+        if best_gain is None or gain > best_gain:
+            best, best_gain = move, gain
+    return best
+
+
+def evaluate(search, player, fields):
+    """Оценка позиции для игрока/Value of the position for ``player`` in [-1, 1]: score lead plus half credit for
+    carried packages and a little for robots near a pickup, both growing as the robot gets closer"""
+    if search.winner is not None:
+        return 1.0 if search.winner == player else -1.0
+    scale = search.size + search.height
+    mean_number = (search.max_target + 1) / 2
+    values = []
+    for owner in range(search.num_players):
+        value = search.scores[owner]
+        for slot in range(owner * search.robots, (owner + 1) * search.robots):
+            carry = search.carry[slot]
+            distance = fields[carry][search.pos[slot]]
+            closeness = 0.0 if distance == UNREACHABLE else max(0.0, 1 - distance / scale)
+            value += carry * (0.5 + 0.5 * closeness) if carry else 0.25 * mean_number * closeness
+        values.append(value)
+    lead = values[player] - max(value for owner, value in enumerate(values) if owner != player)
+    return max(-1.0, min(1.0, lead / search.win_score))
+
+
+def search_turn(search, fields, table, deadline=None, iterations=None, seed=0):
+    """MCTS по ходу игрока/Monte Carlo tree search over the turn of the player to move, returns the iterations run.
+
+    Tree nodes are the positions inside the turn, stored in ``table`` by Zobrist hash as ``[visits, total value]``,
+    so move orders that reach the same position share statistics and tables of several searches merge by summing.
+    A leaf is expanded once the turn is over or a new position is reached; a greedy rollout then plays one more
+    round of every player and the value of the final position is backed up along the path.
+    """
+    rng = random.Random(seed)
+    player = search.current_player
+    horizon = search.num_players * search.move_limit
+    done = 0
+    while done < MIN_ITERATIONS or ((iterations is None or done < iterations)
+                                    and (deadline is None or perf_counter() < deadline)):
+        path = [search.hash]
+        records = []
+        expanded = False
+        while not expanded and search.current_player == player and search.winner is None:
+            visits = table.get(search.hash, (1,))[0]
+            best, best_score, fresh = None, None, []
+            for move in search.legal_moves():
+                record = search.apply(move)
+                stats = table.get(search.hash)
+                search.undo(record)
+                if stats is None:
+                    fresh.append(move)
+                elif not fresh:
+                    score = stats[1] / stats[0] + EXPLORATION * math.sqrt(math.log(visits) / stats[0])
+                    if best_score is None or score > best_score:
+                        best, best_score = move, score
+            expanded = bool(fresh)
+            records.append(search.apply(rng.choice(fresh) if fresh else best))
+            path.append(search.hash)
+        for _ in range(horizon):
+            if search.winner is not None:
+                break
+            records.append(search.apply(rollout_move(search, fields, rng)))
+        value = evaluate(search, player, fields)
+        for record in reversed(records):
+            search.undo(record)
+        for node in path:
+            stats = table.get(node)
+            if stats is None:
+                table[node] = [1, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+        done += 1
+    return done
+
+
+def best_sequence(search, table, fields, rng):
+    """Самая посещаемая линия хода/Most visited line of moves through the turn of the player to move, finished with
+    rollout moves where the tree ends"""
+    player = search.current_player
+    sequence, records = [], []
+    while search.current_player == player and search.winner is None:
+        best, best_visits = None, 0
+        for move in search.legal_moves():
+            record = search.apply(move)
+            stats = table.get(search.hash)
+            search.undo(record)
+            if stats and stats[0] > best_visits:
+                best, best_visits = move, stats[0]
+        if best is None:
+            best = rollout_move(search, fields, rng)
+        sequence.append(best)
+        records.append(search.apply(best))
+    for record in reversed(records):
+        search.undo(record)
+    return sequence
+
+
+def search_worker(search, seconds, iterations, seed):
+    """Поиск в процессе пула/Independent search in a pool process, returns its table and iteration count"""
+    fields = rollout_fields(PathTables.for_board(search), search)
+    table = {}
+    deadline = perf_counter() + seconds if seconds is not None else None
+    return table, search_turn(search, fields, table, deadline, iterations, seed)
+
+
+def search_pool(workers):
+    pool = _pools.get(workers)
+    if pool is None:
+        from concurrent.futures import ProcessPoolExecutor  # только с search_workers/only with search_workers
+        pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+
+class SearchPlay(AutoPlay):
+    """Автомат с поиском по дереву/Plans the whole turn of one player with Monte Carlo tree search.
+
+    The turn is searched on a SearchState copy of the game with apply/undo, so nothing touches the real game until
+    the most visited line is played with Robot.move. ``search_budget_ms`` from game.config bounds the planning time
+    of a turn (anytime: the best line so far is played when time is up); 0 runs SEARCH_ITERATIONS iterations instead,
+    which keeps seeded games reproducible. With ``search_workers`` > 0 as many pool processes search the same
+    position with other seeds next to this one and their tables are merged (root parallelisation). A blocked move
+    means the real game differs from the search, e.g. in a respawned number, and the rest of the turn is re-planned.
+    With at least BITBOARD_ROBOTS robots per player on a board of up to BITBOARD_CELLS cells the turn is searched on
+    a BitSearchState, which plays the same moves faster there; otherwise, e.g. on map.csv with 2 robots, on SearchState.
+    """
+
+    def __init__(self, player, board):
+        super().__init__(player, board)
+        config = player.game_state.config
+        self.budget_ms = config.search_budget_ms
+        self.workers = config.search_workers
+        self.iterations = None if self.budget_ms else SEARCH_ITERATIONS
+        self.search_rng = random.Random((player.game_state.seed << 8) + player.idx)
+        self.fields = rollout_fields(board.path_tables, board)
+
+    def plan(self, remaining, deadline):
+        """План оставшихся remaining ходов/Most visited line for the ``remaining`` moves left in the turn"""
+        bitboard = (self.board.size * self.board.height <= BITBOARD_CELLS
+                    and len(self.player.robots) >= BITBOARD_ROBOTS)
+        backend = BitSearchState if bitboard else SearchState
+        search = backend.from_game(self.player.game_state)
+        keys = search.keys
+        search.hash ^= keys[search.remaining_base + search.remaining] ^ keys[search.remaining_base + remaining]
+        search.remaining = remaining
+        table = {}
+        futures = []
+        if self.workers:
+            seconds = max(0.0, deadline - perf_counter()) if deadline is not None else None
+            futures = [search_pool(self.workers).submit(search_worker, search, seconds, self.iterations,
+                                                        self.search_rng.getrandbits(32))
+                       for _ in range(self.workers)]
+        iterations = search_turn(search, self.fields, table, deadline, self.iterations,
+                                 self.search_rng.getrandbits(32))
+        for future in futures:
+            other, done = future.result()
+            iterations += done
+            for node, (visits, total) in other.items():
+                stats = table.get(node)
+                if stats is None:
+                    table[node] = [visits, total]
+                else:
+                    stats[0] += visits
+                    stats[1] += total
+        metrics = self.player.game_state.metrics
+        if metrics:
+            metrics.count("search_iterations", self.player.idx, iterations)
+        return best_sequence(search, table, self.fields, self.search_rng)
+
+    def play(self):
+        """Main game function for search autoplay"""
+        game_state = self.player.game_state
+        robots = {robot.index - 1: robot for robot in self.player.robots}
+        deadline = perf_counter() + self.budget_ms / 1000 if self.budget_ms else None
+        remaining = self.player.move_limit_per_turn
+        available_moves = False
+        while remaining > 0 and not game_state.game_over:
+            played = 0
+            for move in self.plan(remaining, deadline):
+                if move is PASS or game_state.game_over:
+                    break
+                robot, direction = move
+                if not robots[robot].move(DIRECTIONS[direction][0], self.board):
+                    break
+                played += 1
+            if not played:
+                break
+            remaining -= played
+            available_moves = True
+        return available_moves
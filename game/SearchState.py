@@ -0,0 +1,227 @@
+import random
+from array import array
+from itertools import compress
+
+PASS = None  # ход без движения, передаёт ход/the move that ends the turn early
+MASK = (1 << 64) - 1
+
+
+def splitmix64(value):
+    """Перемешивание 64 бит/SplitMix64 finalizer, a cheap stateless 64-bit hash"""
+    value = (value + 0x9E3779B97F4A7C15) & MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+    return value ^ (value >> 31)
+
+
+class SearchState:
+    """Позиция для перебора/Game position with make/unmake moves and an incremental 64-bit Zobrist hash.
+
+    Built once from a GameState with ``from_game`` (an O(board) copy of the flat arrays); the GameState itself is
+    never touched: no events, no Package objects, no turn counter. A move is ``(robot, direction)`` for the player to
+    move, ``robot`` 0-based and ``direction`` an index of PathTables.DIRECTIONS, or PASS. ``apply`` follows the rules
+    of Robot.move and returns an undo record, or None for a blocked move which changes nothing; ``undo`` restores
+    the position exactly. Both are O(1). The turn passes after ``move_limit`` moves, the game ends when a player
+    reaches ``win_score``.
+
+    ``hash`` covers robot cells, carried and shelved package numbers, scores, the player to move and the moves left.
+    The real game draws respawned package numbers from Board.rng, which a search cannot know; here the n-th package
+    spawned on a cell gets ``spawn(cell, n)``, by default a hash of ``seed``, the cell and n, so a line of play always
+    meets the same numbers and undo only counts back.
+    """
+
+    _keys = {}
+
+    def __init__(self, board, num_players, robots, move_limit, win_score, seed=0):
+        self.size = board.size
+        self.height = board.height
+        self.num_cells = board.size * board.height
+        self.colors = board.colors
+        self.targets = board.targets
+        self.max_target = board.max_target
+        self.num_players = num_players
+        self.robots = robots
+        self.move_limit = move_limit
+        self.win_score = win_score
+        self.seed = seed
+        self.occupancy = bytearray(board.occupancy)
+        self.package_numbers = bytearray(board.package_numbers)
+        self.spawns = array('I', [0]) * self.num_cells  # сколько посылок появилось на клетке/spawns per cell
+        self.pos = [0] * (num_players * robots)  # клетка робота robot игрока player - pos[player * robots + robot]
+        self.carry = [0] * (num_players * robots)
+        self.scores = [0] * num_players
+        self.current_player = 0
+        self.remaining = move_limit
+        self.winner = None
+
+        # Ключи: роботы по клеткам, груз роботов, посылки по клеткам, счёт, чей ход, сколько ходов осталось/Keys for
+        # robot cells, carried numbers, shelved numbers, scores, player to move and moves left
+        self.numbers = self.max_target + 1
+        self.max_score = win_score + self.max_target
+        self.carry_base = len(self.pos) * self.num_cells
+        self.package_base = self.carry_base + len(self.pos) * self.numbers
+        self.score_base = self.package_base + self.num_cells * self.numbers
+        self.turn_base = self.score_base + num_players * (self.max_score + 1)
+        self.remaining_base = self.turn_base + num_players
+        self.keys = self.zobrist_keys(self.remaining_base + move_limit + 1)
+        self.hash = 0
+
+    @classmethod
+    def zobrist_keys(cls, count):
+        """Случайные ключи, общие для всех позиций/Random keys shared by every position needing ``count`` of them"""
+        keys = cls._keys.get(count)
+        if keys is None:
+            keys = cls._keys[count] = array('Q', random.Random(count).randbytes(8 * count))
+        return keys
+
+    def __getstate__(self):
+        """Без общих ключей, их много/Pickles without the shared keys, a process pool rebuilds them"""
+        state = self.__dict__.copy()
+        del state['keys']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.keys = self.zobrist_keys(self.remaining_base + self.move_limit + 1)
+
+    @classmethod
+    def from_game(cls, state, seed=0):
+        """Позиция партии после расстановки/Position of a GameState whose robots are all placed"""
+        if state.placing_phase:
+            raise ValueError("robots are still being placed")
+        config = state.config
+        search = cls(state.board, len(state.players), config.robots_per_player, config.move_limit_per_turn,
+                     config.win_score, seed)
+        for player in state.players:
+            for robot in player.robots:
+                slot = player.idx * search.robots + robot.index - 1
+                search.pos[slot] = state.board.cell_index(*robot.pos)
+                search.carry[slot] = robot.package.number if robot.package else 0
+            search.scores[player.idx] = player.score
+        search.current_player = state.current_player
+        search.remaining = state.players[state.current_player].remaining_moves
+        search.winner = state.winner_index
+        search.hash = search.compute_hash()
+        return search
+
+    def compute_hash(self):
+        """Хэш с нуля/Zobrist hash computed from scratch, ``hash`` is kept equal to it incrementally. Cells without a
+        package add nothing; a shelf is never left empty, a pickup respawns a package in place"""
+        keys, n, numbers = self.keys, self.num_cells, self.numbers
+        value = keys[self.turn_base + self.current_player] ^ keys[self.remaining_base + self.remaining]
+        for slot, cell in enumerate(self.pos):
+            value ^= keys[slot * n + cell] ^ keys[self.carry_base + slot * numbers + self.carry[slot]]
+        for cell in compress(range(n), self.package_numbers):
+            value ^= keys[self.package_base + cell * numbers + self.package_numbers[cell]]
+        for player, score in enumerate(self.scores):
+            value ^= keys[self.score_base + player * (self.max_score + 1) + score]
+        return value
+
+    def spawn(self, cell, count):
+        """Номер count-й новой посылки на клетке/Number of the ``count``-th package spawned on ``cell``"""
+        return splitmix64((self.seed << 32) ^ (count * self.num_cells + cell)) % self.max_target + 1
+
+    def step(self, cell, direction):
+        """Соседняя клетка или -1 за краем/Neighbour of ``cell`` in ``direction``, -1 off the board"""
+        size = self.size
+        if direction == 0:
+            return cell - size if cell >= size else -1
+        if direction == 1:
+            return cell + size if cell + size < self.num_cells else -1
+        if direction == 2:
+            return cell - 1 if cell % size else -1
+        return cell + 1 if (cell + 1) % size else -1
+
+    def allows(self, cell, carry):
+        """Можно ли войти на клетку/Robot.move rules: on the board, free, not red, a target only with its package"""
+        if cell < 0 or self.occupancy[cell] or self.colors[cell] == 'r':
+            return False
+        target = self.targets[cell]
+        return not target or target == carry
+
+    def legal_moves(self):
+        """Ходы текущего игрока/Moves of the player to move, ``[PASS]`` when no robot can step, [] after a win"""
+        if self.winner is not None:
+            return []
+        moves = []
+        base = self.current_player * self.robots
+        for robot in range(self.robots):
+            cell, carry = self.pos[base + robot], self.carry[base + robot]
+            for direction in range(4):
+                if self.allows(self.step(cell, direction), carry):
+                    moves.append((robot, direction))
+        return moves or [PASS]
+
+    def end_turn(self):
+        keys = self.keys
+        player = self.current_player
+        following = (player + 1) % self.num_players
+        self.hash ^= (keys[self.turn_base + player] ^ keys[self.turn_base + following]
+                      ^ keys[self.remaining_base + self.remaining] ^ keys[self.remaining_base + self.move_limit])
+        self.current_player = following
+        self.remaining = self.move_limit
+
+    def apply(self, move):
+        """Сделать ход/Makes ``move``, returns the record for ``undo`` or None when the move is blocked"""
+        player, remaining, winner, old_hash = self.current_player, self.remaining, self.winner, self.hash
+        if move is PASS:
+            self.end_turn()
+            return -1, 0, 0, 0, -1, 0, player, remaining, 0, winner, old_hash
+        robot, direction = move
+        slot = player * self.robots + robot
+        cell, carry = self.pos[slot], self.carry[slot]
+        new = self.step(cell, direction)
+        if not self.allows(new, carry):
+            return None
+
+        keys, n, numbers = self.keys, self.num_cells, self.numbers
+        score = self.scores[player]
+        value = old_hash ^ keys[slot * n + cell] ^ keys[slot * n + new]
+        self.occupancy[cell] = 0
+        self.occupancy[new] = player + 1
+        self.pos[slot] = new
+        source, number = -1, 0
+        if self.targets[new]:
+            # Сдача посылки: сюда пускают только с ней/Drop-off, only the matching package gets onto a target
+            score_keys = self.score_base + player * (self.max_score + 1)
+            value ^= keys[score_keys + score] ^ keys[score_keys + score + carry]
+            value ^= keys[self.carry_base + slot * numbers + carry] ^ keys[self.carry_base + slot * numbers]
+            self.scores[player] = score + carry
+            self.carry[slot] = 0
+            if score + carry >= self.win_score:
+                self.winner = player
+        elif not carry and self.colors[new] == 'a':
+            below = new + self.size
+            if below < n and self.colors[below] == 'r' and self.package_numbers[below]:
+                # Подъём посылки, на её месте появляется новая/Pickup, a new package spawns in its place
+                source, number = below, self.package_numbers[below]
+                count = self.spawns[below]
+                fresh = self.spawn(below, count)
+                self.spawns[below] = count + 1
+                self.package_numbers[below] = fresh
+                self.carry[slot] = number
+                value ^= keys[self.package_base + below * numbers + number]
+                value ^= keys[self.package_base + below * numbers + fresh]
+                value ^= keys[self.carry_base + slot * numbers] ^ keys[self.carry_base + slot * numbers + number]
+        self.hash = value ^ keys[self.remaining_base + remaining] ^ keys[self.remaining_base + remaining - 1]
+        self.remaining = remaining - 1
+        if not self.remaining:
+            self.end_turn()
+        return slot, cell, new, carry, source, number, player, remaining, score, winner, old_hash
+
+    def undo(self, record):
+        """Отменить ход/Restores the position from before the move that returned ``record``"""
+        slot, cell, new, carry, source, number, player, remaining, score, winner, old_hash = record
+        if slot >= 0:
+            self.pos[slot] = cell
+            self.occupancy[new] = 0
+            self.occupancy[cell] = player + 1
+            self.carry[slot] = carry
+            self.scores[player] = score
+            if source >= 0:
+                self.package_numbers[source] = number
+                self.spawns[source] -= 1
+        self.current_player = player
+        self.remaining = remaining
+        self.winner = winner
+        self.hash = old_hash
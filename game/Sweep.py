@@ -0,0 +1,140 @@
+import argparse
+import copy
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.Tournament import _init_worker, _play_games, merge_results
+from game.config import GameConfig
+
+SWEEP_OPTIONS = {"config": str, "games": int, "max_turns": int}  # ключи самого перебора/keys of the sweep itself
+
+
+def read_spec(path):
+    """Описание перебора/Reads a sweep spec: ``(sweep options, [(key, [values])])`` in file order.
+
+    The spec is a keyed config (see GameConfig) where a value may list alternatives separated by ``|``; every such
+    key is a dimension of the grid. ``config`` names the base config (game.config by default, either format),
+    ``games`` the seeds per combination and ``max_turns`` the turn limit of a game.
+    """
+    options = {"config": "game.config", "games": 100, "max_turns": 1000}
+    grid = []
+    with open(path) as file:
+        for number, line in enumerate(file, 1):
+            content = line.split('#')[0].strip()
+            if not content:
+                continue
+            key, separator, value = content.partition('=')
+            key = key.strip()
+            if not separator:
+                raise ValueError(f"{path}:{number}: expected 'key = value', got {content!r}")
+            if key in SWEEP_OPTIONS:
+                options[key] = SWEEP_OPTIONS[key](value.strip())
+                continue
+            values = [alternative.strip() for alternative in value.split('|')]
+            try:
+                for alternative in values:
+                    GameConfig().set_option(key, alternative)
+            except ValueError as error:
+                raise ValueError(f"{path}:{number}: {error}") from None
+            grid.append((key, values))
+    return options, grid
+
+
+def combinations(base, grid):
+    """Все сочетания значений/Every combination of the grid as ``(values, config)``, the last key changing fastest"""
+    keys = [key for key, _ in grid]
+    for values in itertools.product(*(alternatives for _, alternatives in grid)):
+        config = copy.copy(base)
+        config.players_info = list(base.players_info)
+        for key, value in zip(keys, values):
+            config.set_option(key, value)
+        if 0 in config.players_info[1:config.get_num_players() + 1]:
+            raise ValueError(f"players = {' '.join(map(str, config.players_info[1:]))}: a sweep has no human players")
+        yield dict(zip(keys, values)), config
+
+
+def summary_row(values, config, results):
+    """Строка итоговой таблицы/One row of the results table: the swept values, then the merged game results"""
+    player_types = config.players_info[1:config.get_num_players() + 1]
+    summary = merge_results(results, player_types)
+    robots = len(player_types) * config.robots_per_player
+    row = dict(values)
+    row.update({
+        "games": summary["games"],
+        "unfinished": summary["unfinished"],
+        "mean_turns": round(summary["mean_turns"], 2),
+        "win_rate": " ".join(f"{rate:.3f}" for rate in summary["win_rate"]),
+        "mean_scores": " ".join(f"{score:.2f}" for score in summary["mean_scores"]),
+        "deliveries_per_turn": " ".join(f"{rate:.4f}" for rate in summary["deliveries_per_turn"]),
+        # Доставки за круг ходов на робота/Fleet throughput: deliveries per round of turns per robot
+        "deliveries_per_robot_round": round(sum(summary["deliveries_per_turn"]) / robots, 4),
+    })
+    return row
+
+
+def run_sweep(base, grid, games, workers=None, seed=0, max_turns=1000, chunk_size=16):
+    """Все сочетания на одном пуле/Schedules every combination × seed on one process pool, returns the rows.
+
+    Every combination plays the same seeds, so rows differ only by the swept settings. Chunks of all combinations
+    share the pool, which keeps the workers busy to the end instead of draining after each combination.
+    """
+    combos = list(combinations(base, grid))
+    seeds = list(range(seed, seed + games))
+    chunks, owners = [], []
+    for index, (_, config) in enumerate(combos):
+        for start in range(0, games, chunk_size):
+            chunks.append((config, seeds[start:start + chunk_size], max_turns, None))
+            owners.append(index)
+    results = [[] for _ in combos]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for index, chunk in zip(owners, executor.map(_play_games, chunks)):
+            results[index].extend(chunk)
+    return [summary_row(values, config, games_played) for (values, config), games_played in zip(combos, results)]
+
+
+def write_table(rows, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_table(rows, out=sys.stdout):
+    """Таблица в консоль/Rows as aligned text columns"""
+    columns = list(rows[0])
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)), file=out)
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)), file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless parameter sweep over game.config settings")
+    parser.add_argument("spec", help="sweep spec: a keyed config whose values may list alternatives with |")
+    parser.add_argument("--games", type=int, help="seeds per combination instead of the spec")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0, help="first seed, every combination plays the same seeds")
+    parser.add_argument("--max-turns", type=int, help="turn limit of a game instead of the spec")
+    parser.add_argument("--output", default="sweep_results.csv", help="aggregated results table, CSV")
+    args = parser.parse_args(argv)
+
+    options, grid = read_spec(args.spec)
+    games = args.games or options["games"]
+    max_turns = args.max_turns or options["max_turns"]
+    started = time.perf_counter()
+    rows = run_sweep(GameConfig(options["config"]), grid, games, args.workers, args.seed, max_turns)
+    elapsed = time.perf_counter() - started
+    write_table(rows, args.output)
+    print_table(rows)
+    print(json.dumps({"combinations": len(rows), "games": len(rows) * games, "seconds": round(elapsed, 2),
+                      "output": args.output}))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
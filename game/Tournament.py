@@ -0,0 +1,156 @@
+import argparse
+import copy
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.GameState import GameState
+from game.Metrics import Metrics
+from game.ReplayLog import ReplayWriter
+from game.config import GameConfig
+
+
+def _init_worker():
+    """Воркеры не пишут логи партий/Workers keep per-game logging quiet"""
+    logging.disable(logging.WARNING)
+
+
+def play_game(config, seed, max_turns=1000, replay_dir=None):
+    """Одна партия без графики/Plays one seeded headless game and returns its result"""
+    state = GameState(config, all_auto=True, seed=seed)
+    recorder = ReplayWriter(os.path.join(replay_dir, f"game_{seed}.abr"), state) if replay_dir else None
+    state.run_headless(max_turns)
+    if recorder:
+        recorder.close()
+    result = {
+        "seed": seed,
+        "winner": state.winner_index,
+        "turns": state.turns_taken,
+        "scores": [player.score for player in state.players],
+        "delivered": [player.delivered_packages for player in state.players],
+    }
+    if state.metrics:
+        result["metrics"] = state.metrics
+    return result
+
+
+def with_players(config, player_types):
+    """Копия конфига с другим составом игроков/Config copy with another list of player types"""
+    config = copy.copy(config)
+    config.players_info = [len(player_types)] + list(player_types)
+    return config
+
+
+def _play_games(args):
+    config, seeds, max_turns, replay_dir = args
+    return [play_game(config, seed, max_turns, replay_dir) for seed in seeds]
+
+
+def merge_results(results, player_types):
+    """Сводка по всем партиям/Merges per-game results into one summary, also grouped by player type"""
+    num_players = len(player_types)
+    games = len(results)
+    wins = [0] * num_players
+    scores = [0] * num_players
+    delivered = [0] * num_players
+    unfinished = 0
+    turns = 0
+    for result in results:
+        if result["winner"] is None:
+            unfinished += 1
+        else:
+            wins[result["winner"]] += 1
+        turns += result["turns"]
+        for i in range(num_players):
+            scores[i] += result["scores"][i]
+            delivered[i] += result["delivered"][i]
+    turns_per_player = turns / num_players
+    by_type = {}
+    for i, player_type in enumerate(player_types):
+        stats = by_type.setdefault(str(player_type), {"seats": 0, "wins": 0, "delivered": 0})
+        stats["seats"] += 1
+        stats["wins"] += wins[i]
+        stats["delivered"] += delivered[i]
+    for stats in by_type.values():
+        stats["deliveries_per_turn"] = stats["delivered"] / (turns_per_player * stats["seats"]) if turns else 0.0
+    return {
+        "games": games,
+        "unfinished": unfinished,
+        "wins": wins,
+        "win_rate": [w / games if games else 0.0 for w in wins],
+        "mean_turns": turns / games if games else 0.0,
+        "mean_scores": [s / games if games else 0.0 for s in scores],
+        "packages_delivered": delivered,
+        "deliveries_per_turn": [d / turns_per_player if turns else 0.0 for d in delivered],
+        "by_player_type": by_type,
+    }
+
+
+def run_tournament(config, games, workers=None, seed=0, max_turns=1000, chunk_size=64, replay_dir=None,
+                   metrics_path=None):
+    """Раздаёт партии по процессам/Fans seeded games out over a process pool and merges the results.
+
+    With ``metrics_path`` every game is instrumented and the merged metrics are written there as JSON, or as
+    Prometheus text if the path ends in ``.prom``.
+    """
+    if replay_dir:
+        os.makedirs(replay_dir, exist_ok=True)
+    if metrics_path:
+        config = copy.copy(config)
+        config.profiling = max(config.profiling, 1)
+    seeds = list(range(seed, seed + games))
+    chunks = [(config, seeds[i:i + chunk_size], max_turns, replay_dir) for i in range(0, games, chunk_size)]
+    results = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for chunk in executor.map(_play_games, chunks):
+            results.extend(chunk)
+    elapsed = time.perf_counter() - started
+    if metrics_path:
+        metrics = Metrics()
+        metrics.games = 0
+        for result in results:
+            metrics.merge(result.pop("metrics"))
+        metrics.write(metrics_path)
+    summary = merge_results(results, config.players_info[1:config.get_num_players() + 1])
+    summary["seconds"] = elapsed
+    summary["games_per_second"] = games / elapsed if elapsed else 0.0
+    return summary, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless AutoPlay tournament")
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--players", type=int, nargs="+", help="player types to seat instead of game.config")
+    parser.add_argument("--robots", type=int, help="robots per player instead of game.config")
+    parser.add_argument("--map", nargs=2, metavar=("COLORS", "TARGETS"), help="map files instead of game.config")
+    parser.add_argument("--results", help="write per-game results to this JSONL file")
+    parser.add_argument("--replays", help="write a binary replay log of every game to this directory")
+    parser.add_argument("--metrics", help="instrument every game and write the merged metrics, .prom or .json")
+    args = parser.parse_args(argv)
+
+    config = GameConfig(args.config)
+    if args.players:
+        config = with_players(config, args.players)
+    if args.robots:
+        config.robots_per_player = args.robots
+    if args.map:
+        config.colors_map, config.targets_map = args.map
+    summary, results = run_tournament(config, args.games, args.workers, args.seed, args.max_turns,
+                                      replay_dir=args.replays, metrics_path=args.metrics)
+    if args.results:
+        with open(args.results, "w") as file:
+            for result in results:
+                file.write(json.dumps(result) + "\n")
+    print(json.dumps(summary, indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import threading
+
+
+class TurnWorker:
+    """Ход автомата в фоновом потоке/Plays autoplay turns on a background thread.
+
+    Planning reads the game without a lock; only each Robot.move and the player switch take ``state.lock``, so a
+    render loop that draws when it gets the lock without waiting keeps drawing and handling input while a long turn
+    is planned and skips a frame at most while a move is applied. The turn itself is the same ``play_auto_turn`` call
+    as in headless games, seeded games play out identically. Errors of the turn are raised again by ``poll``.
+    """
+
+    def __init__(self):
+        self.thread: threading.Thread = None
+        self.error: Exception = None
+
+    def busy(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, state):
+        self.thread = threading.Thread(target=self.play, args=(state,), name="autoplay", daemon=True)
+        self.thread.start()
+
+    def play(self, state):
+        try:
+            state.play_auto_turn()
+        except Exception as error:
+            self.error = error
+
+    def poll(self):
+        """Свободен ли поток/True when no turn is running, re-raises the error of the last turn"""
+        if self.busy():
+            return False
+        if self.error:
+            error, self.error = self.error, None
+            raise error
+        return True
+
+    def join(self):
+        """Дождаться начатого хода/Waits for the running turn, e.g. before closing replay logs"""
+        if self.thread is not None:
+            self.thread.join()
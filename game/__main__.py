@@ -0,0 +1,78 @@
+"""Точка входа/Command line entry point: ``python -m game COMMAND [ARGS]``, run from the repository root.
+
+Every command imports only the module it runs, so simulation commands never load pygame or SDL; only ``play`` and
+``replay --render`` open a window. ``simulate`` is the lightest path: one seeded headless game, result as JSON.
+"""
+import importlib
+import sys
+
+# команда: (модуль с main(argv), описание)/command: (module with main(argv), description), None - simulate below
+COMMANDS = {
+    "play": ("main", "the game in a window, as python main.py"),
+    "simulate": (None, "one seeded headless game, result as JSON"),
+    "tournament": ("game.Tournament", "many headless games on a process pool"),
+    "sweep": ("game.Sweep", "tournaments over a grid of settings, results as a CSV table"),
+    "batch": ("game.BatchSimulator", "many greedy games at once on NumPy arrays"),
+    "replay": ("game.ReplayLog", "replay a binary game log"),
+    "commands": ("game.CommandCompiler", "compile and replay a mode 2 commands file"),
+    "map": ("game.MapGenerator", "generate a warehouse map"),
+}
+
+
+def simulate(argv=None):
+    """Одна партия без графики/Plays one seeded headless game and prints its result"""
+    import argparse
+    import json
+    import logging
+    from game.GameState import GameState
+    from game.config import GameConfig
+
+    parser = argparse.ArgumentParser(prog="python -m game simulate", description=COMMANDS["simulate"][1])
+    parser.add_argument("--config", default="game.config")
+    parser.add_argument("--seed", type=int, help="seed of the game, overrides the config")
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a setting as in the keyed config format, may repeat")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    config = GameConfig(args.config)
+    for option in args.set:
+        key, _, value = option.partition('=')
+        config.set_option(key.strip(), value.strip())
+    seed = args.seed if args.seed is not None else config.seed
+    state = GameState(config, all_auto=True, seed=seed).run_headless(args.max_turns)
+    print(json.dumps({
+        "seed": state.seed,
+        "winner": state.winner_index,
+        "turns": state.turns_taken,
+        "scores": [player.score for player in state.players],
+    }))
+    return state
+
+
+def usage():
+    lines = ["usage: python -m game COMMAND [ARGS]", "", "commands:"]
+    lines += [f"  {name:<12}{description}" for name, (_, description) in COMMANDS.items()]
+    lines += ["", "python -m game COMMAND --help shows the arguments of a command"]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    if argv[0] not in COMMANDS:
+        print(f"unknown command {argv[0]!r}\n\n{usage()}", file=sys.stderr)
+        sys.exit(2)
+    name = COMMANDS[argv[0]][0]
+    if name is None:
+        return simulate(argv[1:])
+    module = importlib.import_module(name)
+    sys.argv = [f"python -m game {argv[0]}"] + argv[1:]
+    return module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    main()
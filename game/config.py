@@ -1,20 +1,65 @@
 # file_path: AntBotMailStation/game/config.py
 
+# Ключи формата "ключ = значение"/Keys of the keyed format with the type of their value
+OPTIONS = {
+    "game_mode": int,
+    "move_limit_per_turn": int,
+    "run_count": int,
+    "win_score": int,
+    "robots_per_player": int,
+    "charging_accounting": int,
+    "animation_speed": float,
+    "profiling": int,
+    "search_budget_ms": int,
+    "search_workers": int,
+}
+
+
+def is_keyed(lines):
+    """Файл в формате ключей/True when the first line with content is ``key = value``"""
+    for line in lines:
+        content = line.split('#')[0].strip()
+        if content:
+            return '=' in content
+    return False
+
+
 class GameConfig:
-    def __init__(self, config_path):
+    """Настройки игры/Game settings read from a config file.
+
+    Two formats are read. The original one is positional: line N always means the same setting (see game.config).
+    The keyed one has a ``key = value`` per line in any order, ``#`` comments and blank lines; keys are the attribute
+    names of OPTIONS plus ``players`` (the player types, e.g. ``1 1 3``), ``seed`` (``-`` for a random one) and
+    ``map`` (colors and targets files). ``players`` is required; other keys left out keep the defaults of the shipped
+    game.config.
+    """
+
+    def __init__(self, config_path=None):
         self.config_path = config_path
-        self.game_mode = None
-        self.run_count = None
-        self.players_info = []
-        self.win_score = None
-        self.robots_per_player = None
-        self.charging_accounting = None
-        self.move_limit_per_turn = None
-        self._parse_config()
+        # Значения по умолчанию как в поставляемом game.config/Defaults as in the shipped game.config
+        self.game_mode = 1
+        self.run_count = 3
+        self.players_info = []  # в файле ключей обязателен players/a keyed file must give players
+        self.win_score = 10
+        self.robots_per_player = 2
+        self.charging_accounting = 0
+        self.move_limit_per_turn = 4
+        self.animation_speed = 1.0
+        self.seed = None  # None - случайное зерно для каждой партии/None draws a fresh seed for every game
+        self.profiling = 0  # 1 - замеры фаз и счётчики, 2 - ещё и cProfile/1 spans and counters, 2 adds cProfile
+        self.colors_map = "csv_files/map.csv"
+        self.targets_map = "csv_files/targets.csv"
+        self.search_budget_ms = 100  # время на ход игрока вида 3, 0 - фиксированное число итераций/type 3 turn budget
+        self.search_workers = 0  # процессы для поиска, 0 - без пула/extra search processes, 0 - none
+        if config_path:
+            self._parse_config()
 
     def _parse_config(self):
         with open(self.config_path, 'r') as file:
             lines = file.readlines()
+            if is_keyed(lines):
+                self._parse_keyed(lines)
+                return
             self.game_mode = int(lines[0].split('#')[0].strip())    # parse game mode
             self.move_limit_per_turn = int(lines[2].split('#')[0].strip())      # parse move limit
             self.run_count = int(lines[3].split('#')[0].strip())    # parse run count
@@ -22,6 +67,53 @@ class GameConfig:
             self.win_score = int(lines[5].split('#')[0].strip())    # parse win score
             self.robots_per_player = int(lines[6].split('#')[0].strip())    # parse robots per player
             self.charging_accounting = int(lines[7].split('#')[0].strip())      # parse charging accounting
+            if len(lines) > 8:
+                self.animation_speed = float(lines[8].split('#')[0].strip())    # parse animation speed
+            if len(lines) > 9:
+                seed = lines[9].split('#')[0].strip()     # parse seed, '-' for a random one
+                self.seed = int(seed) if seed not in ('', '-') else None
+            if len(lines) > 10:
+                self.profiling = int(lines[10].split('#')[0].strip())   # parse profiling level
+            if len(lines) > 11:
+                self.colors_map, self.targets_map = lines[11].split('#')[0].split()     # parse map files
+            if len(lines) > 12:
+                budget, workers = map(int, lines[12].split('#')[0].split())   # parse search budget and workers
+                self.search_budget_ms, self.search_workers = budget, workers
+
+    def _parse_keyed(self, lines):
+        for number, line in enumerate(lines, 1):
+            content = line.split('#')[0].strip()
+            if not content:
+                continue
+            key, separator, value = content.partition('=')
+            if not separator:
+                raise ValueError(f"{self.config_path}:{number}: expected 'key = value', got {content!r}")
+            try:
+                self.set_option(key.strip(), value.strip())
+            except ValueError as error:
+                raise ValueError(f"{self.config_path}:{number}: {error}") from None
+        if not self.players_info:
+            raise ValueError(f"{self.config_path}: missing key players")
+
+    def set_option(self, key, value):
+        """Задать настройку из текста/Sets one setting from its text as written in the keyed format"""
+        if key in OPTIONS:
+            try:
+                setattr(self, key, OPTIONS[key](value))
+            except ValueError:
+                raise ValueError(f"bad value {value!r} for {key}") from None
+        elif key == "players":
+            types = list(map(int, value.split()))
+            self.players_info = [len(types)] + types
+        elif key == "seed":
+            self.seed = int(value) if value not in ('', '-') else None
+        elif key == "map":
+            maps = value.split()
+            if len(maps) != 2:
+                raise ValueError(f"map needs a colors and a targets file, got {value!r}")
+            self.colors_map, self.targets_map = maps
+        else:
+            raise ValueError(f"unknown setting {key!r}")
 
     def get_num_players(self):
         return self.players_info[0]
@@ -1 +1,5 @@
-DEFAULT_IMAGE_SIZE = (80, 80)
\ No newline at end of file
+DEFAULT_IMAGE_SIZE = (80, 80)
+MAX_WINDOW_SIZE = (1600, 1000)  # большие доски рисуются мельче/bigger boards get smaller tiles
+MIN_TILE_SIZE = 4
+MIN_LABEL_TILE_SIZE = 20  # на клетках мельче подписи не рисуются/no labels and digits on smaller tiles
+SCORE_PANEL_WIDTH = 320
\ No newline at end of file
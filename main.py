@@ -1,83 +1,115 @@
-import sys
+import argparse
+import os
 import pygame
 import logging
-import time
-import re
+from time import perf_counter_ns
 
 from pygame import Surface
 
 from game.Board import Board
+from game.CommandCompiler import CommandCompiler, CommandProgram
+from game.CommandStream import CommandStream
+from game.Events import ConsoleSink, JsonlSink
+from game.Metrics import Metrics, ProfileCapture
 from game.Player import Player
 from game.config import GameConfig
-from game.PlayerSimulator import PlayerSimulator
-from game.consts import DEFAULT_IMAGE_SIZE
-from game.AutoPlay import AutoPlay
+from game.GameState import GameState
+from game.PlayerSimulator import PlayerSimulator, PLACEMENT_PAUSE_MS, window_size
+from game.ReplayLog import ReplayWriter
+from game.TurnWorker import TurnWorker
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
-
-file_handler = logging.FileHandler('game.log')
-file_handler.setLevel(logging.INFO)
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
-
-logging.getLogger().addHandler(file_handler)
-
-pygame.init()
+FPS = 60
+FRAME_MS = 1000 / FPS  # шаг анимаций/animation time step
+MAX_UPDATES_PER_FRAME = 5  # после долгого кадра не догонять дальше/catch-up limit after a long frame
+RESET_PAUSE_MS = 5000  # итоговая доска перед следующей партией/final board shown before the next game
+COMMAND_POLL_MS = 1000  # как часто проверять commands.txt без inotify/commands.txt poll period without inotify
+MAX_COMMANDS_PER_FRAME = 1000
 
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, commands_source="commands.txt", seed=None, record_dir=None, events_path=None):
         self.config: GameConfig = GameConfig("game.config")
-        self.screen: Surface = pygame.display.set_mode(
-            (
-                DEFAULT_IMAGE_SIZE[0] * 15,
-                DEFAULT_IMAGE_SIZE[1] * 11
-            )
-        )
-        pygame.display.set_caption('Robotics Board Game')
-        self.board: Board = None
-        self.players: list[Player] = None
+        if seed is not None:
+            self.config.seed = seed
+        self.commands_source = commands_source
+        self.record_dir = record_dir
+        self.recorder: ReplayWriter = None
+        # События партии идут в logging и, по желанию, в JSONL/Game events go to logging and optionally to JSONL
+        self.sinks = [ConsoleSink()]
+        if events_path:
+            self.sinks.append(JsonlSink(events_path))
+        # Замеры всех партий запуска/Metrics of every game of the run, written on close when profiling is on
+        self.metrics: Metrics = None
+        self.profile = ProfileCapture() if self.config.profiling >= 2 else None
+        self.screen: Surface = None  # размер окна зависит от доски/window size follows the board
+        self.state: GameState = None
         self.simulator: PlayerSimulator = None
-        self.auto_play: list[AutoPlay] = None
+        self.compiler: CommandCompiler = None
+        self.program: CommandProgram = None
+        self.worker = TurnWorker()
+        self.stream: CommandStream = None
         self.running: bool = False
-        self.placing_phase: bool = None
-        self.current_player: int = 0
-        self.game_reset: bool = False
+        self.lag: float = 0.0  # время, ещё не отданное анимациям/time not yet given to animations, ms
+        self.reset_at: int = None  # когда начать следующую партию/pygame ticks to start the next game at
         self.played_games: int = 0
-        self.turn_counter: int = 0  # Отслеживает текущий ход игры
-        self.winner_index: int = None  # Индекс победителя
-        self.turns_taken: int = 0
         self.init_game()
 
     def init_game(self):
-        self.board = Board("csv_files/map.csv", "csv_files/targets.csv")
-        self.players = [
-            Player(color=color, num_robots=self.config.robots_per_player, idx=idx,
-                   move_limit_per_turn=self.config.move_limit_per_turn, game_manager=self)
-            for color, idx in [('blue', 0), ('red', 1), ('green', 2), ('orange', 3)][:self.config.get_num_players()]
-        ]
-        self.simulator = PlayerSimulator(self.players, self.board, self)
-        self.auto_play = [AutoPlay(player, self.board) for player_type, player in
-                          zip(self.config.players_info[1:], self.players) if player_type == 1]
-        self.running = False
-        self.placing_phase = self.simulator.placing_phase
-        self.current_player = 0
-        self.game_reset = False
-        self.turn_counter = 0  # Сбрасываем текущий счётчик ходов при инициализации игры
-        self.winner_index = None  # Сбрасываем индекс победителя
-        self.turns_taken = 0
+        # Следующие партии серии получают следующие зёрна/Later games of a run get consecutive seeds
+        seed = self.config.seed + self.played_games if self.config.seed is not None else None
+        self.collect_metrics()
+        self.state = GameState(self.config, seed=seed)
+        logging.info("Game seed: %d", self.state.seed)
+        for sink in self.sinks:
+            self.state.events.subscribe(sink)
+        if self.record_dir:
+            os.makedirs(self.record_dir, exist_ok=True)
+            self.recorder = ReplayWriter(os.path.join(self.record_dir, f"game_{self.state.seed}.abr"), self.state)
+        size = window_size(self.state.board)
+        if self.screen is None or self.screen.get_size() != size:
+            self.screen = pygame.display.set_mode(size)
+            pygame.display.set_caption('Robotics Board Game')
+        self.simulator = PlayerSimulator(self.state, self.screen, animation_speed=self.config.animation_speed)
+        self.compiler = CommandCompiler(self.state.board, len(self.state.players))
+        self.program = CommandProgram()
+        self.reset_at = None
+        if self.config.game_mode == 1:
+            self.state.update_package_visibility(True)
+
+    @property
+    def players(self) -> list[Player]:
+        return self.state.players
+
+    @property
+    def board(self) -> Board:
+        return self.state.board
 
     def reset_game(self):
-        """Сброс: Перезапуск игры/Game is being reset"""
+        """Сброс: Перезапуск игры/Game is being reset, returns False once run_count games were played"""
         self.played_games += 1
-        if self.winner_index is not None:
-            logging.info(f"Game Over: Player {self.winner_index + 1} won after {self.turns_taken} turns.")
+        if self.recorder:
+            self.recorder.close()
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if self.state.winner_index is not None:
+            logging.info("Game Over: Player %d won after %d turns.", self.state.winner_index + 1,
+                         self.state.turns_taken)
         if self.played_games >= self.config.run_count:
             logging.info("Game limit reached. Exiting.")
-            sys.exit()
+            return False
         self.init_game()
-        time.sleep(5)
         logging.info("reset is done.")
-        self.run()
+        return True
+
+    def tick(self, clock):
+        """Ожидание следующего кадра/Waits for the next frame, timed as the idle phase when profiling"""
+        if not self.state.metrics:
+            return clock.tick(FPS)
+        start = perf_counter_ns()
+        dt = clock.tick(FPS)
+        self.state.metrics.observe("idle", None, start)
+        return dt
 
     def handle_events(self):
         """Обработка ввода игрока/ Handling in put from player"""
@@ -85,160 +117,165 @@ class GameManager:
             if event.type == pygame.QUIT:
                 self.running = False
                 logging.info("Game terminated by user.")
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN and self.placing_phase:
-                cell_x = (event.pos[0] // DEFAULT_IMAGE_SIZE[0]) - 1
-                cell_y = (event.pos[1] // DEFAULT_IMAGE_SIZE[1]) - 1
-                success = self.simulator.place_robot_at_position(cell_x, cell_y)
-                if success:
-                    self.placing_phase = not success
-                    self.simulator.update_package_visibility(self.placing_phase)
-            elif event.type == pygame.KEYDOWN and not self.placing_phase:
-                current_player = self.players[self.current_player]
-                if current_player not in [auto_play.player for auto_play in self.auto_play]:
+            elif self.config.game_mode != 1 or self.worker.busy():
+                continue
+            elif (event.type == pygame.MOUSEBUTTONDOWN and self.state.placing_phase
+                  and not self.state.is_auto(self.state.current_player)):
+                self.simulator.place_robot_at_position(*self.simulator.cell_at(event.pos))
+            elif event.type == pygame.KEYDOWN and not self.state.placing_phase:
+                if not self.state.is_auto(self.state.current_player):
                     self.simulator.pressed_key(event)
 
-    def run_game_mode_1(self):
-        """Режим игры 1: Запуск первого режима игры, тут могут быть роботы-автоботы/Runs game mode 1, where Autoplay
-        Players can be"""
-        self.running = True
-        self.placing_phase = True
-        logging.info("run_game_mode_1 started")
-        self.simulator.update_package_visibility(self.placing_phase)
+    def update_mode_1(self):
+        """Режим игры 1: тут могут быть роботы-автоботы/Game mode 1, where Autoplay Players can be. An autoplay turn
+        starts on the worker thread once the last move is shown, placements are quick and stay on this thread"""
+        if self.state.game_over or not self.worker.poll() or not self.simulator.animations.idle():
+            return
+        if self.state.is_auto(self.state.current_player):
+            if self.state.placing_phase:
+                self.state.play_auto_placement()
+                self.simulator.animations.pause(PLACEMENT_PAUSE_MS)
+            else:
+                self.worker.start(self.state)
 
-        while self.running:
-            if self.game_reset:
-                break
+    def update_mode_2(self):
+        """Режим игры 2: ввод из commands txt, примеры комманд там же/Commands.txt input, gamemode2, at most
+        MAX_COMMANDS_PER_FRAME new commands a frame"""
+        if self.state.game_over:
+            return
+        if self.stream is None:
+            self.stream = CommandStream(self.commands_source, poll_interval=COMMAND_POLL_MS / 1000)
+        self.compiler.compile(self.stream.poll(MAX_COMMANDS_PER_FRAME), self.program)
+        if self.program.run(self.state):
+            self.simulator.ENDGAME()
+            self.running = self.state.game_over
 
-            while self.placing_phase and self.running:
-                if self.game_reset:
-                    break
-
-                self.screen.fill((255, 255, 255))
-                current_player = self.players[self.current_player]
-
-                if current_player in [auto_play.player for auto_play in self.auto_play]:
-                    autoplay = next(auto_play for auto_play in self.auto_play if auto_play.player == current_player)
-                    random_pos = autoplay.get_random_white_cell_position()
-                    if random_pos:
-                        time.sleep(0.08)
-                        success = self.simulator.place_robot_at_position(random_pos[0], random_pos[1])
-                        if success:
-                            pass
-                    else:
-                        logging.error("No white cells available to place robot.")
-                else:
-                    self.handle_events()
-                self.simulator.screen_animator()
-                pygame.display.flip()
-
-            # Основной игровой цикл
-            while not self.placing_phase and self.running:
-                if self.game_reset:
-                    break
-
-                current_player_idx = self.current_player
-                current_player = self.players[current_player_idx]
-
-                if current_player in [auto_play.player for auto_play in self.auto_play]:
-                    autoplay = next(auto_play for auto_play in self.auto_play if auto_play.player == current_player)
-                    autoplay.play()
-                    self.simulator.switch_to_next_player()
-                else:
-                    self.handle_events()
-                    self.simulator.screen_animator()
-                    pygame.display.flip()
-                    pygame.time.wait(100)
+    def execute_command(self, command, line_number=0):
+        """Одна команда второго режима/Compiles and runs a single mode 2 command"""
+        self.compiler.compile_line(self.program, command, line_number)
+        if self.program.run(self.state):
+            self.simulator.ENDGAME()
+            self.running = False
 
-        pygame.quit()
+    def advance(self, dt):
+        """Анимации фиксированными шагами/Advances animations in FRAME_MS steps, drops the lag after a stall.
 
-    def run_game_mode_2(self):
-        """Режим игры 2: ввод из commands txt, примеры комманд там же, здесь только ручной ввод/Commands.txt input,
-        gamemode2"""
-
-        def is_valid_command(command):
-            gamer_command = r"^GAMER \d+$"
-            put_bot_command = r"^PUT BOT [a-g][1-8]$"
-            move_command = r"^MOVE ([a-g][1-8]-)+[a-g][1-8]$"
-            end_command = r"^END$"
-
-            if re.match(gamer_command, command):
-                return True
-            elif re.match(put_bot_command, command):
-                return True
-            elif re.match(move_command, command):
-                return True
-            elif re.match(end_command, command):
-                return True
-            else:
-                return False
+        Animations of an autoplay turn wait until the turn is over, the worker queues them as it moves.
+        """
+        if self.worker.busy():
+            self.lag = 0.0
+            return
+        self.lag += dt
+        steps = 0
+        while self.lag >= FRAME_MS:
+            if steps == MAX_UPDATES_PER_FRAME:
+                self.lag = 0.0
+                break
+            self.simulator.update(FRAME_MS)
+            self.lag -= FRAME_MS
+            steps += 1
+
+    def draw(self):
+        """Кадр, если робот сейчас не ходит/Draws a frame unless the worker is applying a robot move right now"""
+        if not self.state.lock.acquire(blocking=False):
+            if self.state.metrics:
+                self.state.metrics.count("skipped_frames")
+            return
+        try:
+            self.simulator.screen_animator()
+        finally:
+            self.state.lock.release()
+
+    def check_game_over(self):
+        """Итоговая доска RESET_PAUSE_MS перед следующей партией/Shows the final board for RESET_PAUSE_MS, then
+        starts the next game, all without blocking the loop"""
+        if not self.state.game_over or self.worker.busy() or not self.simulator.animations.idle():
+            return
+        now = pygame.time.get_ticks()
+        if self.reset_at is None:
+            last = self.played_games + 1 >= self.config.run_count
+            self.reset_at = now if last else now + RESET_PAUSE_MS
+        if now >= self.reset_at:
+            self.running = self.reset_game()
 
-        cnt = 0
+    def run(self):
+        """Главный цикл с фиксированным шагом/Fixed timestep main loop.
+
+        Every frame handles input, then game logic (autoplay turns run on the TurnWorker thread, mode 2 reads at
+        most MAX_COMMANDS_PER_FRAME commands), advances animations and draws. Nothing in a frame waits for the AI:
+        while a turn is planned the loop keeps drawing at FPS and skips a frame only while a move is applied.
+        """
+        if self.profile:
+            self.profile.start()
         self.running = True
-        logging.info("run_game_mode_2 started")
-
+        logging.info("game mode %d started", self.config.game_mode)
+        clock = pygame.time.Clock()
         while self.running:
-            if self.game_reset:
+            dt = self.tick(clock)
+            self.handle_events()
+            if not self.running:
                 break
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    logging.info("Game terminated by user.")
-                    break
-
-            with open("commands.txt", "r") as file:
-                commands = file.readlines()
-
-                for command in commands[cnt:]:
-                    command = command.strip()
-                    if is_valid_command(command):
-                        self.execute_command(command)
-                        cnt += 1
-                    else:
-                        if command != '':
-                            logging.warning(f"Invalid command: {command}")
-
-            time.sleep(1)
-
+            if self.config.game_mode == 1:
+                self.update_mode_1()
+            elif self.config.game_mode == 2:
+                self.update_mode_2()
+            self.advance(dt)
+            self.draw()
+            self.check_game_over()
+        self.close()
         pygame.quit()
 
-    @staticmethod
-    # Here is everything for game_mode_2 and the run function
-    def load_commands(filepath):
-        with open(filepath, 'r') as file:
-            commands = file.readlines()
-        return commands
-
-    def execute_command(self, command):
-        parts = command.strip().split()
-        if not parts:
+    def collect_metrics(self):
+        """Добавить замеры текущей партии к итогу/Adds the metrics of the current game to the run total"""
+        if self.state is None or self.state.metrics is None:
             return
-
-        if self.placing_phase and not (parts[0] == "PUT" and parts[1] == "BOT") and parts[0] != "GAMER":
-            self.placing_phase = False
-            logging.info(f"Placing phase ended.")
-            self.simulator.update_package_visibility(self.placing_phase)
-
-        if parts[0] == "GAMER":
-            self.simulator.game_manager.current_player = int(parts[1]) - 1
-            logging.info(f"Switched to Player {self.current_player + 1}.")
-        elif parts[0] == "PUT" and parts[1] == "BOT":
-            self.simulator.execute_put_bot(self.simulator.game_manager.current_player, parts[2])
-        elif parts[0] == "MOVE":
-            self.simulator.start_turn(self.simulator.game_manager.current_player, parts[1])
-        elif parts[0] == "END":
-            self.simulator.ENDGAME()
-            self.running = False
-
-    def run(self):
-        if self.config.game_mode == 1:
-            self.run_game_mode_1()
-        elif self.config.game_mode == 2:
-            self.run_game_mode_2()
+        if self.metrics is None:
+            self.metrics = self.state.metrics
+        else:
+            self.metrics.merge(self.state.metrics)
+
+    def close(self):
+        self.worker.join()
+        if self.stream:
+            self.stream.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.profile:
+            logging.info("Profile written to %s\n%s", self.profile.path, self.profile.stop())
+        self.collect_metrics()
+        if self.metrics:
+            self.metrics.write("metrics.json")
+            self.metrics.write("metrics.prom")
+            logging.info("Metrics of %d games written to metrics.json and metrics.prom", self.metrics.games)
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+
+
+def setup_logging():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+    file_handler = logging.FileHandler('game.log')
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+
+    logging.getLogger().addHandler(file_handler)
+
+
+def main(argv=None):
+    """Игра с окном/The windowed game; logging and pygame are set up here, not on import"""
+    parser = argparse.ArgumentParser(description="Robotics Board Game")
+    parser.add_argument("commands", nargs="?", default="commands.txt",
+                        help="mode 2 command source: a file, a FIFO or - for stdin")
+    parser.add_argument("--seed", type=int, help="seed of the first game, overrides game.config")
+    parser.add_argument("--record", metavar="DIR", help="write a binary replay log of every game to DIR")
+    parser.add_argument("--events", metavar="FILE", help="append structured game events to a JSONL file")
+    args = parser.parse_args(argv)
+    setup_logging()
+    pygame.init()
+    game_manager = GameManager(args.commands, args.seed, args.record, args.events)
+    game_manager.run()
 
 
 if __name__ == "__main__":
-    game_manager = GameManager()
-    game_manager.run()
+    main()
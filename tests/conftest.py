@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+# Тесты идут из корня репозитория, как python -m game/Tests run from the repository root, like python -m game
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def repository_root(monkeypatch):
+    """Карты и картинки ищутся по относительным путям/Maps and images are found by relative paths"""
+    monkeypatch.chdir(ROOT)
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from game.GameState import GameState
+from game.config import GameConfig
+
+
+@pytest.fixture
+def simulator():
+    """Отрисованная первая картинка на драйвере dummy/PlayerSimulator on the SDL dummy driver after its first frame"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame = pytest.importorskip("pygame")
+    from game.Assets import AssetCache
+    from game.PlayerSimulator import PlayerSimulator, window_size
+
+    pygame.init()
+    state = GameState(GameConfig("game.config"), all_auto=True, seed=0)
+    screen = pygame.display.set_mode(window_size(state.board))
+    simulator = PlayerSimulator(state, screen, assets=AssetCache())
+    while state.placing_phase:
+        state.play_auto_placement()
+    simulator.animations.finish()
+    simulator.full_redraw = True
+    simulator.screen_animator()
+    yield simulator
+    pygame.quit()
+
+
+def test_frames_of_unchanged_content_do_no_asset_work(simulator):
+    warm = simulator.assets.stats()
+    assert warm["loads"] and warm["renders"]
+    for frame in range(60):
+        simulator.full_redraw = frame % 2 == 0
+        simulator.screen_animator()
+    after = simulator.assets.stats()
+    assert {key: after[key] - warm[key] for key in after} == {"loads": 0, "scales": 0, "renders": 0}
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from game.BitBoard import BitBoard, BitSearchState
+from game.GameState import GameState
+from game.PathTables import DIRECTIONS
+from game.Scenarios import robot_move_allows, scenario_maps
+from game.SearchState import SearchState
+from game.config import GameConfig
+
+
+@pytest.fixture(scope="module", params=["map.csv", "warehouse_24x16"])
+def game_map(request):
+    """``(config, colors_map, targets_map)`` of map.csv and a small generated warehouse"""
+    with scenario_maps(GameConfig("game.config"), [(24, 16)]) as maps:
+        yield maps[request.param]
+
+
+def positions(config, colors_map, targets_map, seed=0, count=3):
+    """Позиции из партии/GameStates of one seeded game after every few turns"""
+    for turns in range(0, 4 * count, 4):
+        yield GameState(config, colors_map, targets_map, all_auto=True, seed=seed).run_headless(turns)
+
+
+def test_legal_moves_match_robot_move(game_map):
+    config, colors_map, targets_map = game_map
+    for state in positions(config, colors_map, targets_map):
+        search = BitSearchState.from_game(state)
+        for slot in range(len(search.pos)):
+            search.current_player = slot // search.robots
+            legal = set(search.legal_moves())
+            for direction in range(4):
+                expected = robot_move_allows(config, colors_map, targets_map, search.pos, search.carry, search.robots,
+                                             slot, DIRECTIONS[direction][0])
+                assert ((slot % search.robots, direction) in legal) == expected, (slot, direction)
+
+
+def test_steps_shift_the_whole_set(game_map):
+    config, colors_map, targets_map = game_map
+    search = SearchState.from_game(GameState(config, colors_map, targets_map, seed=0).run_headless(0))
+    bits = BitBoard(search)
+    everything = bits.full
+    for direction, cells in enumerate(bits.steps(everything)):
+        for cell in range(bits.num_cells):
+            assert bool((cells >> cell) & 1) == search.allows(search.step(cell, direction), 0), (cell, direction)
+
+
+def test_backends_play_the_same_moves_and_keep_occupied(game_map):
+    config, colors_map, targets_map = game_map
+    rng = random.Random(1)
+    for state in positions(config, colors_map, targets_map):
+        plain, bitwise = SearchState.from_game(state), BitSearchState.from_game(state)
+        records = []
+        for _ in range(100):
+            moves = plain.legal_moves()
+            assert moves == bitwise.legal_moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            plain.apply(move)
+            records.append(bitwise.apply(move))
+            assert bitwise.bits.occupied == BitBoard.cells(bitwise.occupancy)
+        for record in reversed(records):
+            bitwise.undo(record)
+        assert bitwise.bits.occupied == BitBoard.cells(bitwise.occupancy) == BitBoard.cells(state.board.occupancy)
@@ -0,0 +1,40 @@
+import os
+
+from game.CommandStream import CommandStream
+
+
+def test_tailed_file_waits_for_the_newline(tmp_path):
+    path = tmp_path / "commands.txt"
+    path.write_bytes(b"")
+    stream = CommandStream(str(path), poll_interval=0)
+    with open(path, "ab") as file:
+        file.write(b"MOVE c3-c2")
+        file.flush()
+        assert stream.poll() == []
+        assert stream.poll() == []
+        file.write(b"-c1\nMOVE a1-a2\n")
+    stream.changed = True
+    assert stream.poll() == [(1, "MOVE c3-c2-c1"), (2, "MOVE a1-a2")]
+    stream.close()
+
+
+def test_close_returns_the_unterminated_last_line(tmp_path):
+    path = tmp_path / "commands.txt"
+    path.write_bytes(b"MOVE a1-a2\nMOVE b1")
+    stream = CommandStream(str(path), poll_interval=0)
+    assert stream.poll() == [(1, "MOVE a1-a2")]
+    stream.close()
+    assert stream.poll() == [(2, "MOVE b1")]
+    stream.close()
+
+
+def test_fifo_writer_close_ends_the_line(tmp_path):
+    path = str(tmp_path / "commands.fifo")
+    os.mkfifo(path)
+    stream = CommandStream(path, poll_interval=0)
+    writer = os.open(path, os.O_WRONLY)
+    os.write(writer, b"MOVE a1-a2\nMOVE b1")
+    assert stream.poll() == [(1, "MOVE a1-a2")]
+    os.close(writer)
+    assert stream.poll() == [(2, "MOVE b1")]
+    stream.close()
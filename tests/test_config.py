@@ -0,0 +1,24 @@
+import pytest
+
+from game.GameState import GameState
+from game.config import GameConfig
+
+
+def test_keys_left_out_keep_the_game_config_defaults(tmp_path):
+    path = tmp_path / "short.config"
+    path.write_text("players = 1 1\nseed = 3\n")
+    config = GameConfig(str(path))
+    shipped = GameConfig("game.config")
+    for name in ("game_mode", "run_count", "win_score", "robots_per_player", "charging_accounting",
+                 "move_limit_per_turn", "animation_speed", "profiling", "search_budget_ms", "search_workers"):
+        assert getattr(config, name) == getattr(shipped, name), name
+    assert config.players_info == [2, 1, 1] and config.seed == 3
+    state = GameState(config, all_auto=True, seed=config.seed).run_headless(20)
+    assert state.total_robots_to_place == 2 * config.robots_per_player
+
+
+def test_keyed_file_without_players_is_rejected(tmp_path):
+    path = tmp_path / "no_players.config"
+    path.write_text("# только зерно/seed only\nseed = 3\n")
+    with pytest.raises(ValueError, match="missing key players"):
+        GameConfig(str(path))
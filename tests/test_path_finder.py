@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from game.AutoPlay import AutoPlay
+from game.Board import Board
+from game.Package import Package
+from game.PathFinder import PathFinder
+from game.PathTables import PASSABLE_COLORS
+from game.Robot import Robot
+from game.Scenarios import write_warehouse
+
+
+@pytest.fixture(params=["map.csv", "warehouse_30x20"])
+def board(request, tmp_path):
+    if request.param == "map.csv":
+        return Board("csv_files/map.csv", "csv_files/targets.csv")
+    return Board(*write_warehouse(str(tmp_path), 30, 20))
+
+
+def carrying(pos, number):
+    robot = Robot('blue', pos, 1, None)
+    if number:
+        robot.package = Package(pos)
+        robot.package.number = number
+    return robot
+
+
+def bfs_distance(autoplay, robot):
+    def distance(target):
+        path = autoplay.find_path(robot, target)
+        return len(path) if path else None
+    return distance
+
+
+def test_astar_agrees_with_bfs(board):
+    """Robots block cells, one free cell is walled in by robots, goals include red, occupied and target cells"""
+    rng = random.Random(0)
+    cells = [(x, y) for y in range(board.height) for x in range(board.size)]
+    free = [(x, y) for x, y in cells
+            if board.colors[y * board.size + x] in PASSABLE_COLORS and not board.targets[y * board.size + x]]
+    rng.shuffle(free)
+    robots = free[:len(free) // 10]
+    for pos in robots:
+        board.update_position(None, pos)
+    walled = free[len(robots)]
+    for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+        x, y = walled[0] + dx, walled[1] + dy
+        if 0 <= x < board.size and 0 <= y < board.height and not board.occupancy[y * board.size + x]:
+            board.update_position(None, (x, y))
+    targets = [(x, y) for x, y in cells if board.targets[y * board.size + x]]
+    goals = [walled] + rng.sample(targets, min(4, len(targets))) + rng.sample(cells, 30)
+    autoplay = AutoPlay(None, board)
+    finder = PathFinder(board)
+    outcomes = set()
+    for start in rng.sample(robots, min(10, len(robots))):
+        for goal in goals:
+            goal_target = board.targets[goal[1] * board.size + goal[0]]
+            for number in {0, goal_target, rng.randrange(1, board.max_target + 1)}:
+                robot = carrying(start, number)
+                expected = bfs_distance(autoplay, robot)(goal)
+                step = finder.first_step(start, goal, number)
+                assert finder.last_distance == expected, (start, goal, number)
+                outcomes.add(expected is None)
+                if step is None:
+                    assert expected is None
+                    continue
+                direction, new_pos = step
+                assert autoplay.is_valid_move(robot, new_pos)
+                robot.pos = new_pos
+                assert (bfs_distance(autoplay, robot)(goal) or 0) == expected - 1, (start, goal, direction)
+    assert outcomes == {True, False}
+    for start in rng.sample(robots, 5):
+        assert finder.first_step(start, walled) is None
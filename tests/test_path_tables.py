@@ -0,0 +1,65 @@
+import random
+
+import game.PathTables as path_tables
+from game.Board import Board
+from game.MapGenerator import generate_map, write_map
+from game.PathTables import PathTables, UNREACHABLE
+
+
+def board():
+    return Board("csv_files/map.csv", "csv_files/targets.csv")
+
+
+def test_rows_are_built_on_first_use():
+    tables = PathTables(board())
+    assert not tables.rows
+    tables.distance(0, tables.num_cells - 1)
+    assert list(tables.rows) == [(0, tables.num_cells - 1)]
+
+
+def test_source_rows_are_not_cached():
+    tables = PathTables(board())
+    cells = [cell for cell in range(tables.num_cells) if tables.passable[0][cell]]
+    for cell in cells:
+        tables.distances_from(cell)
+    assert not tables.rows
+
+
+def test_rows_stay_within_the_bound_and_match_a_fresh_build():
+    tables = PathTables(board())
+    tables.max_rows = 5
+    rng = random.Random(0)
+    for _ in range(200):
+        src, dest = rng.randrange(tables.num_cells), rng.randrange(tables.num_cells)
+        number = rng.choice(tables.variants)
+        expected = PathTables(board()).distance(src, dest, number)
+        assert tables.distance(src, dest, number) == expected
+        assert len(tables.rows) <= 5
+
+
+def test_distances_from_matches_distance():
+    tables = PathTables(board())
+    for src in range(tables.num_cells):
+        row = tables.distances_from(src)
+        if tables.passable[0][src]:
+            for dest in range(tables.num_cells):
+                if tables.passable[0][dest]:
+                    assert row[dest] == tables.distance(src, dest)
+
+
+def test_target_distances_cache_only_map_digits():
+    tables = PathTables(board())
+    for number in range(50):
+        tables.target_distances(number)
+    assert set(tables.nearest_targets) <= set(tables.target_cells)
+    assert set(tables.target_distances(49)) == {UNREACHABLE}
+
+
+def test_only_the_latest_maps_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(PathTables, "_cache", {})
+    boards = []
+    for width in range(9, 9 + path_tables.CACHED_MAPS + 2):
+        paths = write_map(*generate_map(width, 9), str(tmp_path / f"c{width}.csv"), str(tmp_path / f"t{width}.csv"))
+        boards.append(Board(*paths))
+    assert len(PathTables._cache) == path_tables.CACHED_MAPS
+    assert PathTables.for_board(boards[-1]) is boards[-1].path_tables
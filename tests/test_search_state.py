@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from game.Events import MOVED
+from game.GameState import GameState
+from game.PathTables import DIRECTIONS
+from game.Scenarios import robot_move_allows, scenario_maps
+from game.SearchState import PASS, SearchState
+from game.config import GameConfig
+
+DIRECTION_INDEX = {name: d for d, (name, _, _) in enumerate(DIRECTIONS)}
+
+
+@pytest.fixture(scope="module", params=["map.csv", "warehouse_30x20"])
+def game_map(request):
+    """``(config, colors_map, targets_map)`` of map.csv and a generated warehouse"""
+    with scenario_maps(GameConfig("game.config"), [(30, 20)]) as maps:
+        yield maps[request.param]
+
+
+def placed_game(config, colors_map, targets_map, seed):
+    state = GameState(config, colors_map, targets_map, all_auto=True, seed=seed)
+    while state.placing_phase:
+        state.play_auto_placement()
+    return state
+
+
+def position(search):
+    return (bytes(search.occupancy), bytes(search.package_numbers), bytes(search.spawns), tuple(search.pos),
+            tuple(search.carry), tuple(search.scores), search.current_player, search.remaining, search.winner,
+            search.hash)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_replays_a_game_move_by_move(game_map, seed):
+    """Respawned numbers come from a copy of Board.rng, so the search must match the game after every turn"""
+    state = placed_game(*game_map, seed)
+    search = SearchState.from_game(state)
+    rng = random.Random()
+    rng.setstate(state.board.rng.getstate())
+    search.spawn = lambda cell, count: rng.randint(1, search.max_target)
+    moves = []
+    state.events.subscribe(lambda event: moves.append(event.fields[:3]) if event.kind == MOVED else None)
+    checked = 0
+    while not state.game_over and state.turns_taken < 200:
+        player = state.current_player
+        state.play_auto_turn()
+        for mover, robot, direction in moves:
+            assert mover == search.current_player
+            assert search.apply((robot - 1, DIRECTION_INDEX[direction])) is not None, (robot, direction)
+            checked += 1
+        moves.clear()
+        if search.current_player == player and search.winner is None:
+            search.apply(PASS)
+        board = state.board
+        assert bytes(board.occupancy) == bytes(search.occupancy)
+        assert bytes(board.package_numbers) == bytes(search.package_numbers)
+        assert [p.score for p in state.players] == search.scores
+        assert search.winner == state.winner_index
+        assert search.hash == search.compute_hash()
+    assert checked
+
+
+def test_legal_moves_match_robot_move(game_map):
+    """Random layouts put robots next to shelves and targets, which seeded games rarely do early on"""
+    config, colors_map, targets_map = game_map
+    search = SearchState.from_game(placed_game(*game_map, 0))
+    rng = random.Random(0)
+    free = [cell for cell in range(search.num_cells) if search.colors[cell] != 'r' and not search.targets[cell]]
+    for _ in range(20):
+        search.pos = rng.sample(free, len(search.pos))
+        search.carry = [rng.randrange(search.max_target + 1) for _ in search.pos]
+        search.occupancy = bytearray(search.num_cells)
+        for slot, cell in enumerate(search.pos):
+            search.occupancy[cell] = slot // search.robots + 1
+        for slot in range(len(search.pos)):
+            search.current_player = slot // search.robots
+            legal = set(search.legal_moves())
+            for direction in range(4):
+                expected = robot_move_allows(config, colors_map, targets_map, search.pos, search.carry, search.robots,
+                                             slot, DIRECTIONS[direction][0])
+                assert ((slot % search.robots, direction) in legal) == expected, (slot, direction)
+
+
+def test_random_lines_keep_the_hash_and_undo_exactly(game_map):
+    search = SearchState.from_game(placed_game(*game_map, 0))
+    rng = random.Random(0)
+    start = position(search)
+    for _ in range(5):
+        records = []
+        for _ in range(200):
+            moves = search.legal_moves()
+            if not moves:
+                break
+            records.append(search.apply(rng.choice(moves)))
+            assert search.hash == search.compute_hash()
+        assert records
+        for record in reversed(records):
+            search.undo(record)
+        assert position(search) == start
@@ -0,0 +1,46 @@
+import threading
+
+from game.GameState import GameState
+from game.TurnWorker import TurnWorker
+from game.config import GameConfig
+
+
+def placed_state():
+    state = GameState(GameConfig("game.config"), all_auto=True, seed=0)
+    while state.placing_phase:
+        state.play_auto_placement()
+    return state
+
+
+def test_planning_leaves_the_lock_free(monkeypatch):
+    state = placed_state()
+    autoplay = state.current_auto_play()
+    planning, finish = threading.Event(), threading.Event()
+    play = autoplay.play
+
+    def slow_play():
+        planning.set()
+        finish.wait(5)
+        return play()
+
+    monkeypatch.setattr(autoplay, "play", slow_play)
+    worker = TurnWorker()
+    worker.start(state)
+    assert planning.wait(5)
+    assert state.lock.acquire(blocking=False)
+    state.lock.release()
+    finish.set()
+    worker.join()
+    assert worker.poll()
+    assert state.turns_taken == 1
+
+
+def test_moves_wait_for_the_lock():
+    state = placed_state()
+    worker = TurnWorker()
+    with state.lock:
+        worker.start(state)
+        worker.thread.join(0.2)
+        assert worker.busy() and state.turns_taken == 0
+    worker.join()
+    assert state.turns_taken == 1